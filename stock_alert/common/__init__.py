@@ -1,3 +1,5 @@
 from .constants import *
 from .utils import *
+from .clock import *
+from .condition import *
 from .models import *
\ No newline at end of file
@@ -0,0 +1,45 @@
+import time
+from typing import Optional
+
+
+class Clock:
+    """Time source of the monitor loop: `time()` stamps ticks and cooldowns, `sleep()` waits between ticks."""
+
+    def time(self) -> float:
+        raise NotImplementedError
+
+    def sleep(self, secs: float) -> None:
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    """Wall-clock time."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, secs: float) -> None:
+        time.sleep(secs)
+
+
+class VirtualClock(Clock):
+    """Simulated time that only moves when slept on (or advanced), so a day of ticks runs as fast as the CPU allows.
+
+    Starts at `start_ts` (default: the current wall-clock second). Runs with the same start and inputs are
+    deterministic, cooldowns included.
+    """
+
+    def __init__(self, start_ts: Optional[float] = None):
+        self.now = float(int(time.time()) if start_ts is None else start_ts)
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, secs: float) -> None:
+        self.advance(secs)
+
+    def advance(self, secs: float) -> None:
+        self.now += max(0.0, secs)
+
+
+SYSTEM_CLOCK = SystemClock()
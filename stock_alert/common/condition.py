@@ -0,0 +1,177 @@
+import math
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, FrozenSet, List, Optional, Tuple
+from .constants import *
+
+# Composite alert conditions, e.g. "price >= 200 and (pct_day <= -3 or volume > 5e6)".
+#   expr    := and_expr ( OR and_expr )*
+#   and_expr:= term ( AND term )*
+#   term    := '(' expr ')' | FIELD CMP NUMBER
+# A condition is parsed once and compiled into a Python code object taking the field values as arguments,
+# so evaluating it costs one function call regardless of how many clauses it has.
+COND_FIELD_PRICE = "price"
+COND_FIELD_PCT_DAY = "pct_day"
+COND_FIELD_VOLUME = "volume"
+COND_FIELD_OFFSET = "offset"  # Price change since the last trigger (like price_value_offset_since_last_alert)
+COND_FIELD_PCT_OFFSET = "pct_offset"  # % change since the last trigger (like price_percent_offset_since_last_alert)
+COND_FIELDS = (COND_FIELD_PRICE, COND_FIELD_PCT_DAY, COND_FIELD_VOLUME, COND_FIELD_OFFSET, COND_FIELD_PCT_OFFSET)
+
+# Alert kind names are accepted as field names too
+COND_FIELD_ALIASES = {
+    AlertKind.PRICE_VALUE.value: COND_FIELD_PRICE,
+    AlertKind.PCT_DAY.value: COND_FIELD_PCT_DAY,
+    AlertKind.VOLUME.value: COND_FIELD_VOLUME,
+    AlertKind.PRICE_VALUE_OFFSET_SINCE_LAST_ALERT.value: COND_FIELD_OFFSET,
+    AlertKind.PRICE_PERCENT_OFFSET_SINCE_LAST_ALERT.value: COND_FIELD_PCT_OFFSET,
+}
+COND_FIELD_KINDS = {name: AlertKind(kind) for kind, name in COND_FIELD_ALIASES.items()}
+
+_TOKEN_RE = re.compile(r"\s*(?:(?P<num>-?(?:\d+(?:\.\d*)?|\.\d+)(?:e[+-]?\d+)?)|(?P<cmp>>=|<=|==|!=|>|<)"
+                       r"|(?P<paren>[()])|(?P<word>[a-z_][a-z0-9_]*))", re.IGNORECASE)
+_SYMBOL_BOOL_OPS = {"&&": "and", "||": "or"}
+_BOOL_OPS_RE = re.compile(r"\s*(&&|\|\|)")
+
+
+class ConditionError(ValueError):
+    """Raised for a condition that does not parse."""
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    text: str  # Normalized source, e.g. "price >= 200 and (pct_day <= -3 or volume > 5000000)"
+    # Everything else is derived from the text
+    fields: FrozenSet[str] = field(compare=False)  # Fields the condition reads; offsets are only computed when referenced
+    clauses: Tuple[Tuple[str, str, float], ...] = field(compare=False)  # (field, cmp, value) in source order
+    fn: Callable[[float, float, float, Optional[float], Optional[float]], bool] = field(compare=False, repr=False)
+
+    def __call__(self, price: float, pct_day: float, volume: float, offset: Optional[float] = None,
+                 pct_offset: Optional[float] = None) -> bool:
+        return self.fn(price, pct_day, volume, offset, pct_offset)
+
+    def single_clause(self) -> Optional[Tuple[str, str, float]]:
+        return self.clauses[0] if len(self.clauses) == 1 else None
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens: List[Tuple[str, str]] = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        m = _BOOL_OPS_RE.match(text, pos)
+        if m:
+            tokens.append(("word", _SYMBOL_BOOL_OPS[m.group(1)]))
+            pos = m.end()
+            continue
+        m = _TOKEN_RE.match(text, pos)
+        if not m or m.end() == pos:
+            raise ConditionError(f"Unexpected character at position {pos}: {text[pos:pos + 10]!r}")
+        kind = m.lastgroup
+        tokens.append((kind, m.group(kind).lower() if kind == "word" else m.group(kind)))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent parser emitting a Python expression over the COND_FIELDS argument names."""
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        self.clauses: List[Tuple[str, str, float]] = []
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take(self, kind: str, what: str) -> str:
+        tok = self._peek()
+        if tok is None or tok[0] != kind:
+            found = "end of condition" if tok is None else repr(tok[1])
+            raise ConditionError(f"Expected {what}, found {found}")
+        self.pos += 1
+        return tok[1]
+
+    def parse(self) -> str:
+        if not self.tokens:
+            raise ConditionError("Empty condition")
+        source = self._expr()
+        if self._peek() is not None:
+            raise ConditionError(f"Unexpected {self._peek()[1]!r} after complete condition")
+        return source
+
+    def _expr(self) -> str:
+        parts = [self._and_expr()]
+        while self._peek() == ("word", "or"):
+            self.pos += 1
+            parts.append(self._and_expr())
+        return " or ".join(parts)
+
+    def _and_expr(self) -> str:
+        parts = [self._term()]
+        while self._peek() == ("word", "and"):
+            self.pos += 1
+            parts.append(self._term())
+        # Parenthesize mixed or-groups so precedence survives in the emitted source
+        return " and ".join(f"({p})" if " or " in p else p for p in parts)
+
+    def _term(self) -> str:
+        if self._peek() == ("paren", "("):
+            self.pos += 1
+            inner = self._expr()
+            self._take("paren", "')'")
+            return inner
+        name = self._take("word", "a field name")
+        field_name = COND_FIELD_ALIASES.get(name, name)
+        if field_name not in COND_FIELDS:
+            raise ConditionError(f"Unknown field {name!r} (expected one of: {', '.join(COND_FIELDS)})")
+        cmp = self._take("cmp", "a comparison (>=, <=, >, <, ==, !=)")
+        number = self._take("num", "a number")
+        try:
+            value = float(number)
+        except ValueError as e:
+            raise ConditionError(str(e))
+        if not math.isfinite(value):
+            # Would compile to the bare name 'inf' and fail on every evaluation
+            raise ConditionError(f"Number out of range: {number}")
+        self.clauses.append((field_name, cmp, value))
+        if field_name in (COND_FIELD_OFFSET, COND_FIELD_PCT_OFFSET):
+            # Offsets are None when they cannot be computed (previous price of zero): the clause is then false
+            return f"({field_name} is not None and {field_name} {cmp} {value!r})"
+        return f"{field_name} {cmp} {value!r}"
+
+
+@lru_cache(maxsize=COND_COMPILE_CACHE_SIZE)
+def compile_condition(text: str) -> CompiledCondition:
+    """Parses and compiles a condition once; identical texts share one compiled instance."""
+    parser = _Parser(text)
+    source = parser.parse()
+    code = compile(f"lambda {', '.join(COND_FIELDS)}: {source}", f"<condition {text!r}>", "eval")
+    fn = eval(code, {"__builtins__": {}})  # Source is generated from validated tokens only
+    return CompiledCondition(text=_normalize(parser.clauses, text), fields=frozenset(f for f, _, _ in parser.clauses),
+                             clauses=tuple(parser.clauses), fn=fn)
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _normalize(clauses: List[Tuple[str, str, float]], text: str) -> str:
+    """Canonical spelling of the condition: field aliases resolved, lower-case keywords, single spaces."""
+    out: List[str] = []
+    idx = 0
+    tokens = _tokenize(text)
+    i = 0
+    while i < len(tokens):
+        kind, tok = tokens[i]
+        if kind == "word" and tok in ("and", "or"):
+            out.append(tok)
+        elif kind == "paren":
+            out.append(tok)
+        else:
+            field_name, cmp, value = clauses[idx]
+            idx += 1
+            out.append(f"{field_name} {cmp} {_format_number(value)}")
+            i += 2  # Skip the comparison and number of this clause
+        i += 1
+    return " ".join(out).replace("( ", "(").replace(" )", ")")
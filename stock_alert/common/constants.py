@@ -11,6 +11,7 @@ CONFIG_FILE_REL_PATH_VS_SRORAGE = "configs/current_config.json"
 
 DEFAULT_MONITOR_INTERVAL = "15s"
 DEFAULT_COOLDOWN_SEC = 300
+DEFAULT_MAX_HISTORY_PER_ALERT = 50  # Trigger records kept per alert in the cache
 
 REPO_PATH = Path.home() / "stock_alert/"
 DEFAULT_STORAGE_DIR_PATH = f"{REPO_PATH}/.stockalert"
@@ -23,6 +24,16 @@ class AlertKind(str, Enum):
     PCT_DAY = "price_percent_day"
     PRICE_VALUE_OFFSET_SINCE_LAST_ALERT = "price_value_offset_since_last_alert"
     PRICE_PERCENT_OFFSET_SINCE_LAST_ALERT = "price_percent_offset_since_last_alert"
+    CONDITION = "condition"  # Composite condition over several fields, see common/condition.py
+
+
+class LegCombine(str, Enum):
+    """How the quotes of a multi-leg alert are combined into the one series its condition is evaluated on."""
+    RATIO = "ratio"  # first / second, e.g. GLD/BTC-USD
+    SPREAD = "spread"  # first - second
+
+
+LEG_COMBINE_SEPARATORS = {LegCombine.RATIO: "/", LegCombine.SPREAD: " - "}  # For the alert's display symbol
 
 
 class Operation(str, Enum):
@@ -30,21 +41,39 @@ class Operation(str, Enum):
     LE = "<="
 
 
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
 ALERT_LOG_TAG = "[ALERT]"
 
+# Circuit breakers (per symbol / per provider)
+BREAKER_SYMBOL_FAILURE_THRESHOLD = 2  # Consecutive failures before a symbol is skipped
+BREAKER_PROVIDER_FAILURE_THRESHOLD = 3  # Transport errors or quote-less ticks in a row before the provider is skipped
+BREAKER_BASE_BACKOFF_SECS = 30
+BREAKER_MAX_BACKOFF_SECS = 1800
+
 # Core config keys (highest level)
 ALERT_CORE_CONFIG_KEY = "alerts"
 LOGGING_CORE_CONFIG_KEY = "logging"
 CACHE_CORE_CONFIG_KEY = "cache"
 
 
+NOTIFY_CORE_CONFIG_KEY = "notify"  # false: log a profile's triggers without desktop notifications (default true)
+
 # JSON field keys (avoid magic strings)
 ALERT_FIELD_SYMBOL = "symbol"
 ALERT_FIELD_KIND = "kind"
 ALERT_FIELD_VALUE = "value"
 ALERT_FIELD_OP = "op"
 ALERT_FIELD_ALERT_COOLDOWN = "alert_min_cooldown_secs"
+ALERT_FIELD_CONDITION = "condition"
+ALERT_FIELD_LEGS = "legs"  # Only for multi-leg alerts: the symbols whose quotes are combined
+ALERT_FIELD_COMBINE = "combine"  # LegCombine value
 ALERT_FIELD_WATCHLIST = "watchlist"
+ALERT_FIELD_NAME = "name"  # Only used by import/export files (config keys alerts by name)
 
 CACHE_FIELD_LAST_ALERTS_TRIGGER_TS = "last_alerts_trigger_ts"
 CACHE_FIELD_ALERTS_HISTORY = "alerts"
@@ -52,6 +81,14 @@ CACHE_FIELD_ALERT_LAST_PRICE = "last_alert_price"
 
 ALERT_RECORD_FIELD_TRIGGER_TS = "trigger_ts"
 ALERT_RECORD_FIELD_NAME = "alert_name"
+ALERT_RECORD_FIELD_SOURCE = "source"  # Absent for live triggers
+ALERT_RECORD_SOURCE_WARM_START = "warm_start"  # Trigger replayed from cached bars, never notified
+
+# Alert import/export formats
+ALERT_IO_FORMAT_CSV = "csv"
+ALERT_IO_FORMAT_JSONL = "jsonl"
+ALERT_IO_CSV_COLUMNS = [ALERT_FIELD_NAME, ALERT_FIELD_SYMBOL, ALERT_FIELD_KIND, ALERT_FIELD_OP, ALERT_FIELD_VALUE,
+                        ALERT_FIELD_CONDITION, ALERT_FIELD_ALERT_COOLDOWN, ALERT_FIELD_LEGS, ALERT_FIELD_COMBINE]
 
 CACHE_FIELD_MAX_SIZE_BYTES = "max_size_bytes"
 CACHE_FIELD_NUM_ROTATED_FILES = "num_rotated_files"
@@ -60,6 +97,97 @@ CACHE_FIELD_DIR_REL_PATH_VS_STORAGE = "rel_dir_path_vs_storage"
 CACHE_FIELD_MAX_FILES = "max_files"
 CACHE_FIELD_MAX_FILE_SIZE = "max_file_size"
 CACHE_FIELD_FILE_NAME = "file_name"
+CACHE_FIELD_MAX_HISTORY_PER_ALERT = "max_history_per_alert"
+CACHE_FIELD_SERIALIZER = "serializer"
+
+# Cache file encoding: a one-line header "<magic> <version> <serializer>\n" followed by the payload
+CACHE_SERIALIZER_JSON = "json"  # Compact JSON (no indentation)
+CACHE_SERIALIZER_MARSHAL = "marshal"  # Fastest, but only readable by the same Python major version
+CACHE_SERIALIZER_MSGPACK = "msgpack"  # Needs the optional msgpack package
+CACHE_DEFAULT_SERIALIZER = CACHE_SERIALIZER_JSON
+CACHE_FILE_MAGIC = b"#stockalert-cache"
+CACHE_FORMAT_VERSION = 1
+
+# Binary quote logs (tick recorder / replay)
+QUOTE_LOG_FILE_EXT = ".qlog"
+QUOTE_LOG_FILE_PREFIX = "ticks"
+QUOTE_LOG_DEFAULT_DIR_REL_PATH_VS_STORAGE = "recordings"
+QUOTE_LOG_DEFAULT_MAX_FILE_BYTES = 64 * 1024 * 1024
+
+# Intraday bar cache (monitor --warm-start)
+BAR_CACHE_DEFAULT_DIR_REL_PATH_VS_STORAGE = "cache/bars"
+BAR_DEFAULT_INTERVAL = "1m"
+WARM_START_DEFAULT_DAYS = 2  # Calendar days of bars, including today
+WARM_START_MAX_WORKERS = 8  # Concurrent bar requests
+WARM_START_PREV_CLOSE_LOOKBACK_DAYS = 7  # How far back the cache is searched for the close before the window
+YAHOO_CHART_INTERVALS = {60: "1m", 120: "2m", 300: "5m", 900: "15m", 1800: "30m", 3600: "60m"}
+FINNHUB_CANDLE_RESOLUTIONS = {60: "1", 300: "5", 900: "15", 1800: "30", 3600: "60"}
+
+# Symbol metadata (exchange, asset type, currency, trading hours)
+SYMBOL_META_CACHE_DIR_REL_PATH_VS_STORAGE = "cache/symbols"  # One <provider>.json per provider (list)
+SYMBOL_META_DEFAULT_TTL_SECS = 7 * 24 * 3600  # Listings rarely change; re-resolved after a week
+SYMBOL_META_MAX_WORKERS = 8  # Concurrent metadata requests
+SYMBOL_META_VALIDATE_DEFAULT_PROVIDER = "yahoo"  # Used by 'manage watchlist add --validate' (no API key needed)
+ASSET_TYPE_EQUITY = "equity"
+ASSET_TYPE_ETF = "etf"
+ASSET_TYPE_FUND = "fund"
+ASSET_TYPE_INDEX = "index"
+ASSET_TYPE_CRYPTO = "crypto"
+ASSET_TYPE_CURRENCY = "currency"
+ASSET_TYPE_FUTURE = "future"
+ALWAYS_OPEN_ASSET_TYPES = (ASSET_TYPE_CRYPTO,)  # Trade around the clock, every day
+YAHOO_INSTRUMENT_TYPES = {"EQUITY": ASSET_TYPE_EQUITY, "ETF": ASSET_TYPE_ETF, "MUTUALFUND": ASSET_TYPE_FUND,
+                          "INDEX": ASSET_TYPE_INDEX, "CRYPTOCURRENCY": ASSET_TYPE_CRYPTO,
+                          "CURRENCY": ASSET_TYPE_CURRENCY, "FUTURE": ASSET_TYPE_FUTURE}
+# Regular sessions by listing country, for providers that report the country but not the hours (Finnhub)
+EXCHANGE_SESSIONS_BY_COUNTRY = {
+    "US": ("America/New_York", "09:30", "16:00"),
+    "CA": ("America/Toronto", "09:30", "16:00"),
+    "GB": ("Europe/London", "08:00", "16:30"),
+    "DE": ("Europe/Berlin", "09:00", "17:30"),
+    "JP": ("Asia/Tokyo", "09:00", "15:00"),
+}
+FAKE_CRYPTO_SYMBOLS = ("BTC", "ETH", "SOL", "DOGE")  # Reported as crypto by the fake provider (as is any *-USD)
+
+# Built-in profiling (monitor/manage --profile)
+PROFILE_DEFAULT_DIR_REL_PATH_VS_STORAGE = "profiles"
+PROFILE_DEFAULT_EVERY_TICKS = 10  # Profile one tick out of every N
+PROFILE_WRITE_EVERY_TICKS = 10  # Rewrite the output files after this many profiled ticks
+PROFILE_SAMPLE_INTERVAL_SECS = 0.002  # Stack sampler period for the collapsed-stack output
+
+# Monitor daemon control socket
+CONTROL_SOCKET_REL_PATH_VS_STORAGE = "run/monitor.sock"
+CONTROL_TIMEOUT_SECS = 5.0
+CONTROL_MAX_REQUEST_BYTES = 16 * 1024 * 1024
+CONTROL_SNAPSHOT_DELAY_SECS = 1.0  # Write-behind delay before the in-memory config is saved to disk
+
+# Local quote broker
+BROKER_SOCKET_REL_PATH_VS_STORAGE = "run/broker.sock"
+BROKER_MAX_FRAME_BYTES = 64 * 1024 * 1024
+BROKER_FIRST_QUOTE_WAIT_SECS = 15.0
+BROKER_MAX_AGE_INTERVALS = 3  # Broker quotes older than this many broker intervals are stale
+
+# Shared quote board (mmap)
+QUOTE_BOARD_REL_PATH_VS_STORAGE = "run/quotes.board"
+QUOTE_BOARD_DEFAULT_CAPACITY = 4096
+
+# Simulated market (FakeDataProvider simulate mode)
+SIM_DEFAULT_STEP_SECS = 60.0
+SIM_DEFAULT_ANNUAL_DRIFT = 0.05
+SIM_MIN_ANNUAL_VOL = 0.15
+SIM_MAX_ANNUAL_VOL = 0.60
+SIM_SECTOR_COUNT = 11
+SIM_VOLUME_PROFILE_CURVATURE = 3.0  # Open/close volume density is (1 + k) times the midday one
+SIM_VOLUME_NOISE = 0.3  # Lognormal sigma of per-step volume
+
+# Composite conditions
+COND_COMPILE_CACHE_SIZE = 4096  # Distinct condition texts kept compiled (bounded for long runs with hot reload)
+
+# Soak test
+SOAK_DEFAULT_TICKS = 100_000
+SOAK_DEFAULT_SAMPLES = 20
+SOAK_DEFAULT_TICK_SECS = 1.0  # Simulated time between ticks
+SOAK_TOP_ALLOCATION_SITES = 10
 
 # Credential key names
 ALPHAVANTAGE_API_KEY = "ALPHAVANTAGE_API_TOKEN"
@@ -70,11 +198,13 @@ LOG_FIELD_DIR_REL_PATH_VS_STORAGE = "rel_config_path"
 LOG_FIELD_FILE_NAME = "config_file_name"
 LOG_FIELD_MAX_FILES = "max_rotate_config"
 LOG_FIELD_MAX_FILE_SIZE_MB = "max_config_size_mb"
+LOG_FIELD_MIN_LEVEL = "min_level"  # Messages below this LogLevel are dropped (default: DEBUG, i.e. everything)
 
 LOG_CACHE_ABS_DIR = "cache_rel_dir_path_vs_storage"
 LOG_CACHE_FIELD_FILE_NAME = "cache_file_name"
 LOG_CACHE_FIELD_MAX_FILES = "cache_max_files"
 LOG_CACHE_FIELD_MAX_FILE_SIZE_BYTES = "cache_max_file_size_byte"
+LOG_CACHE_FIELD_MIN_LEVEL = "cache_min_level"
 
 
 class LogLevel(str, Enum):
@@ -82,3 +212,6 @@ class LogLevel(str, Enum):
     INFO = "INFO"
     WARNING = "WARNING"
     ERROR = "ERROR"
+
+
+LOG_LEVEL_SEVERITY = {LogLevel.DEBUG: 10, LogLevel.INFO: 20, LogLevel.WARNING: 30, LogLevel.ERROR: 40}
@@ -1,8 +1,14 @@
 from dataclasses import dataclass, asdict
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List
 from datetime import datetime
 from .utils import *
 from .constants import *
+from .condition import *
+
+try:  # Python 3.9+; without it trading hours are unknown and every market is treated as open
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # pragma: no cover - depends on the environment
+    ZoneInfo = None
 
 
 @dataclass
@@ -11,6 +17,8 @@ class CacheConfig:
     directory: str
     max_files: int
     max_file_size: int
+    max_history_per_alert: int = DEFAULT_MAX_HISTORY_PER_ALERT
+    serializer: str = CACHE_DEFAULT_SERIALIZER
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "CacheConfig":
@@ -19,6 +27,8 @@ class CacheConfig:
             directory=f"{DEFAULT_STORAGE_DIR_PATH}/{d[CACHE_FIELD_DIR_REL_PATH_VS_STORAGE]}",
             max_files=d[CACHE_FIELD_MAX_FILES],
             max_file_size=d[CACHE_FIELD_MAX_FILE_SIZE],
+            max_history_per_alert=int(d.get(CACHE_FIELD_MAX_HISTORY_PER_ALERT, DEFAULT_MAX_HISTORY_PER_ALERT)),
+            serializer=d.get(CACHE_FIELD_SERIALIZER, CACHE_DEFAULT_SERIALIZER),
         )
 
 
@@ -30,43 +40,297 @@ class Quote:
     volume: int = 0
 
 
+@dataclass
+class Bar:
+    """One intraday candle; `ts` is the start of the bar and `volume` what traded within it."""
+    ts: float
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int = 0
+
+
+@dataclass
+class SymbolInfo:
+    """What the provider knows about a symbol's listing. Without a time zone and session the trading hours are
+    unknown, and the market is treated as always open."""
+    symbol: str
+    exchange: str = ""
+    asset_type: str = ""  # One of the ASSET_TYPE_* constants, or "" if unknown
+    currency: str = ""
+    timezone: str = ""  # IANA name of the exchange time zone, e.g. America/New_York
+    session_open: str = ""  # Regular session, "HH:MM" exchange time, Monday to Friday
+    session_close: str = ""
+    resolved_ts: float = 0.0
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "SymbolInfo":
+        return cls(**{k: v for k, v in d.items() if k in cls.__dataclass_fields__})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def session_key(self) -> Tuple[str, str, str, str]:
+        """Symbols with the same key are open at the same times."""
+        if self.asset_type in ALWAYS_OPEN_ASSET_TYPES:
+            return (self.asset_type, "", "", "")
+        return ("", self.timezone, self.session_open, self.session_close)
+
+    def is_open(self, ts: float) -> bool:
+        """Whether `ts` falls in a regular session (exchange holidays are not known and count as open)."""
+        if self.asset_type in ALWAYS_OPEN_ASSET_TYPES or not (self.timezone and self.session_open and self.session_close):
+            return True
+        if ZoneInfo is None:
+            return True
+        try:
+            local = datetime.fromtimestamp(ts, ZoneInfo(self.timezone))
+        except ZoneInfoNotFoundError:
+            return True
+        if local.weekday() >= 5:
+            return False
+        hhmm = local.strftime("%H:%M")
+        if self.session_open <= self.session_close:
+            return self.session_open <= hhmm < self.session_close
+        return hhmm >= self.session_open or hhmm < self.session_close  # Session across midnight
+
+    def describe(self) -> str:
+        hours = "24/7" if self.asset_type in ALWAYS_OPEN_ASSET_TYPES else (
+            f"{self.session_open}-{self.session_close} {self.timezone}" if self.session_open else "hours unknown")
+        return f"{self.exchange or '?'} {self.asset_type or '?'} {self.currency or '?'}, {hours}"
+
+
 @dataclass
 class Alert:
     name: str
     symbol: str
     kind: AlertKind
-    op: Operation
-    value: float
+    op: Optional[Operation]
+    value: Optional[float]
     alert_cooldown_secs: int = 300
+    condition: Optional[CompiledCondition] = None  # Only for AlertKind.CONDITION
+    legs: Tuple[str, ...] = ()  # Symbols the alert reads: (symbol,) or the legs of a multi-leg alert
+    combine: Optional[LegCombine] = None  # Only for multi-leg alerts
+
+    def __init__(self, symbol: str, kind: AlertKind, op: Optional[Operation] = None,
+                 value: Optional[float] = None, alert_cooldown_secs: int = 300, condition: Optional[str] = None,
+                 legs: Optional[List[str]] = None, combine: Optional[LegCombine] = None):
+        """Initialize Alert with validation or custom logic.
 
-    def __init__(self, symbol: str, kind: AlertKind, op: Operation,
-                 value: float, alert_cooldown_secs: int = 300):
-        """Initialize Alert with validation or custom logic."""
+        A multi-leg alert (`legs` + `combine`) evaluates its kind/condition on the combined series, e.g. the
+        GLD/BTC-USD ratio as 'price'; its symbol is the display form of the legs.
+        """
+        if legs:
+            if len(legs) != 2 or combine is None:
+                raise ValueError(f"A multi-leg alert needs exactly two '{ALERT_FIELD_LEGS}' and a '{ALERT_FIELD_COMBINE}'")
+            self.legs = tuple(legs)
+            self.combine = LegCombine(combine)
+            symbol = LEG_COMBINE_SEPARATORS[self.combine].join(self.legs)
+        else:
+            self.legs = (symbol,)
+            self.combine = None
         self.symbol = symbol
         self.kind = kind
         self.op = op
         self.value = value
         self.alert_cooldown_secs = alert_cooldown_secs
-        self.name = f"{self.symbol} {self.kind.value} {self.op.value} {self.value}"
+        if self.kind == AlertKind.CONDITION:
+            if not condition:
+                raise ValueError(f"Alert kind '{AlertKind.CONDITION.value}' requires a '{ALERT_FIELD_CONDITION}'")
+            # Parsed and compiled once here; should_trigger only calls the compiled function
+            self.condition = compile_condition(condition)
+        else:
+            if op is None or value is None:
+                raise ValueError(f"Alert kind '{self.kind.value}' requires '{ALERT_FIELD_OP}' and '{ALERT_FIELD_VALUE}'")
+            self.condition = None
+        self.name = f"{self.symbol} {self.describe()}"
+
+    def describe(self) -> str:
+        """The alert's condition as text, e.g. 'price_value >= 200.0' or 'price >= 200 and volume > 1000000'."""
+        if self.condition is not None:
+            return self.condition.text
+        return f"{self.kind.value} {self.op.value} {self.value}"
+
+    @classmethod
+    def from_condition(cls, symbol: str, text: str, alert_cooldown_secs: int = DEFAULT_COOLDOWN_SEC,
+                       legs: Optional[List[str]] = None, combine: Optional[LegCombine] = None) -> "Alert":
+        """Builds an alert from condition text. A single '>=' / '<=' clause becomes a classic single-kind alert."""
+        compiled = compile_condition(text)
+        clause = compiled.single_clause()
+        if clause and clause[1] in (Operation.GE.value, Operation.LE.value):
+            field, cmp, value = clause
+            return cls(symbol=symbol, kind=COND_FIELD_KINDS[field], op=Operation(cmp), value=value,
+                       alert_cooldown_secs=alert_cooldown_secs, legs=legs, combine=combine)
+        return cls(symbol=symbol, kind=AlertKind.CONDITION, alert_cooldown_secs=alert_cooldown_secs, condition=text,
+                   legs=legs, combine=combine)
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "Alert":
         # Now calls the __init__ method through the constructor
+        kind = AlertKind(d[ALERT_FIELD_KIND])
+        legs = d.get(ALERT_FIELD_LEGS)
+        if isinstance(legs, str):  # Import files (CSV) spell the legs as "GLD,BTC-USD"
+            legs = [s.strip() for s in legs.split(",") if s.strip()]
+        multi_leg = {ALERT_FIELD_LEGS: legs, ALERT_FIELD_COMBINE: LegCombine(d[ALERT_FIELD_COMBINE])} if legs else {}
+        if kind == AlertKind.CONDITION:
+            return cls(
+                symbol=d[ALERT_FIELD_SYMBOL],
+                kind=kind,
+                alert_cooldown_secs=int(d.get(ALERT_FIELD_ALERT_COOLDOWN, DEFAULT_COOLDOWN_SEC)),
+                condition=str(d[ALERT_FIELD_CONDITION]),
+                **multi_leg,
+            )
         return cls(
             symbol=d[ALERT_FIELD_SYMBOL],
-            kind=AlertKind(d[ALERT_FIELD_KIND]),
+            kind=kind,
             op=Operation(d[ALERT_FIELD_OP]),
-            value=d[ALERT_FIELD_VALUE],
-            alert_cooldown_secs=d[ALERT_FIELD_ALERT_COOLDOWN],
+            value=float(d[ALERT_FIELD_VALUE]),
+            alert_cooldown_secs=int(d.get(ALERT_FIELD_ALERT_COOLDOWN, DEFAULT_COOLDOWN_SEC)),
+            **multi_leg,
         )
 
     def to_dict(self) -> Dict[str, Any]:
-        d = asdict(self)
-        d[ALERT_FIELD_KIND] = self.kind.value
-        d[ALERT_FIELD_OP] = self.op.value
+        """Serialize using the same field names that `from_dict` reads (config layout)."""
+        if self.condition is not None:
+            d = {
+                ALERT_FIELD_SYMBOL: self.symbol,
+                ALERT_FIELD_KIND: self.kind.value,
+                ALERT_FIELD_CONDITION: self.condition.text,
+                ALERT_FIELD_ALERT_COOLDOWN: self.alert_cooldown_secs,
+            }
+        else:
+            d = {
+                ALERT_FIELD_SYMBOL: self.symbol,
+                ALERT_FIELD_KIND: self.kind.value,
+                ALERT_FIELD_OP: self.op.value,
+                ALERT_FIELD_VALUE: self.value,
+                ALERT_FIELD_ALERT_COOLDOWN: self.alert_cooldown_secs,
+            }
+        if self.combine is not None:
+            d[ALERT_FIELD_LEGS] = list(self.legs)
+            d[ALERT_FIELD_COMBINE] = self.combine.value
         return d
 
-    def should_trigger(self, q: Quote, now_ts: float, last_trigger_ts: Optional[float] = None, last_alert_info: Optional[Dict[str, Any]] = None, ) -> Tuple[bool, str]:
+    def quote_from(self, quotes: Dict[str, Quote]) -> Optional[Quote]:
+        """The quote this alert is evaluated on, or None if a leg has no quote this tick (never a stale one).
+
+        A multi-leg quote combines the legs: price is the ratio/spread, pct_day its change vs the previous close
+        of both legs, and volume the smaller leg volume.
+        """
+        if self.combine is None:
+            return quotes.get(self.symbol)
+        first, second = quotes.get(self.legs[0]), quotes.get(self.legs[1])
+        if first is None or second is None:
+            return None
+        # Previous closes implied by each leg's day change
+        first_growth, second_growth = 1 + first.pct_day / 100, 1 + second.pct_day / 100
+        if self.combine == LegCombine.RATIO:
+            if second.price == 0:
+                return None
+            price = first.price / second.price
+            pct_day = (first_growth / second_growth - 1) * 100 if second_growth else 0.0
+        else:
+            price = first.price - second.price
+            prev = (first.price / first_growth if first_growth else 0.0) - \
+                   (second.price / second_growth if second_growth else 0.0)
+            pct_day = (price - prev) / prev * 100 if prev else 0.0
+        return Quote(symbol=self.symbol, price=price, pct_day=pct_day, volume=min(first.volume, second.volume))
+
+    def _value_offset(self, q: Quote, last_alert_info: Optional[Dict[str, Any]], verbose: bool) -> float:
+        """Price change since the last trigger (or since yesterday's close without trigger history)."""
+        if not last_alert_info or CACHE_FIELD_ALERT_LAST_PRICE not in last_alert_info:
+            # If no last alert info, compared with price value change today (vs yesterday)
+            if verbose:
+                LOG(f"No last alert info: {q.symbol}")
+            if q.pct_day == 0:
+                return 0  # No change from yesterday
+            yesterday_price = q.price / (1 + q.pct_day / 100)  # Yesterday's price based on day pct change
+            return q.price - yesterday_price
+        prev_price = float(last_alert_info[CACHE_FIELD_ALERT_LAST_PRICE])  # last alerted price
+        return q.price - prev_price
+
+    def _percent_offset(self, q: Quote, last_alert_info: Optional[Dict[str, Any]], verbose: bool) -> Optional[float]:
+        """% change since the last trigger (or pct_day without trigger history). None if the last price is zero."""
+        if not last_alert_info or CACHE_FIELD_ALERT_LAST_PRICE not in last_alert_info:
+            # If no last alert info, compared with price pct change today
+            if verbose:
+                LOG(f"No last alert info: {q.symbol}")
+            return q.pct_day
+        prev_price = float(last_alert_info[CACHE_FIELD_ALERT_LAST_PRICE])  # last alerted price
+        if prev_price == 0:
+            return None
+        new_value = ((q.price - prev_price) / prev_price) * 100
+        if verbose:
+            LOG(f"Previous price: {prev_price}, Current price: {q.price}, Pct change: {new_value}")
+        return new_value
+
+    def static_threshold(self) -> Optional[Tuple[str, Operation, float]]:
+        """(field, op, value) if the alert is a fixed price/volume level (kind or single-clause condition), else None."""
+        if self.combine is not None:
+            return None
+        if self.condition is not None:
+            clause = self.condition.single_clause()
+            if clause is None or clause[0] not in (COND_FIELD_PRICE, COND_FIELD_VOLUME) or clause[1] not in (">=", "<="):
+                return None
+            return clause[0], Operation(clause[1]), clause[2]
+        field_name = {AlertKind.PRICE_VALUE: COND_FIELD_PRICE, AlertKind.VOLUME: COND_FIELD_VOLUME}.get(self.kind)
+        if field_name is None or self.op not in (Operation.GE, Operation.LE):
+            return None
+        return field_name, self.op, float(self.value)
+
+    def uses_last_trigger_price(self) -> bool:
+        """True if the outcome depends on the price of the last trigger (offset kinds and condition fields)."""
+        if self.condition is not None:
+            return bool(self.condition.fields & {COND_FIELD_OFFSET, COND_FIELD_PCT_OFFSET})
+        return self.kind in (AlertKind.PRICE_VALUE_OFFSET_SINCE_LAST_ALERT, AlertKind.PRICE_PERCENT_OFFSET_SINCE_LAST_ALERT)
+
+    def cooldown_active(self, now_ts: float, last_trigger_ts: Optional[float]) -> bool:
+        """True while the alert may not fire again because it triggered less than its cooldown ago."""
+        if last_trigger_ts is None:
+            return False
+        return now_ts - self._trigger_unix_ts(last_trigger_ts) < self.alert_cooldown_secs
+
+    def cooldown_expires_at(self, last_trigger_ts: Optional[float]) -> Optional[float]:
+        """Unix time at which the cooldown started by `last_trigger_ts` ends (None without a previous trigger)."""
+        if last_trigger_ts is None:
+            return None
+        return self._trigger_unix_ts(last_trigger_ts) + self.alert_cooldown_secs
+
+    @staticmethod
+    def _trigger_unix_ts(last_trigger_ts: Any) -> float:
+        # Handle both Unix timestamp (float) and human-readable timestamp (string) formats
+        if isinstance(last_trigger_ts, str):
+            try:
+                # Try to parse the human-readable timestamp
+                last_trigger_datetime = datetime.strptime(last_trigger_ts, "%Y-%m-%d %H:%M:%S")
+                last_trigger_unix = last_trigger_datetime.timestamp()
+            except ValueError:
+                # If parsing fails, assume it's an old format and use 0 as default
+                last_trigger_unix = 0
+        else:
+            # It's already a Unix timestamp
+            last_trigger_unix = last_trigger_ts
+        return last_trigger_unix
+
+    def _should_trigger_condition(self, q: Quote, now_ts: float, last_trigger_ts: Optional[float],
+                                  last_alert_info: Optional[Dict[str, Any]], verbose: bool) -> Tuple[bool, str]:
+        condition = self.condition
+        fields = condition.fields
+        # Offsets need the trigger history, so they are only computed when the condition reads them
+        offset = self._value_offset(q, last_alert_info, verbose) if COND_FIELD_OFFSET in fields else None
+        pct_offset = self._percent_offset(q, last_alert_info, verbose) if COND_FIELD_PCT_OFFSET in fields else None
+        if not condition.fn(q.price, q.pct_day, q.volume, offset, pct_offset):
+            return False, "Condition not met"
+        values = {COND_FIELD_PRICE: q.price, COND_FIELD_PCT_DAY: q.pct_day, COND_FIELD_VOLUME: q.volume,
+                  COND_FIELD_OFFSET: offset, COND_FIELD_PCT_OFFSET: pct_offset}
+        now = ", ".join(f"{f}={values[f]}" for f in COND_FIELDS if f in fields)
+        if self.cooldown_active(now_ts, last_trigger_ts):
+            return False, f"Condition met {condition.text} ({now}), but cooldown is active -> Not triggering!"
+        return True, f"{condition.text} (now {now})"
+
+    def should_trigger(self, q: Quote, now_ts: float, last_trigger_ts: Optional[float] = None, last_alert_info: Optional[Dict[str, Any]] = None, verbose: bool = True, ) -> Tuple[bool, str]:
+        if self.condition is not None:
+            return self._should_trigger_condition(q, now_ts, last_trigger_ts, last_alert_info, verbose)
         # Setup value
         if self.kind == AlertKind.PRICE_VALUE:
             new_value = q.price
@@ -75,28 +339,11 @@ class Alert:
         elif self.kind == AlertKind.VOLUME:
             new_value = q.volume
         elif self.kind == AlertKind.PRICE_VALUE_OFFSET_SINCE_LAST_ALERT:
-            if not last_alert_info or CACHE_FIELD_ALERT_LAST_PRICE not in last_alert_info:
-                # If no last alert info, compared with price value change today (vs yesterday)
-                LOG(f"No last alert info: {q.symbol}")
-                if q.pct_day == 0:
-                    new_value = 0  # No change from yesterday
-                else:
-                    yesterday_price = q.price / (1 + q.pct_day / 100)  # Yesterday's price based on day pct change
-                    new_value = q.price - yesterday_price
-            else:
-                prev_price = float(last_alert_info[CACHE_FIELD_ALERT_LAST_PRICE])  # last alerted price
-                new_value = q.price - prev_price
+            new_value = self._value_offset(q, last_alert_info, verbose)
         elif self.kind == AlertKind.PRICE_PERCENT_OFFSET_SINCE_LAST_ALERT:
-            if not last_alert_info or CACHE_FIELD_ALERT_LAST_PRICE not in last_alert_info:
-                # If no last alert info, compared with price pct change today
-                LOG(f"No last alert info: {q.symbol}")
-                new_value = q.pct_day
-            else:
-                prev_price = float(last_alert_info[CACHE_FIELD_ALERT_LAST_PRICE])  # last alerted price
-                if prev_price == 0:
-                    return False, "Previous price is zero"
-                new_value = ((q.price - prev_price) / prev_price) * 100
-                LOG(f"Previous price: {prev_price}, Current price: {q.price}, Pct change: {new_value}")
+            new_value = self._percent_offset(q, last_alert_info, verbose)
+            if new_value is None:
+                return False, "Previous price is zero"
         else:
             return False, f"Unsupported alert kind: {self.kind}"
 
@@ -108,22 +355,8 @@ class Alert:
         else:
             return False, f"Unsupported operator: {self.op}"
 
-        if cond and last_trigger_ts is not None:
-            # Handle both Unix timestamp (float) and human-readable timestamp (string) formats
-            if isinstance(last_trigger_ts, str):
-                try:
-                    # Try to parse the human-readable timestamp
-                    last_trigger_datetime = datetime.strptime(last_trigger_ts, "%Y-%m-%d %H:%M:%S")
-                    last_trigger_unix = last_trigger_datetime.timestamp()
-                except ValueError:
-                    # If parsing fails, assume it's an old format and use 0 as default
-                    last_trigger_unix = 0
-            else:
-                # It's already a Unix timestamp
-                last_trigger_unix = last_trigger_ts
-
-            if now_ts - last_trigger_unix < self.alert_cooldown_secs:
-                return False, f"Condition met {new_value} {self.op.value} {self.value}, but cooldown is active -> Not triggering!"
+        if cond and self.cooldown_active(now_ts, last_trigger_ts):
+            return False, f"Condition met {new_value} {self.op.value} {self.value}, but cooldown is active -> Not triggering!"
 
         if cond:
             if self.kind == AlertKind.PRICE_VALUE_OFFSET_SINCE_LAST_ALERT:
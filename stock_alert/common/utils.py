@@ -4,7 +4,7 @@ import os
 from pathlib import Path
 import subprocess
 import sys
-from typing import List, Literal, Optional, Union
+from typing import Callable, List, Literal, Optional, Union
 from datetime import datetime
 import traceback
 import shlex
@@ -46,6 +46,8 @@ def change_dir(path: str):
 
 
 _LOGGING_SETTINGS_CACHE: Optional[dict] = None
+_LOG_MIN_LEVEL_OVERRIDE: Optional[LogLevel] = None
+_LOG_TIME_FN: Optional[Callable[[], float]] = None  # Timestamp source for log lines (None: wall clock)
 
 
 def _ensure_dir(path: Path) -> None:
@@ -73,6 +75,10 @@ def _get_logging_settings() -> dict:
     file_name = logging_cfg.get(LOG_FIELD_FILE_NAME, "stock_monitor.log")
     max_files = int(logging_cfg.get(LOG_FIELD_MAX_FILES, 5) or 5)
     max_size_mb = float(logging_cfg.get(LOG_FIELD_MAX_FILE_SIZE_MB, 5) or 5)
+    try:
+        min_level = LogLevel(str(logging_cfg.get(LOG_FIELD_MIN_LEVEL, LogLevel.DEBUG.value)).upper())
+    except ValueError:
+        min_level = LogLevel.DEBUG
 
     abs_dir = Path(DEFAULT_STORAGE_DIR_PATH) / rel_dir
     _ensure_dir(abs_dir)
@@ -82,10 +88,32 @@ def _get_logging_settings() -> dict:
         LOG_CACHE_FIELD_FILE_NAME: file_name,
         LOG_CACHE_FIELD_MAX_FILES: max_files,
         LOG_CACHE_FIELD_MAX_FILE_SIZE_BYTES: int(max_size_mb * 1024 * 1024),
+        LOG_CACHE_FIELD_MIN_LEVEL: min_level,
     }
     return _LOGGING_SETTINGS_CACHE
 
 
+def set_log_min_level(level: Optional[LogLevel]) -> None:
+    """Overrides the configured minimum log level for this process (None restores the configured one)."""
+    global _LOG_MIN_LEVEL_OVERRIDE
+    _LOG_MIN_LEVEL_OVERRIDE = level
+
+
+def set_log_time_fn(time_fn: Optional[Callable[[], float]]) -> None:
+    """Stamps log lines with `time_fn()` instead of the wall clock, e.g. a VirtualClock's time (None restores it)."""
+    global _LOG_TIME_FN
+    _LOG_TIME_FN = time_fn
+
+
+def _log_min_level() -> LogLevel:
+    if _LOG_MIN_LEVEL_OVERRIDE is not None:
+        return _LOG_MIN_LEVEL_OVERRIDE
+    try:
+        return _get_logging_settings()[LOG_CACHE_FIELD_MIN_LEVEL]
+    except Exception:
+        return LogLevel.DEBUG
+
+
 def _rotate_logs_if_needed(log_path: Path, max_files: int, max_size_bytes: int) -> None:
     try:
         if log_path.exists() and log_path.stat().st_size > max_size_bytes:
@@ -120,12 +148,16 @@ def LOG(
     flush: bool = True,
     log_level: LogLevel = LogLevel.DEBUG,
 ) -> None:
+    if LOG_LEVEL_SEVERITY.get(log_level, 0) < LOG_LEVEL_SEVERITY[_log_min_level()]:
+        return
+
     # Prepare the message
     message = sep.join(str(value) for value in values)
 
     # Add timestamp if requested
     if show_time:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        now = datetime.fromtimestamp(_LOG_TIME_FN()) if _LOG_TIME_FN else datetime.now()
+        timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
         message = f"[{timestamp}] {message}"
 
     # Add backtrace if requested
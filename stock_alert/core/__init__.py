@@ -1,3 +1,20 @@
 from .cache_utils import *
+from .cooldowns import *
+from .thresholds import *
 from .runner import *
 from .file_utils import *
+from .alert_io import *
+from .config_watcher import *
+from .circuit_breaker import *
+from .quote_log import *
+from .backtest import *
+from .control import *
+from .daemon import *
+from .broker_protocol import *
+from .broker import *
+from .quote_board import *
+from .soak import *
+from .profiling import *
+from .profiles import *
+from .bar_cache import *
+from .symbol_meta import *
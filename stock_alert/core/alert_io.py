@@ -0,0 +1,114 @@
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+from stock_alert.common import *
+
+
+def detect_alert_format(path: str, fmt: Optional[str] = None) -> str:
+    """Returns the explicit format, or infers it from the file extension (default: jsonl)."""
+    if fmt:
+        return fmt.lower()
+    if Path(path).suffix.lower() == f".{ALERT_IO_FORMAT_CSV}":
+        return ALERT_IO_FORMAT_CSV
+    return ALERT_IO_FORMAT_JSONL
+
+
+def read_alert_rows(fp: TextIO, fmt: str) -> List[Tuple[int, Dict[str, Any]]]:
+    """Reads raw rows as (line_number, row) pairs. Rows are validated separately."""
+    rows: List[Tuple[int, Dict[str, Any]]] = []
+    if fmt == ALERT_IO_FORMAT_CSV:
+        reader = csv.DictReader(fp)
+        for row in reader:
+            # Header is line 1, so the first data row is line 2
+            rows.append((reader.line_num, {k.strip(): (v or "").strip() for k, v in row.items() if k}))
+    elif fmt == ALERT_IO_FORMAT_JSONL:
+        for line_no, line in enumerate(fp, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                row = {"__error__": f"invalid JSON ({e.msg})"}
+            rows.append((line_no, row if isinstance(row, dict) else {"__error__": "expected a JSON object"}))
+    else:
+        raise ValueError(f"Unsupported alert file format: {fmt}")
+    return rows
+
+
+def validate_alert_rows(rows: List[Tuple[int, Dict[str, Any]]]) -> Tuple[Dict[str, Dict], List[str]]:
+    """Validates all rows in one pass.
+
+    Returns (alerts payload keyed by name, errors). Callers must not write anything when errors is non-empty.
+    """
+    alerts: Dict[str, Dict] = {}
+    errors: List[str] = []
+    for line_no, row in rows:
+        if "__error__" in row:
+            errors.append(f"line {line_no}: {row['__error__']}")
+            continue
+        name = str(row.get(ALERT_FIELD_NAME) or "").strip()
+        if not name:
+            errors.append(f"line {line_no}: missing '{ALERT_FIELD_NAME}'")
+            continue
+        if name in alerts:
+            errors.append(f"line {line_no}: duplicate alert name '{name}'")
+            continue
+        payload = {k: v for k, v in row.items() if k != ALERT_FIELD_NAME and v not in ("", None)}
+        if ALERT_FIELD_SYMBOL in payload:
+            payload[ALERT_FIELD_SYMBOL] = str(payload[ALERT_FIELD_SYMBOL]).upper()
+        if isinstance(payload.get(ALERT_FIELD_LEGS), str):
+            payload[ALERT_FIELD_LEGS] = [s.strip().upper() for s in payload[ALERT_FIELD_LEGS].split(",") if s.strip()]
+        elif isinstance(payload.get(ALERT_FIELD_LEGS), list):
+            payload[ALERT_FIELD_LEGS] = [str(s).upper() for s in payload[ALERT_FIELD_LEGS]]
+        try:
+            alerts[name] = Alert.from_dict(payload).to_dict()
+        except KeyError as e:
+            errors.append(f"line {line_no}: missing field {e}")
+        except (TypeError, ValueError) as e:
+            errors.append(f"line {line_no}: {e}")
+    return alerts, errors
+
+
+def write_alerts(fp: TextIO, alerts: Dict[str, Dict], fmt: str) -> int:
+    """Writes alerts sorted by name and returns the number of rows written."""
+    if fmt == ALERT_IO_FORMAT_CSV:
+        writer = csv.DictWriter(fp, fieldnames=ALERT_IO_CSV_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for name, payload in sorted(alerts.items()):
+            row = {ALERT_FIELD_NAME: name, **payload}
+            if ALERT_FIELD_LEGS in row:
+                row[ALERT_FIELD_LEGS] = ",".join(row[ALERT_FIELD_LEGS])
+            writer.writerow(row)
+    elif fmt == ALERT_IO_FORMAT_JSONL:
+        for name, payload in sorted(alerts.items()):
+            fp.write(json.dumps({ALERT_FIELD_NAME: name, **payload}, sort_keys=True) + "\n")
+    else:
+        raise ValueError(f"Unsupported alert file format: {fmt}")
+    return len(alerts)
+
+
+def diff_alerts(old: Dict[str, Dict], new: Dict[str, Dict]) -> Tuple[List[str], List[str], List[str]]:
+    """Returns sorted (added, removed, changed) alert names between two alert payload dicts."""
+    added = sorted(set(new) - set(old))
+    removed = sorted(set(old) - set(new))
+    changed = sorted(name for name in set(old) & set(new) if old[name] != new[name])
+    return added, removed, changed
+
+
+def format_alert_payload(payload: Dict[str, Any]) -> str:
+    if ALERT_FIELD_CONDITION in payload:
+        condition = payload[ALERT_FIELD_CONDITION]
+    else:
+        condition = f"{payload.get(ALERT_FIELD_KIND)} {payload.get(ALERT_FIELD_OP)} {payload.get(ALERT_FIELD_VALUE)}"
+    return f"{payload.get(ALERT_FIELD_SYMBOL)} | {condition} | cooldown {payload.get(ALERT_FIELD_ALERT_COOLDOWN)}s"
+
+
+def format_alerts_diff(old: Dict[str, Dict], new: Dict[str, Dict]) -> List[str]:
+    """Human-readable diff lines ('+' added, '-' removed, '~' changed)."""
+    added, removed, changed = diff_alerts(old, new)
+    lines = [f"+ {name}: {format_alert_payload(new[name])}" for name in added]
+    lines += [f"- {name}: {format_alert_payload(old[name])}" for name in removed]
+    lines += [f"~ {name}: {format_alert_payload(old[name])} -> {format_alert_payload(new[name])}" for name in changed]
+    return lines
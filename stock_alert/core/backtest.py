@@ -0,0 +1,264 @@
+import csv
+import math
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import compress, count, repeat
+from operator import add, ge, le, mul, sub, truediv
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from stock_alert.common import *
+from stock_alert.core.quote_log import QuoteLogWriter, expand_quote_log_paths, is_quote_log, iter_quote_log_raw
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@dataclass
+class QuoteSeries:
+    """Columnar quote history for one symbol, ordered by timestamp."""
+    ts: array = field(default_factory=lambda: array("d"))
+    price: array = field(default_factory=lambda: array("d"))
+    pct_day: array = field(default_factory=lambda: array("d"))
+    volume: array = field(default_factory=lambda: array("q"))
+
+    def append(self, ts: float, price: float, pct_day: float, volume: int) -> None:
+        self.ts.append(ts)
+        self.price.append(price)
+        self.pct_day.append(pct_day)
+        self.volume.append(volume)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def quote(self, symbol: str, i: int) -> Quote:
+        return Quote(symbol=symbol, price=self.price[i], pct_day=self.pct_day[i], volume=self.volume[i])
+
+    def sort_by_ts(self) -> None:
+        """Orders the rows by timestamp (stable: rows with equal timestamps keep their input order)."""
+        if all(a <= b for a, b in zip(self.ts, self.ts[1:])):
+            return
+        order = sorted(range(len(self.ts)), key=self.ts.__getitem__)
+        for col in ("ts", "price", "pct_day", "volume"):
+            values = getattr(self, col)
+            setattr(self, col, array(values.typecode, (values[i] for i in order)))
+
+
+@dataclass
+class BacktestTrigger:
+    ts: float
+    alert_key: str
+    symbol: str
+    price: float
+    reason: str
+
+
+@dataclass
+class BacktestResult:
+    triggers: List[BacktestTrigger]
+    ticks: int
+    alerts: int
+    elapsed_secs: float
+
+    def ticks_per_sec(self) -> float:
+        return self.ticks / self.elapsed_secs if self.elapsed_secs > 0 else float("inf")
+
+    def counts_per_alert(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for t in self.triggers:
+            counts[t.alert_key] = counts.get(t.alert_key, 0) + 1
+        return counts
+
+
+def _parse_ts(raw: str) -> float:
+    try:
+        return float(raw)
+    except ValueError:
+        return datetime.strptime(raw.strip(), TIMESTAMP_FORMAT).timestamp()
+
+
+def load_series_csv(path: str) -> Dict[str, QuoteSeries]:
+    """CSV columns: ts (unix seconds or 'YYYY-mm-dd HH:MM:SS'), symbol, price, pct_day, volume."""
+    series: Dict[str, QuoteSeries] = {}
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            sym = row["symbol"].strip().upper()
+            s = series.get(sym)
+            if s is None:
+                s = series[sym] = QuoteSeries()
+            s.append(_parse_ts(row["ts"]), float(row["price"]), float(row.get("pct_day") or 0.0),
+                     int(float(row.get("volume") or 0)))
+    return series
+
+
+def load_series_qlog(paths: Iterable[str]) -> Dict[str, QuoteSeries]:
+    """Loads one or more binary quote logs (in order) into per-symbol columns."""
+    series: Dict[str, QuoteSeries] = {}
+    for path in paths:
+        by_id: Dict[int, QuoteSeries] = {}  # Symbol ids are per file
+        for ts, records, symbols in iter_quote_log_raw(path):
+            for sid, price, pct, vol in records:
+                s = by_id.get(sid)
+                if s is None:
+                    sym = symbols[sid]
+                    s = by_id[sid] = series.setdefault(sym, QuoteSeries())
+                s.append(ts, price, pct, vol)
+    return series
+
+
+def load_series(paths: List[str]) -> Dict[str, QuoteSeries]:
+    """Loads quote logs or CSV files into per-symbol series sorted by timestamp, whatever the row and file order.
+
+    The fast backtest engine bisects the timestamps to skip cooldowns, so unsorted input would lose triggers.
+    """
+    paths = expand_quote_log_paths(paths)
+    if all(is_quote_log(p) for p in paths):
+        series = load_series_qlog(paths)
+    else:
+        series = {}
+        for p in paths:
+            for sym, s in load_series_csv(p).items():
+                target = series.setdefault(sym, QuoteSeries())
+                for col in ("ts", "price", "pct_day", "volume"):
+                    getattr(target, col).extend(getattr(s, col))
+    for s in series.values():
+        s.sort_by_ts()
+    return series
+
+
+def save_series_qlog(series: Dict[str, QuoteSeries], path: str) -> int:
+    """Writes per-symbol series as a time-ordered quote log. Returns the number of ticks written."""
+    rows = sorted((s.ts[i], sym, i) for sym, s in series.items() for i in range(len(s)))
+    ticks = 0
+    with QuoteLogWriter(path) as writer:
+        i = 0
+        while i < len(rows):
+            ts = rows[i][0]
+            quotes = []
+            while i < len(rows) and rows[i][0] == ts:
+                _, sym, j = rows[i]
+                quotes.append(series[sym].quote(sym, j))
+                i += 1
+            writer.write_tick(ts, quotes)
+            ticks += 1
+    return ticks
+
+
+def _value_stream(alert: Alert, s: QuoteSeries, start: int, prev_price: Optional[float]) -> Optional[Iterator[float]]:
+    """Lazily computes the alert's compared value from `start`, with exactly the arithmetic of should_trigger.
+
+    Returns None for kinds without a fast path.
+    """
+    # memoryview slices are zero-copy and start at `start` directly (islice would walk the skipped prefix)
+    prices = memoryview(s.price)[start:]
+    if alert.kind == AlertKind.PRICE_VALUE:
+        return iter(prices)
+    if alert.kind == AlertKind.PCT_DAY:
+        return iter(memoryview(s.pct_day)[start:])
+    if alert.kind == AlertKind.VOLUME:
+        return iter(memoryview(s.volume)[start:])
+    if alert.kind == AlertKind.PRICE_VALUE_OFFSET_SINCE_LAST_ALERT:
+        if prev_price is None:
+            # price - price / (1 + pct_day / 100); equals 0 when pct_day == 0, like the explicit branch
+            pcts = memoryview(s.pct_day)[start:]
+            return map(sub, prices, map(truediv, prices, map(add, repeat(1), map(truediv, pcts, repeat(100)))))
+        return map(sub, prices, repeat(prev_price))
+    if alert.kind == AlertKind.PRICE_PERCENT_OFFSET_SINCE_LAST_ALERT:
+        if prev_price is None:
+            return iter(memoryview(s.pct_day)[start:])
+        return map(mul, map(truediv, map(sub, prices, repeat(prev_price)), repeat(prev_price)), repeat(100))
+    return None
+
+
+def _backtest_alert_fast(alert_key: str, alert: Alert, s: QuoteSeries, triggers: List[BacktestTrigger]) -> bool:
+    """Finds all triggers of one alert over its symbol's series. Returns False if the kind has no fast path.
+
+    Each search runs as a chain of C-level iterators; after a trigger the cooldown window is skipped with bisect.
+    """
+    cmp = ge if alert.op == Operation.GE else le
+    n = len(s)
+    start = 0
+    prev_price: Optional[float] = None
+    while start < n:
+        if alert.kind == AlertKind.PRICE_PERCENT_OFFSET_SINCE_LAST_ALERT and prev_price == 0:
+            return True  # should_trigger never fires again ("Previous price is zero")
+        values = _value_stream(alert, s, start, prev_price)
+        if values is None:
+            return False
+        j = next(compress(count(start), map(cmp, values, repeat(alert.value))), None)
+        if j is None:
+            return True
+        price = s.price[j]
+        # One should_trigger call per trigger (not per tick) gives the exact live reason text
+        last_record = None if prev_price is None else {CACHE_FIELD_ALERT_LAST_PRICE: prev_price}
+        _, reason = alert.should_trigger(s.quote(alert.symbol, j), s.ts[j], None, last_record, verbose=False)
+        triggers.append(BacktestTrigger(ts=s.ts[j], alert_key=alert_key, symbol=alert.symbol, price=price, reason=reason))
+        prev_price = price
+        # Live runs store the trigger time with second resolution, so the cooldown starts at the floored second
+        start = bisect_left(s.ts, math.floor(s.ts[j]) + alert.alert_cooldown_secs, j + 1)
+    return True
+
+
+def _backtest_alert_reference(alert_key: str, alert: Alert, s: QuoteSeries, triggers: List[BacktestTrigger]) -> None:
+    """Calls Alert.should_trigger tick by tick with the same bookkeeping as run_check."""
+    last_trigger_ts: Optional[str] = None
+    last_record: Optional[Dict[str, Any]] = None
+    for i in range(len(s)):
+        q = s.quote(alert.symbol, i)
+        ok, reason = alert.should_trigger(q, s.ts[i], last_trigger_ts, last_record, verbose=False)
+        if ok:
+            last_trigger_ts = datetime.fromtimestamp(s.ts[i]).strftime(TIMESTAMP_FORMAT)
+            last_record = {ALERT_RECORD_FIELD_TRIGGER_TS: last_trigger_ts, ALERT_RECORD_FIELD_NAME: alert.name,
+                           CACHE_FIELD_ALERT_LAST_PRICE: q.price}
+            triggers.append(BacktestTrigger(ts=s.ts[i], alert_key=alert_key, symbol=alert.symbol, price=q.price,
+                                            reason=reason))
+
+
+def alert_series(alert: Alert, series: Dict[str, QuoteSeries]) -> Optional[QuoteSeries]:
+    """The series an alert is evaluated on; for a multi-leg alert, the combined legs at the ticks all legs share."""
+    if alert.combine is None:
+        return series.get(alert.symbol)
+    legs = [series.get(sym) for sym in alert.legs]
+    if not all(legs):
+        return None
+    first, others = legs[0], legs[1:]
+    other_index = [dict(zip(s.ts, range(len(s)))) for s in others]
+    combined = QuoteSeries()
+    for i, ts in enumerate(first.ts):
+        positions = [index.get(ts) for index in other_index]
+        if None in positions:
+            continue  # A leg without a quote at this tick suppresses evaluation, like in the live loop
+        quotes = {alert.legs[0]: first.quote(alert.legs[0], i)}
+        quotes.update((sym, s.quote(sym, j)) for sym, s, j in zip(alert.legs[1:], others, positions))
+        q = alert.quote_from(quotes)
+        if q is not None:
+            combined.append(ts, q.price, q.pct_day, q.volume)
+    return combined
+
+
+def run_backtest(series: Dict[str, QuoteSeries], alerts: Dict[str, Alert], engine: str = "fast") -> BacktestResult:
+    """Replays the quote history through every alert on the simulated (recorded) clock.
+
+    engine='fast' uses batched per-alert column scans; engine='reference' calls should_trigger on every tick.
+    Both start with no trigger history.
+    """
+    started = time.perf_counter()
+    triggers: List[BacktestTrigger] = []
+    for alert_key, alert in sorted(alerts.items()):
+        s = alert_series(alert, series)
+        if not s:
+            continue
+        if engine == "reference" or not _backtest_alert_fast(alert_key, alert, s, triggers):
+            _backtest_alert_reference(alert_key, alert, s, triggers)
+    triggers.sort(key=lambda t: (t.ts, t.alert_key))
+    ticks = sum(len(s) for s in series.values())
+    return BacktestResult(triggers=triggers, ticks=ticks, alerts=len(alerts), elapsed_secs=time.perf_counter() - started)
+
+
+def write_backtest_report(result: BacktestResult, path: str) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["ts", "time", "alert", "symbol", "price", "reason"])
+        for t in result.triggers:
+            writer.writerow([t.ts, datetime.fromtimestamp(t.ts).strftime(TIMESTAMP_FORMAT), t.alert_key, t.symbol,
+                             t.price, t.reason])
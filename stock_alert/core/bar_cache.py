@@ -0,0 +1,218 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from stock_alert.common import *
+from stock_alert.data_providers import DataProvider
+from stock_alert.core.backtest import TIMESTAMP_FORMAT, QuoteSeries, run_backtest
+from stock_alert.core.cache_utils import load_cache, save_to_cache
+from stock_alert.core.file_utils import atomic_write_bytes
+
+BarRange = Tuple[float, float]  # [start_ts, end_ts)
+
+
+def _days(start_ts: float, end_ts: float) -> List[date]:
+    """Local dates touched by [start_ts, end_ts)."""
+    first, last = datetime.fromtimestamp(start_ts).date(), datetime.fromtimestamp(max(start_ts, end_ts - 1)).date()
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def _day_bounds(day: date) -> BarRange:
+    start = datetime.combine(day, datetime.min.time())
+    return start.timestamp(), (start + timedelta(days=1)).timestamp()
+
+
+@dataclass
+class BarDay:
+    """Cached bars of one symbol on one date. `fetched_to` is how far the date has been requested, so a date
+    without trades (weekend, holiday) is not requested again either."""
+    bars: List[Bar] = field(default_factory=list)
+    fetched_to: float = 0.0
+
+    def merge(self, bars: Iterable[Bar], fetched_to: float) -> None:
+        by_ts = {b.ts: b for b in self.bars}
+        by_ts.update((b.ts, b) for b in bars)  # A re-fetched bar replaces the (possibly partial) cached one
+        self.bars = [by_ts[ts] for ts in sorted(by_ts)]
+        self.fetched_to = max(self.fetched_to, fetched_to)
+
+
+class BarCache:
+    """Intraday bars on disk, one JSON file per interval, symbol and date: <directory>/<interval>s/<SYMBOL>/<date>.json.
+
+    Past dates are requested once; today's file is extended from its last bar on the next start.
+    """
+
+    def __init__(self, directory: str, interval_secs: int):
+        self.directory = Path(directory) / f"{interval_secs}s"
+        self.interval_secs = interval_secs
+
+    def _path(self, symbol: str, day: date) -> Path:
+        return self.directory / symbol.upper() / f"{day.isoformat()}.json"
+
+    def load(self, symbol: str, day: date) -> BarDay:
+        path = self._path(symbol, day)
+        try:
+            data = json.loads(path.read_bytes())
+            return BarDay(bars=[Bar(*row) for row in data["bars"]], fetched_to=float(data["fetched_to"]))
+        except FileNotFoundError:
+            return BarDay()
+        except (ValueError, KeyError, TypeError) as e:
+            LOG(f"Warning: Ignoring unreadable bar cache file {path}: {e}", log_level=LogLevel.WARNING)
+            return BarDay()
+
+    def save(self, symbol: str, day: date, bar_day: BarDay) -> None:
+        path = self._path(symbol, day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rows = [[b.ts, b.open, b.high, b.low, b.close, b.volume] for b in bar_day.bars]
+        payload = {"fetched_to": bar_day.fetched_to, "bars": rows}
+        atomic_write_bytes(str(path), json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+    def missing_ranges(self, symbol: str, start_ts: float, end_ts: float) -> List[BarRange]:
+        """Ranges of [start_ts, end_ts) not fetched yet; adjacent dates are merged into one range."""
+        ranges: List[BarRange] = []
+        for day in _days(start_ts, end_ts):
+            day_start, day_end = _day_bounds(day)
+            lo, hi = max(day_start, start_ts), min(day_end, end_ts)
+            cached = self.load(symbol, day)
+            if cached.fetched_to >= hi:
+                continue
+            lo = max(lo, cached.fetched_to)
+            if cached.bars:
+                lo = min(lo, cached.bars[-1].ts)  # The last bar may have been incomplete when it was fetched
+            if ranges and ranges[-1][1] >= lo:
+                ranges[-1] = (ranges[-1][0], hi)
+            else:
+                ranges.append((lo, hi))
+        return ranges
+
+    def store(self, symbol: str, bars: List[Bar], fetched: BarRange) -> None:
+        """Merges bars fetched for `fetched` into the dates it covers."""
+        by_day: Dict[date, List[Bar]] = {}
+        for b in bars:
+            by_day.setdefault(datetime.fromtimestamp(b.ts).date(), []).append(b)
+        for day in _days(*fetched):
+            bar_day = self.load(symbol, day)
+            bar_day.merge(by_day.get(day, ()), min(_day_bounds(day)[1], fetched[1]))
+            self.save(symbol, day, bar_day)
+
+    def _previous_close(self, symbol: str, day: date) -> Optional[float]:
+        for i in range(1, WARM_START_PREV_CLOSE_LOOKBACK_DAYS + 1):
+            bars = self.load(symbol, day - timedelta(days=i)).bars
+            if bars:
+                return bars[-1].close
+        return None
+
+    def series(self, symbol: str, start_ts: float, end_ts: float) -> QuoteSeries:
+        """Cached bars as a quote series (close price, % vs the previous date's close, cumulative day volume).
+
+        Without an earlier cached date, the first date's % change is measured from its first open.
+        """
+        s = QuoteSeries()
+        prev_close = None
+        for day in _days(start_ts, end_ts):
+            bars = [b for b in self.load(symbol, day).bars if start_ts <= b.ts < end_ts]
+            if not bars:
+                continue
+            if prev_close is None:
+                prev_close = self._previous_close(symbol, day) or bars[0].open
+            day_volume = 0
+            for b in bars:
+                day_volume += b.volume
+                pct_day = (b.close / prev_close - 1) * 100 if prev_close else 0.0
+                s.append(b.ts, b.close, round(pct_day, 2), day_volume)
+            prev_close = bars[-1].close
+        return s
+
+
+@dataclass
+class WarmStartReport:
+    symbols: int = 0
+    symbols_cached: int = 0  # Nothing missing, no request made
+    requests: int = 0
+    failed: int = 0
+    bars_fetched: int = 0
+    alerts_seeded: int = 0
+    elapsed_secs: float = 0.0
+
+    def summary(self) -> str:
+        return (f"{self.symbols} symbol(s), {self.symbols_cached} already cached | {self.requests} bar request(s), "
+                f"failed {self.failed}, {self.bars_fetched} bar(s) fetched | {self.alerts_seeded} alert(s) seeded "
+                f"| {self.elapsed_secs:.1f}s")
+
+
+def fetch_missing_bars(provider: DataProvider, bar_cache: BarCache, symbols: Iterable[str], start_ts: float,
+                       end_ts: float, report: WarmStartReport, max_workers: int = WARM_START_MAX_WORKERS) -> None:
+    """Requests only the ranges missing from the bar cache, several symbols at a time."""
+    symbols = sorted(set(symbols))
+    jobs = [(sym, r) for sym in symbols for r in bar_cache.missing_ranges(sym, start_ts, end_ts)]
+    report.symbols = len(symbols)
+    report.symbols_cached = len(symbols) - len({sym for sym, _ in jobs})
+    if not jobs:
+        return
+
+    interval_secs = bar_cache.interval_secs
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs))), thread_name_prefix="warm-start") as pool:
+        futures = {pool.submit(provider.get_bars, sym, lo, hi, interval_secs): (sym, (lo, hi)) for sym, (lo, hi) in jobs}
+        for future in as_completed(futures):
+            sym, fetched = futures[future]
+            report.requests += 1
+            try:
+                bars = future.result()
+            except NotImplementedError as e:
+                LOG(f"Warning: {e}, skipping bar fetch", log_level=LogLevel.WARNING)
+                for f in futures:
+                    f.cancel()
+                report.failed = len(jobs)
+                return
+            except Exception as e:
+                LOG(f"Warning: Could not fetch bars for {sym}: {e}", log_level=LogLevel.WARNING)
+                report.failed += 1
+                continue
+            bar_cache.store(sym, bars, fetched)
+            report.bars_fetched += len(bars)
+
+
+def seed_alert_history(bar_cache: BarCache, alerts: Dict[str, Alert], cache_config: CacheConfig, start_ts: float,
+                       end_ts: float) -> int:
+    """Replays cached bars for alerts that read the last trigger price but have no trigger history.
+
+    The last replayed trigger is stored as a history record (marked as a warm start) so offset alerts measure from
+    the price they would have triggered at, instead of the pct_day approximation. Cooldowns are not touched: no
+    notification was sent for a replayed trigger. Returns the number of alerts seeded.
+    """
+    cache_data = load_cache(cache_config)
+    history: Dict[str, List[Dict]] = cache_data.get(CACHE_FIELD_ALERTS_HISTORY, {})
+    pending = {k: a for k, a in alerts.items() if a.uses_last_trigger_price() and not history.get(k)}
+    if not pending:
+        return 0
+    symbols = set().union(*(a.legs for a in pending.values()))
+    series = {sym: bar_cache.series(sym, start_ts, end_ts) for sym in symbols}
+    last_triggers = {t.alert_key: t for t in run_backtest(series, pending).triggers}  # Sorted by time
+    for alert_key, t in last_triggers.items():
+        history[alert_key] = [{
+            ALERT_RECORD_FIELD_TRIGGER_TS: datetime.fromtimestamp(t.ts).strftime(TIMESTAMP_FORMAT),
+            ALERT_RECORD_FIELD_NAME: pending[alert_key].name,
+            CACHE_FIELD_ALERT_LAST_PRICE: t.price,
+            ALERT_RECORD_FIELD_SOURCE: ALERT_RECORD_SOURCE_WARM_START,
+        }]
+    if last_triggers:
+        save_to_cache(cache_config, {CACHE_FIELD_ALERTS_HISTORY: history})
+    return len(last_triggers)
+
+
+def warm_start(provider: DataProvider, symbols: Iterable[str], targets: List[Tuple[Dict[str, Alert], CacheConfig]],
+               bar_cache: BarCache, days: int = WARM_START_DEFAULT_DAYS, now_ts: Optional[float] = None) -> WarmStartReport:
+    """Fills the bar cache for the last `days` calendar days, then seeds each (alerts, cache) target from it."""
+    started = time.perf_counter()
+    end_ts = now_ts if now_ts is not None else time.time()
+    first_day = datetime.fromtimestamp(end_ts).date() - timedelta(days=max(1, days) - 1)
+    start_ts = _day_bounds(first_day)[0]
+    report = WarmStartReport()
+    fetch_missing_bars(provider, bar_cache, symbols, start_ts, end_ts, report)
+    for alerts, cache_config in targets:
+        report.alerts_seeded += seed_alert_history(bar_cache, alerts, cache_config, start_ts, end_ts)
+    report.elapsed_secs = time.perf_counter() - started
+    return report
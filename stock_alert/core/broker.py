@@ -0,0 +1,145 @@
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from stock_alert.common import *
+from stock_alert.data_providers import DataProvider
+from stock_alert.core.broker_protocol import *
+from stock_alert.core.quote_log import QUOTE_RECORD
+from stock_alert.core.runner import MonitorState, TickStats, fetch_quotes
+
+
+class _Subscriber:
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.symbols: Set[str] = set()
+        self.symbol_ids: Dict[str, int] = {}
+        self.send_lock = threading.Lock()
+
+    def encode_tick(self, ts: float, quotes: Dict[str, Quote], errors: Dict[str, str]) -> bytes:
+        frames: List[bytes] = []
+        records: List[bytes] = []
+        for sym in sorted(self.symbols):
+            q = quotes.get(sym)
+            if q is None:
+                if sym in errors:
+                    frames.append(encode_frame(FRAME_ERROR, f"{sym}\t{errors[sym]}".encode("utf-8")))
+                continue
+            sid = self.symbol_ids.get(sym)
+            if sid is None:
+                sid = self.symbol_ids[sym] = len(self.symbol_ids)
+                frames.append(encode_frame(FRAME_SYMBOL, SYMBOL_ID.pack(sid) + sym.encode("utf-8")))
+            records.append(QUOTE_RECORD.pack(sid, q.price, q.pct_day, int(q.volume)))
+        frames.append(encode_frame(FRAME_QUOTES, QUOTES_HEADER.pack(ts, len(records)) + b"".join(records)))
+        return b"".join(frames)
+
+
+class QuoteBroker:
+    """Fetches the union of all subscribers' symbols once per interval and pushes the quotes to each of them."""
+
+    def __init__(self, provider: DataProvider, interval_secs: int, socket_path: Optional[str] = None):
+        self.provider = provider
+        self.interval_secs = interval_secs
+        self.socket_path = socket_path or broker_socket_path()
+        self.state = MonitorState()
+        self._subscribers: List[_Subscriber] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._server_sock: Optional[socket.socket] = None
+
+    def start(self) -> None:
+        Path(self.socket_path).parent.mkdir(parents=True, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server_sock.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        self._server_sock.listen()
+        threading.Thread(target=self._accept_loop, name="broker-accept", daemon=True).start()
+        LOG(f"Quote broker listening on {self.socket_path}")
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+        if self._server_sock is not None:
+            self._server_sock.close()
+        with self._lock:
+            for sub in self._subscribers:
+                sub.sock.close()
+            self._subscribers.clear()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def _accept_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                sock, _ = self._server_sock.accept()
+            except OSError:
+                return
+            sub = _Subscriber(sock)
+            try:
+                sock.sendall(encode_frame(FRAME_INFO, BROKER_INFO.pack(float(self.interval_secs))))
+            except OSError:
+                sock.close()
+                continue
+            with self._lock:
+                self._subscribers.append(sub)
+            threading.Thread(target=self._read_loop, args=(sub,), name="broker-client", daemon=True).start()
+
+    def _read_loop(self, sub: _Subscriber) -> None:
+        try:
+            while True:
+                frame = read_frame(sub.sock)
+                if frame is None:
+                    break
+                frame_type, body = frame
+                if frame_type == FRAME_SUBSCRIBE:
+                    symbols = {s.strip().upper() for s in body.decode("utf-8").split(",") if s.strip()}
+                    with self._lock:
+                        is_new = bool(symbols - self.symbols())
+                        sub.symbols = symbols
+                    if is_new:
+                        self._wake.set()  # Fetch right away instead of making the new subscriber wait an interval
+        except (OSError, ConnectionError):
+            pass
+        self._drop(sub)
+
+    def _drop(self, sub: _Subscriber) -> None:
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+        sub.sock.close()
+
+    def symbols(self) -> Set[str]:
+        return set().union(*(sub.symbols for sub in self._subscribers)) if self._subscribers else set()
+
+    def tick(self) -> TickStats:
+        """Fetches the union of subscribed symbols once and pushes each subscriber its share."""
+        with self._lock:
+            symbols = self.symbols()
+            subscribers = list(self._subscribers)
+        stats = TickStats()
+        if not symbols:
+            return stats
+        now_ts = time.time()
+        quotes = fetch_quotes(self.provider, symbols, now_ts, self.state, stats)
+        errors = {sym: b.last_error for sym, b in self.state.breakers.symbol_breakers.items() if b.last_error}
+        for sub in subscribers:
+            try:
+                with sub.send_lock:
+                    sub.sock.sendall(sub.encode_tick(now_ts, quotes, errors))
+            except OSError:
+                self._drop(sub)
+        return stats
+
+    def run_forever(self) -> None:
+        while not self._stopping.is_set():
+            started = time.time()
+            stats = self.tick()
+            if stats.symbols_total:
+                LOG(f"Broker tick: {stats.summary()} | {len(self._subscribers)} subscriber(s)")
+            self._wake.wait(max(0.0, self.interval_secs - (time.time() - started)))
+            self._wake.clear()
@@ -0,0 +1,61 @@
+import socket
+import struct
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from stock_alert.common import *
+from stock_alert.core.quote_log import QUOTE_RECORD
+
+# Framing: every frame is  length (I, of type + body) | type (1 byte) | body
+#   client -> broker  'U' subscribe : utf-8 symbols joined by ','  (replaces the client's subscription)
+#   broker -> client  'I' info      : fetch interval in seconds (d), sent once on connect
+#                     'S' symbol    : symbol id (I) | utf-8 name    (ids are per connection)
+#                     'Q' quotes    : timestamp (d) | count (I) | count * QUOTE_RECORD
+#                     'E' error     : utf-8 "SYMBOL\tmessage"
+FRAME_HEADER = struct.Struct("<Ic")
+FRAME_SUBSCRIBE = b"U"
+FRAME_INFO = b"I"
+FRAME_SYMBOL = b"S"
+FRAME_QUOTES = b"Q"
+FRAME_ERROR = b"E"
+QUOTES_HEADER = struct.Struct("<dI")
+SYMBOL_ID = struct.Struct("<I")
+BROKER_INFO = struct.Struct("<d")
+
+
+def broker_socket_path() -> str:
+    return str(Path(DEFAULT_STORAGE_DIR_PATH) / BROKER_SOCKET_REL_PATH_VS_STORAGE)
+
+
+def encode_frame(frame_type: bytes, body: bytes) -> bytes:
+    return FRAME_HEADER.pack(len(body) + 1, frame_type) + body
+
+
+def _recv_exact(sock: socket.socket, n: int) -> Optional[bytes]:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+    return bytes(buf)
+
+
+def read_frame(sock: socket.socket) -> Optional[Tuple[bytes, bytes]]:
+    """Blocks for the next (type, body) frame; None when the peer closed the connection."""
+    head = _recv_exact(sock, FRAME_HEADER.size)
+    if head is None:
+        return None
+    length, frame_type = FRAME_HEADER.unpack(head)
+    if length < 1 or length > BROKER_MAX_FRAME_BYTES:
+        raise ConnectionError(f"Invalid broker frame length: {length}")
+    body = _recv_exact(sock, length - 1)
+    if body is None:
+        return None
+    return frame_type, body
+
+
+def decode_quotes(body: bytes, symbols: Dict[int, str]) -> Tuple[float, Dict[str, Quote]]:
+    ts, count = QUOTES_HEADER.unpack_from(body)
+    records = QUOTE_RECORD.iter_unpack(body[QUOTES_HEADER.size:QUOTES_HEADER.size + count * QUOTE_RECORD.size])
+    return ts, {symbols[sid]: Quote(symbol=symbols[sid], price=price, pct_day=pct, volume=vol)
+                for sid, price, pct, vol in records}
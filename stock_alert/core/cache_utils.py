@@ -1,8 +1,107 @@
 import json
+import marshal
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
-from common import *
+from stock_alert.common import *
+from stock_alert.core.file_utils import atomic_write_bytes
 import re
+from functools import lru_cache
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+
+class CacheFormatError(ValueError):
+    """Raised for a cache file that cannot be decoded (truncated, corrupt or written by a newer version)."""
+
+
+class CacheSerializer:
+    """Encodes the cache dict to bytes and back. Subclasses are registered in CACHE_SERIALIZERS by name."""
+    name = ""
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class JsonCacheSerializer(CacheSerializer):
+    name = CACHE_SERIALIZER_JSON
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        return json.loads(payload)
+
+
+class MarshalCacheSerializer(CacheSerializer):
+    name = CACHE_SERIALIZER_MARSHAL
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        return marshal.dumps(data)
+
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        return marshal.loads(payload)
+
+
+class MsgpackCacheSerializer(CacheSerializer):
+    name = CACHE_SERIALIZER_MSGPACK
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        return msgpack.unpackb(payload, raw=False)
+
+
+CACHE_SERIALIZERS: Dict[str, CacheSerializer] = {
+    s.name: s for s in (JsonCacheSerializer(), MarshalCacheSerializer(), MsgpackCacheSerializer())
+}
+
+
+@lru_cache(maxsize=None)  # Also keeps the missing-msgpack warning to once per process
+def get_cache_serializer(name: str) -> CacheSerializer:
+    """Looks up a serializer by name; msgpack falls back to JSON when the package is not installed."""
+    serializer = CACHE_SERIALIZERS.get(name)
+    if serializer is None:
+        raise ValueError(f"Unknown cache serializer '{name}' (expected one of: {', '.join(CACHE_SERIALIZERS)})")
+    if name == CACHE_SERIALIZER_MSGPACK and msgpack is None:
+        LOG("Warning: msgpack is not installed, writing the cache as JSON", log_level=LogLevel.WARNING)
+        return CACHE_SERIALIZERS[CACHE_DEFAULT_SERIALIZER]
+    return serializer
+
+
+def encode_cache(data: Dict[str, Any], serializer: CacheSerializer) -> bytes:
+    header = CACHE_FILE_MAGIC + f" {CACHE_FORMAT_VERSION} {serializer.name}\n".encode("ascii")
+    return header + serializer.dumps(data)
+
+
+def decode_cache(raw: bytes) -> Dict[str, Any]:
+    """Decodes a cache file using the serializer named in its header (files without a header are legacy JSON)."""
+    if not raw.startswith(CACHE_FILE_MAGIC):
+        serializer = CACHE_SERIALIZERS[CACHE_SERIALIZER_JSON]
+        payload = raw
+    else:
+        header, _, payload = raw.partition(b"\n")
+        parts = header.decode("ascii", "replace").split()
+        if len(parts) != 3 or not parts[1].isdigit():
+            raise CacheFormatError(f"Malformed cache header: {header[:64]!r}")
+        if int(parts[1]) > CACHE_FORMAT_VERSION:
+            raise CacheFormatError(f"Cache format version {parts[1]} is newer than supported ({CACHE_FORMAT_VERSION})")
+        serializer = CACHE_SERIALIZERS.get(parts[2])
+        if serializer is None or (serializer.name == CACHE_SERIALIZER_MSGPACK and msgpack is None):
+            raise CacheFormatError(f"Cache was written with unavailable serializer '{parts[2]}'")
+    try:
+        data = serializer.loads(payload)
+    except Exception as e:  # Each serializer raises its own error types for truncated or corrupt payloads
+        raise CacheFormatError(f"Could not decode {serializer.name} cache payload: {e}") from e
+    if not isinstance(data, dict):
+        raise CacheFormatError(f"Cache payload is a {type(data).__name__}, expected an object")
+    return data
 
 
 def get_latest_cache_file(config: CacheConfig) -> Path:
@@ -13,7 +112,7 @@ def get_latest_cache_file(config: CacheConfig) -> Path:
 
 def _get_cache_file_components(config: CacheConfig) -> Tuple[Path, str, str, str]:
     """Extract reusable cache file components."""
-    cache_dir = config.directory
+    cache_dir = Path(config.directory)
     cache_file_name_no_ext = Path(config.file_name).stem
     cache_file_ext = Path(config.file_name).suffix
     pattern = f"{cache_file_name_no_ext}\\.(\\d+){re.escape(cache_file_ext)}"
@@ -42,6 +141,25 @@ def rotate_cache_files(config: CacheConfig) -> None:
         file.unlink()
 
 
+def load_cache(config: CacheConfig) -> Dict[str, Any]:
+    """Loads the latest readable cache file.
+
+    Rotated files carry the full merged state at the time they were rotated, so if the latest file cannot be
+    decoded the newest readable rotated file is used instead of silently starting from an empty cache.
+    """
+    candidates = [get_latest_cache_file(config)] + [file for _, file in _get_rotated_files(config)]
+    for cache_file in candidates:
+        try:
+            raw = cache_file.read_bytes()
+        except FileNotFoundError:
+            continue
+        try:
+            return decode_cache(raw)
+        except CacheFormatError as e:
+            LOG(f"Warning: Ignoring unreadable cache file {cache_file}: {e}", log_level=LogLevel.WARNING)
+    return {}
+
+
 def save_to_cache(config: CacheConfig, data: Dict[str, Any]) -> None:
     """Merges and saves data to the cache file and handles rotation.
 
@@ -51,17 +169,8 @@ def save_to_cache(config: CacheConfig, data: Dict[str, Any]) -> None:
     LOG("saving to cache ...")
     latest_cache_file = get_latest_cache_file(config)
 
-    # Load existing cache contents
-    existing: Dict[str, Any] = {}
-    if latest_cache_file.exists():
-        try:
-            with open(latest_cache_file, "r") as f:
-                existing = json.load(f)
-        except Exception:
-            pass
-
     # Shallow merge (top-level) — callers should provide full structures per key
-    merged = {**existing, **data}
+    merged = {**load_cache(config), **data}
 
     # Handle rotation if size too big
     if latest_cache_file.exists() and latest_cache_file.stat().st_size > config.max_file_size:
@@ -75,7 +184,7 @@ def save_to_cache(config: CacheConfig, data: Dict[str, Any]) -> None:
         latest_cache_file.rename(latest_cache_file.with_name(new_name))
         rotate_cache_files(config)
 
-    # Write merged data
-    with open(latest_cache_file, "w") as f:
-        LOG(f"writing to {latest_cache_file} ... {len(merged)} entries")
-        json.dump(merged, f, indent=2)
+    # Write merged data (tmp file + rename, so a crash mid-write leaves the previous file intact)
+    latest_cache_file.parent.mkdir(parents=True, exist_ok=True)
+    LOG(f"writing to {latest_cache_file} ... {len(merged)} entries")
+    atomic_write_bytes(str(latest_cache_file), encode_cache(merged, get_cache_serializer(config.serializer)))
@@ -0,0 +1,78 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from stock_alert.common import *
+
+
+@dataclass
+class CircuitBreaker:
+    """Consecutive-failure breaker with exponential backoff and a half-open probe.
+
+    CLOSED: calls allowed. OPEN: calls skipped and the last error is served as a cached negative result.
+    When the backoff expires the breaker goes HALF_OPEN and lets one probe through: success closes it,
+    failure re-opens it with a doubled backoff (capped at `max_backoff_secs`).
+    """
+    key: str
+    failure_threshold: int = BREAKER_SYMBOL_FAILURE_THRESHOLD
+    base_backoff_secs: float = BREAKER_BASE_BACKOFF_SECS
+    max_backoff_secs: float = BREAKER_MAX_BACKOFF_SECS
+    state: BreakerState = BreakerState.CLOSED
+    consecutive_failures: int = 0
+    times_opened: int = 0  # Since the last success; drives the backoff exponent
+    open_until: float = 0.0
+    last_error: str = ""
+
+    def allow(self, now_ts: float) -> bool:
+        if self.state == BreakerState.OPEN:
+            if now_ts < self.open_until:
+                return False
+            self.state = BreakerState.HALF_OPEN
+        return True
+
+    def record_success(self) -> None:
+        self.state = BreakerState.CLOSED
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self.last_error = ""
+
+    def record_failure(self, now_ts: float, error: str) -> bool:
+        """Returns True if this failure opened the breaker."""
+        self.consecutive_failures += 1
+        self.last_error = error
+        if self.state == BreakerState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            backoff = min(self.max_backoff_secs, self.base_backoff_secs * (2 ** self.times_opened))
+            self.times_opened += 1
+            self.state = BreakerState.OPEN
+            self.open_until = now_ts + backoff
+            return True
+        return False
+
+    def describe(self, now_ts: float) -> str:
+        if self.state == BreakerState.OPEN:
+            return f"{self.key}=open {max(0.0, self.open_until - now_ts):.0f}s ({self.last_error})"
+        return f"{self.key}={self.state.value}"
+
+
+@dataclass
+class BreakerRegistry:
+    """Per-symbol breakers plus one breaker for the provider as a whole."""
+    provider_breaker: CircuitBreaker = field(
+        default_factory=lambda: CircuitBreaker(key="provider", failure_threshold=BREAKER_PROVIDER_FAILURE_THRESHOLD))
+    symbol_breakers: Dict[str, CircuitBreaker] = field(default_factory=dict)
+
+    def for_symbol(self, symbol: str) -> CircuitBreaker:
+        breaker = self.symbol_breakers.get(symbol)
+        if breaker is None:
+            breaker = self.symbol_breakers[symbol] = CircuitBreaker(key=symbol)
+        return breaker
+
+    def forget(self, symbols: List[str]) -> None:
+        for sym in symbols:
+            self.symbol_breakers.pop(sym, None)
+
+    def non_closed(self) -> List[CircuitBreaker]:
+        breakers = [self.provider_breaker] + sorted(self.symbol_breakers.values(), key=lambda b: b.key)
+        return [b for b in breakers if b.state != BreakerState.CLOSED]
+
+    def summary(self, now_ts: float) -> Optional[str]:
+        non_closed = self.non_closed()
+        return ", ".join(b.describe(now_ts) for b in non_closed) if non_closed else None
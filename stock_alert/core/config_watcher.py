@@ -0,0 +1,119 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from stock_alert.common import *
+
+
+@dataclass
+class ConfigDiff:
+    """Incremental change between two config snapshots. Only added/changed alerts are (re)compiled."""
+    added: Dict[str, Alert] = field(default_factory=dict)
+    changed: Dict[str, Alert] = field(default_factory=dict)
+    removed: List[str] = field(default_factory=list)
+    watchlist: Optional[List[str]] = None  # New watchlist, None if unchanged
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed or self.watchlist is not None)
+
+    def merge(self, later: "ConfigDiff") -> None:
+        """Folds a later diff into this one, so applying the result equals applying both in order."""
+        for name in later.removed:
+            self.added.pop(name, None)
+            self.changed.pop(name, None)
+            if name not in self.removed:
+                self.removed.append(name)
+        for name, alert in list(later.added.items()) + list(later.changed.items()):
+            if name in self.removed:
+                self.removed.remove(name)
+                self.changed[name] = alert  # Removal is overridden; re-adding replaces any old instance
+            elif name in self.added or (name in later.added and name not in self.changed):
+                self.added[name] = alert
+            else:
+                self.changed[name] = alert
+        if later.watchlist is not None:
+            self.watchlist = later.watchlist
+
+    def summary(self) -> str:
+        parts = [f"{len(self.added)} added", f"{len(self.changed)} changed", f"{len(self.removed)} removed"]
+        if self.watchlist is not None:
+            parts.append(f"watchlist -> {len(self.watchlist)} symbol(s)")
+        return ", ".join(parts)
+
+
+class ConfigWatcher:
+    """Detects config file changes with a cheap stat() per poll and computes an incremental diff.
+
+    save_config writes via tmp-file + rename, so a changed (inode, mtime, size) means a complete new file.
+    """
+
+    def __init__(self, path: str, alerts_payload: Dict[str, Dict], watchlist: List[str]):
+        self.path = path
+        self.alerts_payload: Dict[str, Dict] = dict(alerts_payload)
+        self.watchlist: List[str] = sorted(set(s.upper() for s in watchlist))
+        self._signature = self._stat_signature()
+
+    def _stat_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def mark_synced(self) -> None:
+        """Accepts the current file as already applied (e.g. after this process wrote it)."""
+        self._signature = self._stat_signature()
+
+    def poll(self) -> Optional[ConfigDiff]:
+        """Returns a diff if the file changed since the last poll, otherwise None."""
+        signature = self._stat_signature()
+        if signature is None or signature == self._signature:
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            # Keep the old signature so the next poll retries
+            LOG(f"Warning: Could not reload config {self.path}: {e}", log_level=LogLevel.WARNING)
+            return None
+        self._signature = signature
+
+        diff = self._diff(config.get(ALERT_CORE_CONFIG_KEY, {}), config.get(ALERT_FIELD_WATCHLIST, []))
+        return None if diff.is_empty() else diff
+
+    def _diff(self, new_payload: Dict[str, Dict], new_watchlist: List[Any]) -> ConfigDiff:
+        diff = ConfigDiff()
+        applied_payload: Dict[str, Dict] = {}
+        for name, payload in new_payload.items():
+            old = self.alerts_payload.get(name)
+            if old == payload:
+                applied_payload[name] = payload
+                continue
+            try:
+                alert = Alert.from_dict(payload)
+            except (KeyError, TypeError, ValueError) as e:
+                LOG(f"Warning: Ignoring invalid alert '{name}' in reloaded config: {e}", log_level=LogLevel.WARNING)
+                if old is not None:
+                    applied_payload[name] = old  # Keep running the previous valid version
+                continue
+            applied_payload[name] = payload
+            if old is None:
+                diff.added[name] = alert
+            else:
+                diff.changed[name] = alert
+        diff.removed = sorted(name for name in self.alerts_payload if name not in new_payload)
+        self.alerts_payload = applied_payload
+
+        watchlist = sorted(set(str(s).upper() for s in new_watchlist)) if isinstance(new_watchlist, list) else []
+        if watchlist != self.watchlist:
+            self.watchlist = watchlist
+            diff.watchlist = watchlist
+        return diff
+
+
+def apply_config_diff(alerts: Dict[str, Alert], diff: ConfigDiff) -> None:
+    """Applies a diff to the running alert set in place."""
+    for name in diff.removed:
+        alerts.pop(name, None)
+    alerts.update(diff.added)
+    alerts.update(diff.changed)
@@ -0,0 +1,89 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from stock_alert.common import *
+
+# Protocol: one JSON object per line in each direction.
+#   request : {"cmd": "<name>", "args": {...}}
+#   response: {"ok": true, "lines": [...], "result": ...} or {"ok": false, "error": "..."}
+ControlHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def control_socket_path() -> str:
+    return str(Path(DEFAULT_STORAGE_DIR_PATH) / CONTROL_SOCKET_REL_PATH_VS_STORAGE)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline(CONTROL_MAX_REQUEST_BYTES)
+        try:
+            request = json.loads(line.decode("utf-8"))
+            handler = self.server.handlers.get(request.get("cmd"))
+            if handler is None:
+                response = {"ok": False, "error": f"Unknown command: {request.get('cmd')}"}
+            else:
+                response = handler(request.get("args") or {})
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, handlers: Dict[str, ControlHandler]):
+        self.handlers = handlers
+        super().__init__(path, _RequestHandler)
+
+
+class ControlServer:
+    """Serves control commands on a Unix domain socket from a background thread."""
+
+    def __init__(self, socket_path: str, handlers: Dict[str, ControlHandler]):
+        self.socket_path = socket_path
+        self.handlers = handlers
+        self._server: Optional[_UnixServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        Path(self.socket_path).parent.mkdir(parents=True, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            if send_control_command("ping", socket_path=self.socket_path) is not None:
+                raise RuntimeError(f"Another monitor daemon is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)  # Stale socket from a crashed run
+        self._server = _UnixServer(self.socket_path, self.handlers)
+        os.chmod(self.socket_path, 0o600)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="control-server", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def send_control_command(cmd: str, args: Optional[Dict[str, Any]] = None, socket_path: Optional[str] = None,
+                         timeout_secs: float = CONTROL_TIMEOUT_SECS) -> Optional[Dict[str, Any]]:
+    """Sends one command to a running monitor daemon. Returns None if no daemon is listening."""
+    socket_path = socket_path or control_socket_path()
+    if not os.path.exists(socket_path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout_secs)
+            sock.connect(socket_path)
+            sock.sendall((json.dumps({"cmd": cmd, "args": args or {}}) + "\n").encode("utf-8"))
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except (ConnectionRefusedError, FileNotFoundError):
+        return None
+    if not line:
+        raise ConnectionError(f"Monitor daemon at {socket_path} closed the connection without answering")
+    return json.loads(line.decode("utf-8"))
@@ -0,0 +1,58 @@
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+from stock_alert.common import *
+
+
+class CooldownSchedule:
+    """Min-heap of cooldown expirations for alerts that just triggered (or were found cooling down).
+
+    An alert in the schedule cannot trigger, so run_check leaves it out of the evaluation set until its cooldown
+    expires. Cancelled or rescheduled entries are left in the heap and dropped when they surface.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, str]] = []
+        self._entries: Dict[str, Tuple[float, Alert]] = {}  # Alert name -> (expiry, alert instance it applies to)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, alert_key: str) -> bool:
+        return alert_key in self._entries
+
+    def keys(self):
+        return self._entries.keys()
+
+    def expires_at(self, alert_key: str) -> Optional[float]:
+        entry = self._entries.get(alert_key)
+        return entry[0] if entry else None
+
+    def schedule(self, alert_key: str, alert: Alert, expires_ts: float) -> None:
+        self._entries[alert_key] = (expires_ts, alert)
+        heapq.heappush(self._heap, (expires_ts, alert_key))
+
+    def cancel(self, alert_key: str) -> None:
+        self._entries.pop(alert_key, None)
+
+    def pop_expired(self, now_ts: float) -> List[str]:
+        """Removes and returns the alerts whose cooldown has ended by now_ts."""
+        expired: List[str] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now_ts:
+            expires_ts, alert_key = heapq.heappop(heap)
+            entry = self._entries.get(alert_key)
+            if entry is not None and entry[0] == expires_ts:
+                del self._entries[alert_key]
+                expired.append(alert_key)
+        return expired
+
+    def retain(self, alerts: Dict[str, Alert]) -> None:
+        """Drops entries whose alert was removed or replaced (a new instance is evaluated and rescheduled)."""
+        for alert_key in [k for k, (_, alert) in self._entries.items() if alerts.get(k) is not alert]:
+            del self._entries[alert_key]
+
+    def idle_symbols(self, dependents: Dict[str, List[str]]) -> Set[str]:
+        """Symbols whose alerts are all cooling down (so fetching them cannot lead to a trigger)."""
+        entries = self._entries
+        candidates = {sym for _, alert in entries.values() for sym in alert.legs}
+        return {sym for sym in candidates if all(k in entries for k in dependents.get(sym, ()))}
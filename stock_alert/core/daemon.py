@@ -0,0 +1,152 @@
+import threading
+from typing import Any, Dict, List, Optional
+from stock_alert.common import *
+from stock_alert.core.config_watcher import ConfigDiff, ConfigWatcher
+from stock_alert.core.control import ControlServer, control_socket_path
+from stock_alert.core.file_utils import load_config, save_config
+from stock_alert.core.runner import MonitorState
+
+
+class MonitorDaemon(ConfigWatcher):
+    """Owns the monitor's in-memory config and serves manage commands over a Unix socket.
+
+    Commands are validated and answered immediately from the server thread; the resulting diff is queued and
+    applied by run_loop (via poll()) at the start of the next tick, so the alert dict is only ever mutated by
+    the loop thread. The config file is updated as a debounced write-behind snapshot, and manual edits of the
+    file are still picked up like with a plain ConfigWatcher.
+    """
+
+    def __init__(self, path: str, alerts_payload: Dict[str, Dict], watchlist: List[str], state: MonitorState,
+                 socket_path: Optional[str] = None, snapshot_delay_secs: float = CONTROL_SNAPSHOT_DELAY_SECS):
+        super().__init__(path, alerts_payload, watchlist)
+        self.state = state
+        self.snapshot_delay_secs = snapshot_delay_secs
+        self._lock = threading.RLock()
+        self._pending = ConfigDiff()
+        self._dirty = threading.Event()
+        self._stopping = threading.Event()
+        self._snapshot_thread = threading.Thread(target=self._snapshot_loop, name="config-snapshot", daemon=True)
+        self.server = ControlServer(socket_path or control_socket_path(), handlers={
+            "ping": lambda _args: {"ok": True, "lines": ["pong"]},
+            "status": self._cmd_status,
+            "alert_create": self._cmd_alert_create,
+            "alert_delete": self._cmd_alert_delete,
+            "alerts_list": self._cmd_alerts_list,
+            "watchlist_add": self._cmd_watchlist_add,
+            "watchlist_remove": self._cmd_watchlist_remove,
+            "watchlist_list": self._cmd_watchlist_list,
+        })
+
+    def start(self) -> None:
+        self.server.start()
+        self._snapshot_thread.start()
+        LOG(f"Monitor daemon listening on {self.server.socket_path}")
+
+    def stop(self) -> None:
+        self.server.stop()
+        self._stopping.set()
+        self._dirty.set()
+        self._snapshot_thread.join(timeout=5)
+
+    # ConfigWatcher interface used by run_loop
+    def poll(self) -> Optional[ConfigDiff]:
+        with self._lock:
+            file_diff = super().poll()
+            pending, self._pending = self._pending, ConfigDiff()
+        if file_diff:
+            pending.merge(file_diff)
+        return None if pending.is_empty() else pending
+
+    def _queue(self, diff: ConfigDiff) -> None:
+        self._pending.merge(diff)
+        self._dirty.set()
+
+    def _snapshot_loop(self) -> None:
+        while not self._stopping.is_set():
+            self._dirty.wait()
+            self._stopping.wait(self.snapshot_delay_secs)  # Debounce bursts of commands into one write
+            self._dirty.clear()
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        with self._lock:
+            config = load_config()
+            config[ALERT_CORE_CONFIG_KEY] = dict(self.alerts_payload)
+            config[ALERT_FIELD_WATCHLIST] = list(self.watchlist)
+            try:
+                save_config(config)
+                self.mark_synced()
+            except OSError as e:
+                LOG(f"Warning: Could not write config snapshot: {e}", log_level=LogLevel.WARNING)
+
+    # Command handlers (run on server threads)
+    def _cmd_status(self, _args: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            lines = [f"Monitor daemon: {self.state.ticks} tick(s), {len(self.alerts_payload)} alert(s), "
+                     f"{len(self.watchlist)} watchlist symbol(s)"]
+        breakers = self.state.breakers.summary(self.state.last_tick_ts or 0.0)
+        if breakers:
+            lines.append(f"Breakers: {breakers}")
+        return {"ok": True, "lines": lines}
+
+    def _cmd_alert_create(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        name = args["name"]
+        alert = Alert.from_dict(args["alert"])
+        with self._lock:
+            if name in self.alerts_payload:
+                return {"ok": False, "error": f"Alert with name '{name}' already exists."}
+            self.alerts_payload[name] = alert.to_dict()
+            self._queue(ConfigDiff(added={name: alert}))
+        return {"ok": True, "lines": [f"Created alert '{name}' for {alert.symbol}: {alert.describe()}"]}
+
+    def _cmd_alert_delete(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        names = list(args["names"])
+        with self._lock:
+            missing = sorted(set(names) - set(self.alerts_payload))
+            if missing:
+                return {"ok": False, "error": f"Unknown alert(s): {', '.join(missing)}"}
+            for name in names:
+                self.alerts_payload.pop(name, None)
+            self._queue(ConfigDiff(removed=names))
+        return {"ok": True, "lines": [f"Deleted alert(s): {', '.join(sorted(names))}"]}
+
+    def _cmd_alerts_list(self, _args: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            alerts = {name: Alert.from_dict(payload) for name, payload in self.alerts_payload.items()}
+        if not alerts:
+            return {"ok": True, "lines": ["No alerts defined."]}
+        last_trigger_ts = dict(self.state.last_trigger_ts)
+        lines = ["Alerts:"]
+        for name, a in sorted(alerts.items()):
+            last = last_trigger_ts.get(name, "never")
+            lines.append(f"- {name}: {a.symbol} | {a.describe()} | cooldown {a.alert_cooldown_secs}s | last {last}")
+        return {"ok": True, "lines": lines}
+
+    def _set_watchlist(self, symbols: List[str]) -> None:
+        self.watchlist = sorted(set(symbols))
+        self._queue(ConfigDiff(watchlist=list(self.watchlist)))
+
+    def _cmd_watchlist_add(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        symbols = set(s.upper() for s in args["symbols"])
+        with self._lock:
+            added = sorted(symbols - set(self.watchlist))
+            if not added:
+                return {"ok": True, "lines": ["No new symbols added."]}
+            self._set_watchlist(self.watchlist + added)
+        return {"ok": True, "lines": [f"Added to watchlist: {', '.join(added)}"]}
+
+    def _cmd_watchlist_remove(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        symbols = set(s.upper() for s in args["symbols"])
+        with self._lock:
+            removed = sorted(symbols & set(self.watchlist))
+            if not removed:
+                return {"ok": True, "lines": ["No symbols removed."]}
+            self._set_watchlist([s for s in self.watchlist if s not in symbols])
+        return {"ok": True, "lines": [f"Removed from watchlist: {', '.join(removed)}"]}
+
+    def _cmd_watchlist_list(self, _args: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            symbols = list(self.watchlist)
+        if not symbols:
+            return {"ok": True, "lines": ["Watchlist is empty."]}
+        return {"ok": True, "lines": ["Watchlist:"] + [f"- {s}" for s in symbols]}
@@ -1,6 +1,6 @@
 import json
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from stock_alert.common import *
 
 
@@ -20,17 +20,36 @@ def _load_json(path: str, default):
         return default
 
 
-def _save_json(path: str, data):
-    tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, sort_keys=True)
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """Writes a tmp file next to `path` and renames it over `path`, so readers never see a partial file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
     os.replace(tmp, path)
 
 
-def load_config() -> Dict[str, Any]:
+def _save_json(path: str, data):
+    atomic_write_bytes(path, json.dumps(data, indent=2, sort_keys=True).encode("utf-8"))
+
+
+def config_file_path() -> str:
+    return _storage_path(CONFIG_FILE_REL_PATH_VS_SRORAGE)
+
+
+def profile_config_path(profile: str) -> str:
+    """Config file of a named profile: 'my_config' (or 'my_config.json') is configs/my_config.json; paths pass through."""
+    if os.sep in profile or os.path.isabs(profile):
+        return profile
+    file_name = profile if profile.endswith(".json") else f"{profile}.json"
+    return _storage_path(os.path.join(os.path.dirname(CONFIG_FILE_REL_PATH_VS_SRORAGE), file_name))
+
+
+def load_config(path: Optional[str] = None) -> Dict[str, Any]:
     ensure_storage_dir()
     return _load_json(
-        _storage_path(CONFIG_FILE_REL_PATH_VS_SRORAGE), {ALERT_CORE_CONFIG_KEY: {}, ALERT_FIELD_WATCHLIST: []}
+        path or _storage_path(CONFIG_FILE_REL_PATH_VS_SRORAGE), {ALERT_CORE_CONFIG_KEY: {}, ALERT_FIELD_WATCHLIST: []}
     )
 
 
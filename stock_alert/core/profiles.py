@@ -0,0 +1,172 @@
+import os
+from contextlib import nullcontext
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+from stock_alert.common import *
+from stock_alert.data_providers import DataProvider, ProviderExhausted
+from stock_alert.core.config_watcher import ConfigWatcher
+from stock_alert.core.file_utils import alerts_from_dict, load_config, profile_config_path
+from stock_alert.core.profiling import TickProfiler
+from stock_alert.core.symbol_meta import closed_symbols
+from stock_alert.core.runner import MonitorState, TickStats, alert_symbols, apply_config_reload, check_alerts, fetch_quotes
+
+# on_alert for profiles: (profile, alert_key, alert, quote, reason)
+ProfileAlertHandler = Callable[["MonitorProfile", str, Alert, Quote, str], None]
+
+
+@dataclass
+class MonitorProfile:
+    """One config profile served by a shared monitor: its own alerts, cache/history and notification settings."""
+    name: str
+    config_path: str
+    alerts: Dict[str, Alert]
+    watchlist: List[str]
+    cache_config: CacheConfig
+    notify: bool = True
+    state: MonitorState = field(default_factory=MonitorState)
+    config_watcher: Optional[ConfigWatcher] = None
+
+    def symbols(self) -> Set[str]:
+        return alert_symbols(self.alerts) | set(self.watchlist)
+
+
+def load_profiles(names: List[str], reload: bool = True) -> List[MonitorProfile]:
+    """Loads each named profile's config.
+
+    Profiles pointing at the same cache file as an earlier profile get a per-profile file name (e.g.
+    my_cache.test_config.json), so trigger history and cooldowns never leak between profiles.
+    """
+    profiles: List[MonitorProfile] = []
+    for name in names:
+        path = profile_config_path(name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Profile '{name}' not found: {path}")
+        config = load_config(path)
+        alerts_payload = config.get(ALERT_CORE_CONFIG_KEY, {})
+        watchlist = sorted(set(str(s).upper() for s in config.get(ALERT_FIELD_WATCHLIST, [])))
+        profile_name = Path(path).stem
+        if any(p.name == profile_name for p in profiles):
+            raise ValueError(f"Profile '{profile_name}' is listed twice")
+        profiles.append(MonitorProfile(
+            name=profile_name,
+            config_path=path,
+            alerts=alerts_from_dict(alerts_payload),
+            watchlist=watchlist,
+            cache_config=CacheConfig.from_dict(config.get(CACHE_CORE_CONFIG_KEY, {})),
+            notify=bool(config.get(NOTIFY_CORE_CONFIG_KEY, True)),
+            config_watcher=ConfigWatcher(path, alerts_payload, watchlist) if reload else None,
+        ))
+
+    cache_users: Dict[Path, List[MonitorProfile]] = {}
+    for profile in profiles:
+        cache_file = Path(profile.cache_config.directory) / profile.cache_config.file_name
+        cache_users.setdefault(cache_file, []).append(profile)
+    for cache_file, users in cache_users.items():
+        if len(users) < 2:
+            continue
+        for profile in users[1:]:  # The first profile keeps the file, and with it its existing history
+            file_name = f"{cache_file.stem}.{profile.name}{cache_file.suffix}"
+            profile.cache_config = replace(profile.cache_config, file_name=file_name)
+            LOG(f"Profile '{profile.name}' shares cache {cache_file} with '{users[0].name}', using {file_name}",
+                log_level=LogLevel.WARNING)
+    for profile in profiles:
+        Path(profile.cache_config.directory).mkdir(parents=True, exist_ok=True)
+    return profiles
+
+
+def run_profiles_check(
+    provider: DataProvider,
+    profiles: List[MonitorProfile],
+    fetch_state: MonitorState,
+    on_alert: Optional[ProfileAlertHandler] = None,
+    on_tick: Optional[Callable] = None,
+    skip_cooling_symbols: bool = False,
+    clock: Clock = SYSTEM_CLOCK,
+    symbol_info: Optional[Dict[str, SymbolInfo]] = None,
+) -> Dict[str, TickStats]:
+    """Fetches the union of all profiles' symbols once, then checks each profile's alerts against the shared quotes.
+
+    Circuit breakers live in `fetch_state` (one per symbol, whichever profiles use it); change detection, settled
+    alerts and cooldowns live in each profile's own state. With `skip_cooling_symbols`, a symbol is not fetched
+    when its alerts are cooling down in every profile that reads it; with `symbol_info`, when its market is closed.
+    """
+    now_ts = clock.time()
+    fetch_stats = TickStats()
+    symbols = set().union(*(p.symbols() for p in profiles))
+    if skip_cooling_symbols:
+        busy: Set[str] = set()
+        for profile in profiles:
+            busy |= profile.symbols() - profile.state.idle_symbols(profile.alerts, now_ts)
+        fetch_stats.symbols_idle = len(symbols - busy)
+        symbols = busy
+    if symbol_info:
+        closed = closed_symbols(symbols, symbol_info, now_ts)
+        fetch_stats.symbols_closed = len(closed)
+        symbols = symbols - closed
+    quotes = fetch_quotes(provider, symbols, now_ts, fetch_state, fetch_stats)
+    if on_tick:
+        on_tick(quotes)
+
+    all_stats: Dict[str, TickStats] = {}
+    for profile in profiles:
+        symbols = profile.symbols()
+        stats = TickStats(symbols_total=len(symbols))
+        profile_quotes = {sym: q for sym, q in quotes.items() if sym in symbols}
+        stats.fetched = len(profile_quotes)
+        stats.failed = len(symbols) - stats.fetched  # Includes breaker skips; the shared fetch line has the detail
+        handler = (lambda key, alert, q, reason, p=profile: on_alert(p, key, alert, q, reason)) if on_alert else None
+        check_alerts(profile_quotes, profile.alerts, profile.cache_config, now_ts, profile.state, stats, handler)
+        all_stats[profile.name] = stats
+        LOG(f"Tick summary [{profile.name}]: {stats.summary()}", log_level=LogLevel.INFO)
+
+    fetch_state.ticks += 1
+    fetch_state.last_tick_ts = now_ts
+    breaker_summary = fetch_state.breakers.summary(now_ts)
+    LOG(f"Shared fetch: {fetch_stats.fetched}/{fetch_stats.symbols_total} symbol(s) for {len(profiles)} profile(s), "
+        f"failed {fetch_stats.failed}, skipped (breaker) {fetch_stats.skipped_by_breaker}, "
+        f"idle (all cooling) {fetch_stats.symbols_idle}, closed (market) {fetch_stats.symbols_closed}"
+        + (f" | breakers: {breaker_summary}" if breaker_summary else ""), log_level=LogLevel.INFO)
+    return all_stats
+
+
+def run_profiles_loop(
+    provider: DataProvider,
+    profiles: List[MonitorProfile],
+    interval_str: str,
+    iterations: Optional[int],
+    on_alert: Optional[ProfileAlertHandler] = None,
+    on_tick: Optional[Callable] = None,
+    skip_cooling_symbols: bool = False,
+    clock: Clock = SYSTEM_CLOCK,
+    profiler: Optional[TickProfiler] = None,
+    symbol_info: Optional[Dict[str, SymbolInfo]] = None,
+) -> None:
+    """run_loop for several profiles sharing one provider and one fetch per tick."""
+    interval_sec = seconds_from_interval(interval_str)
+    fetch_state = MonitorState()
+    symbols = set().union(*(p.symbols() for p in profiles))
+
+    i = 0
+    while iterations is None or i < iterations:
+        with profiler.tick() if profiler else nullcontext():
+            for profile in profiles:
+                if profile.config_watcher:
+                    apply_config_reload(profile.config_watcher, profile.alerts, profile.state,
+                                        label=f"Profile '{profile.name}'")
+                    profile.watchlist = list(profile.config_watcher.watchlist)
+            new_symbols = set().union(*(p.symbols() for p in profiles))
+            fetch_state.breakers.forget(sorted(symbols - new_symbols))
+            symbols = new_symbols
+            try:
+                run_profiles_check(provider, profiles, fetch_state, on_alert=on_alert, on_tick=on_tick,
+                                   skip_cooling_symbols=skip_cooling_symbols, clock=clock, symbol_info=symbol_info)
+            except ProviderExhausted as e:
+                LOG(f"{e}. Stopping.", log_level=LogLevel.INFO)
+                break
+        i += 1
+        if iterations is not None and i >= iterations:
+            break
+
+        LOG(f"Next check for {len(symbols)} symbol(s) across {len(profiles)} profile(s) in {interval_sec} secs...")
+        clock.sleep(max(1, interval_sec))
@@ -0,0 +1,132 @@
+import cProfile
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from stock_alert.common import *
+
+# Attribution categories: name -> (file name, function name) pairs whose cumulative time is reported.
+# Categories can nest (save_to_cache reads the cache with load_cache), so the shares do not add up to 100%.
+PROFILE_CATEGORIES: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "fetch": (("runner.py", "fetch_quotes"),),
+    "should_trigger": (("models.py", "should_trigger"),),
+    "load_cache": (("cache_utils.py", "load_cache"),),
+    "save_to_cache": (("cache_utils.py", "save_to_cache"),),
+    "LOG": (("utils.py", "LOG"),),
+    "notification": (("utils.py", "show_noti"),),
+    "config": (("file_utils.py", "load_config"), ("file_utils.py", "save_config")),
+}
+
+
+class _StackSampler:
+    """Samples one thread's Python stack at a fixed interval into collapsed-stack counts ("a;b;c" -> samples)."""
+
+    def __init__(self, thread_id: int, interval_secs: float, counts: Counter):
+        self.thread_id = thread_id
+        self.interval_secs = interval_secs
+        self.counts = counts
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_secs):
+            frame = sys._current_frames().get(self.thread_id)
+            names: List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+                frame = frame.f_back
+            if names:
+                self.counts[";".join(reversed(names))] += 1
+
+
+class TickProfiler:
+    """Profiles one tick out of every `every_ticks` with cProfile and a stack sampler.
+
+    Statistics are accumulated across profiled ticks and written as `<label>-<start time>.pstats` (for
+    `python -m pstats` or snakeviz) and `.collapsed` (for flamegraph.pl / speedscope) into `directory`, every
+    PROFILE_WRITE_EVERY_TICKS profiled ticks and on close(). Unprofiled ticks only pay for a counter increment.
+    """
+
+    def __init__(self, directory: str, label: str, every_ticks: int = PROFILE_DEFAULT_EVERY_TICKS,
+                 sample_interval_secs: float = PROFILE_SAMPLE_INTERVAL_SECS):
+        self.directory = Path(directory)
+        self.label = label
+        self.every_ticks = max(1, every_ticks)
+        self.sample_interval_secs = sample_interval_secs
+        self.ticks = 0
+        self.profiled_ticks = 0
+        self.profiled_secs = 0.0
+        self.collapsed: Counter = Counter()
+        self._stats: Optional[pstats.Stats] = None
+        stem = f"{label}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        self.pstats_path = self.directory / f"{stem}.pstats"
+        self.collapsed_path = self.directory / f"{stem}.collapsed"
+
+    @contextmanager
+    def tick(self) -> Iterator[None]:
+        self.ticks += 1
+        if (self.ticks - 1) % self.every_ticks:
+            yield
+            return
+        profile = cProfile.Profile()
+        sampler = _StackSampler(threading.get_ident(), self.sample_interval_secs, self.collapsed)
+        sampler.start()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.profiled_secs += time.perf_counter() - started
+            sampler.stop()
+            self.profiled_ticks += 1
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+            if self.profiled_ticks % PROFILE_WRITE_EVERY_TICKS == 0:
+                self.write()
+
+    def attribution(self) -> Dict[str, float]:
+        """Cumulative seconds per PROFILE_CATEGORIES entry over all profiled ticks."""
+        totals = {name: 0.0 for name in PROFILE_CATEGORIES}
+        if self._stats is None:
+            return totals
+        for (file_name, _, func_name), (_, _, _, cumulative, _) in self._stats.stats.items():
+            for name, functions in PROFILE_CATEGORIES.items():
+                if any(func_name == f and file_name.endswith(p) for p, f in functions):
+                    totals[name] += cumulative
+        return totals
+
+    def summary(self) -> str:
+        per_tick_ms = self.profiled_secs / self.profiled_ticks * 1000 if self.profiled_ticks else 0.0
+        shares = ", ".join(f"{name} {secs / self.profiled_secs:.0%}" for name, secs in self.attribution().items()
+                           if self.profiled_secs > 0 and secs > 0)
+        return (f"{self.profiled_ticks} of {self.ticks} tick(s) profiled, {per_tick_ms:.1f} ms/tick"
+                + (f" | {shares}" if shares else ""))
+
+    def write(self) -> None:
+        if self._stats is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._stats.dump_stats(str(self.pstats_path))
+        lines = [f"{stack} {count}\n" for stack, count in sorted(self.collapsed.items())]
+        self.collapsed_path.write_text("".join(lines), encoding="utf-8")
+        LOG(f"Profile: {self.summary()} -> {self.pstats_path}, {self.collapsed_path.name}", log_level=LogLevel.INFO)
+
+    def close(self) -> None:
+        if self.profiled_ticks % PROFILE_WRITE_EVERY_TICKS:
+            self.write()
@@ -0,0 +1,188 @@
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from stock_alert.common import *
+
+# Shared quote board: a fixed-size file mapped by the monitor (single writer) and any number of local readers.
+#   header : magic (8s) | version (H) | slot size (H) | capacity (I) | used slots (I) | reserved (I) | last tick ts (d)
+#   slots  : capacity * SLOT, one per symbol, assigned in first-seen order and never moved
+#   SLOT   : seq (Q) | ts (d) | price (d) | pct_day (d) | volume (q) | symbol (24s, utf-8, NUL padded) -> 64 bytes
+# Each slot is guarded by a seqlock: the writer makes seq odd, writes the record, then makes it even again.
+# A reader retries while seq is odd or changed during its read, so it never returns a torn record.
+# The symbol of a slot is written before the used-slot counter is bumped, so readers can index slots lazily.
+BOARD_MAGIC = b"SAQBRD\x00\x00"
+BOARD_VERSION = 1
+_HEADER = struct.Struct("<8sHHIIId")
+_SLOT = struct.Struct("<Qdddq24s")
+_SEQ = struct.Struct("<Q")
+_RECORD = struct.Struct("<dddq")  # The slot body after seq
+_USED_OFFSET = 16
+_LAST_TS_OFFSET = 24
+BOARD_SYMBOL_MAX_BYTES = 24
+
+
+def quote_board_path() -> str:
+    return str(Path(DEFAULT_STORAGE_DIR_PATH) / QUOTE_BOARD_REL_PATH_VS_STORAGE)
+
+
+class QuoteBoardWriter:
+    """Publishes the latest quote per symbol into the board file. Not thread-safe: one writer per board."""
+
+    def __init__(self, path: Optional[str] = None, capacity: int = QUOTE_BOARD_DEFAULT_CAPACITY):
+        self.path = Path(path or quote_board_path())
+        self.capacity = capacity
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Build the new board next to the old one and swap it in, so readers of a previous run keep a valid
+        # mapping (and can notice the new inode) instead of seeing the file truncated under them.
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        size = _HEADER.size + capacity * _SLOT.size
+        with open(tmp_path, "wb") as f:
+            f.truncate(size)
+        self._fd = os.open(tmp_path, os.O_RDWR)
+        self._mm = mmap.mmap(self._fd, size)
+        _HEADER.pack_into(self._mm, 0, BOARD_MAGIC, BOARD_VERSION, _SLOT.size, capacity, 0, 0, 0.0)
+        os.replace(tmp_path, self.path)
+        self._slots: Dict[str, Optional[int]] = {}  # None for symbols that cannot be published
+        self._seqs: Dict[int, int] = {}
+        self._full_warned = False
+
+    def _slot_for(self, symbol: str) -> Optional[int]:
+        if symbol in self._slots:
+            return self._slots[symbol]
+        name = symbol.encode("utf-8")
+        if len(name) > BOARD_SYMBOL_MAX_BYTES:
+            LOG(f"Warning: Symbol {symbol} is too long for the quote board, skipping", log_level=LogLevel.WARNING)
+            self._slots[symbol] = None
+            return None
+        slot = len(self._seqs)
+        if slot >= self.capacity:
+            if not self._full_warned:
+                LOG(f"Warning: Quote board is full ({self.capacity} slots), new symbols are not published",
+                    log_level=LogLevel.WARNING)
+                self._full_warned = True
+            return None
+        _SLOT.pack_into(self._mm, _HEADER.size + slot * _SLOT.size, 0, 0.0, 0.0, 0.0, 0, name)
+        self._slots[symbol] = slot
+        self._seqs[slot] = 0
+        struct.pack_into("<I", self._mm, _USED_OFFSET, slot + 1)
+        return slot
+
+    def publish(self, ts: float, quotes: Iterable[Quote]) -> None:
+        mm = self._mm
+        for q in quotes:
+            slot = self._slot_for(q.symbol)
+            if slot is None:
+                continue
+            offset = _HEADER.size + slot * _SLOT.size
+            seq = self._seqs[slot]
+            _SEQ.pack_into(mm, offset, seq + 1)
+            _RECORD.pack_into(mm, offset + _SEQ.size, ts, q.price, q.pct_day, int(q.volume))
+            _SEQ.pack_into(mm, offset, seq + 2)
+            self._seqs[slot] = seq + 2
+        struct.pack_into("<d", mm, _LAST_TS_OFFSET, ts)
+
+    def close(self) -> None:
+        """Unmaps the board. The file stays behind so readers can still see the last published quotes."""
+        if not self._mm.closed:
+            self._mm.close()
+            os.close(self._fd)
+
+
+class QuoteBoardReader:
+    """Reads quotes straight from the mapped board, without any round trip to the monitor."""
+
+    def __init__(self, path: Optional[str] = None, timeout_secs: float = 1.0):
+        self.path = Path(path or quote_board_path())
+        self.timeout_secs = timeout_secs
+        self._mm: Optional[mmap.mmap] = None
+        self._inode: Optional[int] = None
+        self._open()
+
+    def _open(self) -> None:
+        with open(self.path, "rb") as f:
+            st = os.fstat(f.fileno())
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, slot_size, capacity, _, _, _ = _HEADER.unpack_from(mm, 0)
+        if magic != BOARD_MAGIC:
+            mm.close()
+            raise ValueError(f"Not a quote board file: {self.path}")
+        if version > BOARD_VERSION or slot_size != _SLOT.size:
+            mm.close()
+            raise ValueError(f"Unsupported quote board version {version} in {self.path}")
+        if self._mm is not None:
+            self._mm.close()
+        self._mm = mm
+        self._inode = st.st_ino
+        self.capacity = capacity
+        self._slots: Dict[str, int] = {}
+        self._indexed = 0
+
+    def reopen_if_replaced(self) -> bool:
+        """Remaps the board if a new monitor run replaced the file. Returns True if it did."""
+        try:
+            if os.stat(self.path).st_ino == self._inode:
+                return False
+        except OSError:
+            return False
+        self._open()
+        return True
+
+    def _refresh_index(self) -> None:
+        used = struct.unpack_from("<I", self._mm, _USED_OFFSET)[0]
+        for slot in range(self._indexed, min(used, self.capacity)):
+            name = _SLOT.unpack_from(self._mm, _HEADER.size + slot * _SLOT.size)[5]
+            self._slots[name.rstrip(b"\x00").decode("utf-8")] = slot
+        self._indexed = max(self._indexed, used)
+
+    @property
+    def last_tick_ts(self) -> float:
+        return struct.unpack_from("<d", self._mm, _LAST_TS_OFFSET)[0]
+
+    def symbols(self) -> List[str]:
+        self._refresh_index()
+        return list(self._slots)
+
+    def _read_slot(self, symbol: str, slot: int) -> Optional[Tuple[float, Quote]]:
+        mm = self._mm
+        offset = _HEADER.size + slot * _SLOT.size
+        deadline = None
+        while True:
+            seq, ts, price, pct, vol, _ = _SLOT.unpack_from(mm, offset)
+            # Odd: the writer is mid-update; changed: it updated while we were reading
+            if not seq & 1 and _SEQ.unpack_from(mm, offset)[0] == seq:
+                if seq == 0:
+                    return None  # Slot assigned but never published
+                return ts, Quote(symbol=symbol, price=price, pct_day=pct, volume=vol)
+            if deadline is None:
+                deadline = time.monotonic() + self.timeout_secs
+            elif time.monotonic() > deadline:
+                break
+            time.sleep(0)  # Let a preempted writer finish the slot
+        raise RuntimeError(f"Could not read a consistent quote for {symbol} from the board")
+
+    def get(self, symbol: str) -> Optional[Tuple[float, Quote]]:
+        """Latest (ts, Quote) for a symbol, or None if the monitor has not published it."""
+        slot = self._slots.get(symbol)
+        if slot is None:
+            self._refresh_index()
+            slot = self._slots.get(symbol)
+            if slot is None:
+                return None
+        return self._read_slot(symbol, slot)
+
+    def snapshot(self) -> Dict[str, Tuple[float, Quote]]:
+        """Latest (ts, Quote) of every published symbol."""
+        self._refresh_index()
+        out: Dict[str, Tuple[float, Quote]] = {}
+        for sym, slot in self._slots.items():
+            entry = self._read_slot(sym, slot)
+            if entry is not None:
+                out[sym] = entry
+        return out
+
+    def close(self) -> None:
+        if self._mm is not None and not self._mm.closed:
+            self._mm.close()
@@ -0,0 +1,187 @@
+import struct
+import time
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+from stock_alert.common import *
+
+# File layout (little-endian):
+#   header : magic (8s) | version (H) | reserved (H)
+#   blocks : 1-byte type followed by the block body
+#     'S' symbol definition : symbol id (I) | name length (H) | name (utf-8)
+#     'T' tick              : timestamp (d) | record count (I) | count * QUOTE_RECORD
+# Symbol ids are assigned per file, so every file can be read on its own.
+QLOG_MAGIC = b"SAQLOG\x00\x00"
+QLOG_VERSION = 1
+_HEADER = struct.Struct("<8sHH")
+_BLOCK_SYMBOL = b"S"
+_BLOCK_TICK = b"T"
+_SYMBOL_HEADER = struct.Struct("<IH")
+_TICK_HEADER = struct.Struct("<dI")
+QUOTE_RECORD = struct.Struct("<Iddq")  # symbol id, price, pct_day, volume -> 28 bytes, fixed width
+
+RawRecord = Tuple[int, float, float, int]
+
+
+class QuoteLogWriter:
+    """Appends ticks to a binary quote log (see layout above)."""
+
+    def __init__(self, path: str, buffer_size: int = 1 << 20):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f: BinaryIO = open(self.path, "wb", buffering=buffer_size)
+        self._f.write(_HEADER.pack(QLOG_MAGIC, QLOG_VERSION, 0))
+        self._symbol_ids: Dict[str, int] = {}
+        self.bytes_written = _HEADER.size
+
+    def write_tick(self, ts: float, quotes: Iterable[Quote]) -> int:
+        """Writes one tick as a single buffered write. Returns the number of bytes written."""
+        parts: List[bytes] = []
+        records: List[bytes] = []
+        for q in quotes:
+            sym_id = self._symbol_ids.get(q.symbol)
+            if sym_id is None:
+                sym_id = self._symbol_ids[q.symbol] = len(self._symbol_ids)
+                name = q.symbol.encode("utf-8")
+                parts.append(_BLOCK_SYMBOL + _SYMBOL_HEADER.pack(sym_id, len(name)) + name)
+            records.append(QUOTE_RECORD.pack(sym_id, q.price, q.pct_day, int(q.volume)))
+        parts.append(_BLOCK_TICK + _TICK_HEADER.pack(ts, len(records)))
+        parts.extend(records)
+        data = b"".join(parts)
+        self._f.write(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        self._f.flush()
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self) -> "QuoteLogWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_quote_log_raw(path: str) -> Iterator[Tuple[float, List[RawRecord], Dict[int, str]]]:
+    """Streams (ts, raw records, symbol id -> name) per tick without building Quote objects.
+
+    The symbol dict is shared and grows while reading; a truncated trailing tick (e.g. after a crash) is ignored.
+    """
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return
+        magic, version, _ = _HEADER.unpack(header)
+        if magic != QLOG_MAGIC:
+            raise ValueError(f"Not a quote log file: {path}")
+        if version > QLOG_VERSION:
+            raise ValueError(f"Unsupported quote log version {version} in {path}")
+
+        symbols: Dict[int, str] = {}
+        while True:
+            block_type = f.read(1)
+            if not block_type:
+                return
+            if block_type == _BLOCK_SYMBOL:
+                head = f.read(_SYMBOL_HEADER.size)
+                if len(head) < _SYMBOL_HEADER.size:
+                    return
+                sym_id, name_len = _SYMBOL_HEADER.unpack(head)
+                name = f.read(name_len)
+                if len(name) < name_len:
+                    return
+                symbols[sym_id] = name.decode("utf-8")
+            elif block_type == _BLOCK_TICK:
+                head = f.read(_TICK_HEADER.size)
+                if len(head) < _TICK_HEADER.size:
+                    return
+                ts, count = _TICK_HEADER.unpack(head)
+                body = f.read(count * QUOTE_RECORD.size)
+                if len(body) < count * QUOTE_RECORD.size:
+                    return
+                yield ts, list(QUOTE_RECORD.iter_unpack(body)), symbols
+            else:
+                raise ValueError(f"Corrupt quote log {path}: unknown block type {block_type!r}")
+
+
+def iter_quote_log(path: str) -> Iterator[Tuple[float, Dict[str, Quote]]]:
+    """Streams (ts, {symbol: Quote}) per tick."""
+    for ts, records, symbols in iter_quote_log_raw(path):
+        yield ts, {symbols[sid]: Quote(symbol=symbols[sid], price=price, pct_day=pct, volume=vol)
+                   for sid, price, pct, vol in records}
+
+
+def is_quote_log(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(QLOG_MAGIC)) == QLOG_MAGIC
+    except OSError:
+        return False
+
+
+class QuoteRecorder:
+    """Records every tick into size-rotated quote logs: <dir>/<prefix>-<YYYYmmdd-HHMMSS>-<seq>.qlog.
+
+    A tick costs one struct.pack per quote and one buffered write; the file is flushed once per tick so a
+    crash loses at most the tick being written (readers skip a truncated trailing tick).
+    """
+
+    def __init__(self, directory: str, max_file_bytes: int = QUOTE_LOG_DEFAULT_MAX_FILE_BYTES,
+                 max_files: Optional[int] = None, prefix: str = QUOTE_LOG_FILE_PREFIX):
+        self.directory = Path(directory)
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self.prefix = prefix
+        self._seq = 0
+        self._writer: Optional[QuoteLogWriter] = None
+
+    def _open_next(self, ts: float) -> QuoteLogWriter:
+        self._seq += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(ts))
+        writer = QuoteLogWriter(str(self.directory / f"{self.prefix}-{stamp}-{self._seq:04d}{QUOTE_LOG_FILE_EXT}"))
+        if self.max_files:
+            for old in list_quote_logs(str(self.directory), self.prefix)[:-self.max_files]:
+                old.unlink(missing_ok=True)
+        return writer
+
+    def record(self, ts: float, quotes: Iterable[Quote]) -> None:
+        if self._writer is None or self._writer.bytes_written >= self.max_file_bytes:
+            if self._writer is not None:
+                self._writer.close()
+            self._writer = self._open_next(ts)
+        self._writer.write_tick(ts, quotes)
+        self._writer.flush()
+
+    @property
+    def current_path(self) -> Optional[Path]:
+        return self._writer.path if self._writer else None
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def list_quote_logs(directory: str, prefix: str = "") -> List[Path]:
+    """Quote logs in a directory, oldest first (names sort chronologically)."""
+    return sorted(Path(directory).glob(f"{prefix}*{QUOTE_LOG_FILE_EXT}"))
+
+
+def expand_quote_log_paths(paths: Iterable[str]) -> List[str]:
+    """Expands directories into their quote logs, keeping the given order otherwise."""
+    out: List[str] = []
+    for p in paths:
+        if Path(p).is_dir():
+            out.extend(str(f) for f in list_quote_logs(p))
+        else:
+            out.append(p)
+    return out
+
+
+def iter_quote_logs(paths: Iterable[str]) -> Iterator[Tuple[float, Dict[str, Quote]]]:
+    """Streams ticks across several (e.g. rotated) quote logs or directories, in order."""
+    for path in expand_quote_log_paths(paths):
+        yield from iter_quote_log(path)
@@ -1,11 +1,191 @@
 import json
-import time
-from typing import Callable, Dict, Iterable, Optional
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
 import pdb
 from stock_alert.common import *
-from stock_alert.data_providers import DataProvider
+from stock_alert.data_providers import DataProvider, ProviderExhausted
 from stock_alert.core.cache_utils import *
+from stock_alert.core.config_watcher import ConfigWatcher, apply_config_diff
+from stock_alert.core.circuit_breaker import BreakerRegistry
+from stock_alert.core.cooldowns import CooldownSchedule
+from stock_alert.core.profiling import TickProfiler
+from stock_alert.core.symbol_meta import closed_symbols
+from stock_alert.core.thresholds import ThresholdIndex, build_threshold_indexes
+
+
+@dataclass
+class TickStats:
+    """Counters for one run_check call, logged as the tick summary."""
+    symbols_total: int = 0
+    fetched: int = 0
+    failed: int = 0
+    skipped_by_breaker: int = 0
+    quotes_unchanged: int = 0
+    alerts_checked: int = 0
+    alerts_skipped: int = 0  # Not re-evaluated because none of their symbols' quotes changed
+    alerts_suppressed: int = 0  # Not evaluated because a symbol (leg) they read has no quote this tick
+    alerts_cooling: int = 0  # Not evaluated because they are in a cooldown and cannot trigger
+    symbols_idle: int = 0  # Not fetched because all of their alerts are cooling down (skip_cooling_symbols)
+    symbols_closed: int = 0  # Not fetched because their market is closed (symbol_info)
+    alerts_triggered: int = 0
+
+    def skip_ratio(self) -> float:
+        total = self.alerts_checked + self.alerts_skipped + self.alerts_cooling
+        return (self.alerts_skipped + self.alerts_cooling) / total if total else 0.0
+
+    def summary(self) -> str:
+        idle = f", idle (all cooling) {self.symbols_idle}" if self.symbols_idle else ""
+        idle += f", closed (market) {self.symbols_closed}" if self.symbols_closed else ""
+        return (f"quotes {self.fetched}/{self.symbols_total} ({self.quotes_unchanged} unchanged), failed {self.failed}, "
+                f"skipped (breaker) {self.skipped_by_breaker}{idle} | alerts checked {self.alerts_checked}, "
+                f"skipped (unchanged) {self.alerts_skipped}, cooling {self.alerts_cooling} "
+                f"({self.skip_ratio():.0%} not evaluated), suppressed (no quote) {self.alerts_suppressed}, "
+                f"triggered {self.alerts_triggered}")
+
+
+@dataclass
+class AlertDependencies:
+    """Symbol -> names of the alerts reading it (multi-leg alerts are listed under every leg).
+
+    Static price/volume levels are also kept in per-symbol threshold indexes; when a symbol's quote changes,
+    only the levels met (or just no longer met) are evaluated, the other alerts are found in `scanned`.
+    """
+    dependents: Dict[str, List[str]] = field(default_factory=dict)
+    position: Dict[str, int] = field(default_factory=dict)  # Alert name -> index in the alert dict (eval order)
+    scanned: Dict[str, List[str]] = field(default_factory=dict)  # Like dependents, without indexed alerts
+    thresholds: Dict[str, List[ThresholdIndex]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, alerts: Dict[str, Alert]) -> "AlertDependencies":
+        deps = cls(thresholds=build_threshold_indexes(alerts))
+        indexed = {k for indexes in deps.thresholds.values() for index in indexes for k in index.ge_keys + index.le_keys}
+        for idx, (alert_key, alert) in enumerate(alerts.items()):
+            deps.position[alert_key] = idx
+            for sym in alert.legs:
+                deps.dependents.setdefault(sym, []).append(alert_key)
+                if alert_key not in indexed:
+                    deps.scanned.setdefault(sym, []).append(alert_key)
+        return deps
+
+    def changed_dependents(self, changed: Dict[str, Optional[Tuple[float, float, int]]],
+                           fingerprints: Dict[str, Tuple[float, float, int]]) -> Set[str]:
+        """Alerts whose outcome may differ now that the quotes in `changed` (symbol -> previous fingerprint) moved."""
+        empty: List[str] = []
+        out = set().union(*(self.scanned.get(sym, empty) for sym in changed))
+        for sym, previous in changed.items():
+            for index in self.thresholds.get(sym, empty):
+                pos = index.position
+                out.update(index.affected(previous[pos] if previous else None, fingerprints[sym][pos]))
+        return out
+
+    def dependents_of(self, symbols: Iterable[str]) -> Set[str]:
+        empty: List[str] = []
+        return set().union(*(self.dependents.get(sym, empty) for sym in symbols))
+
+
+@dataclass
+class MonitorState:
+    """State kept across ticks by run_loop."""
+    breakers: BreakerRegistry = field(default_factory=BreakerRegistry)
+    ticks: int = 0
+    last_tick_ts: Optional[float] = None
+    last_trigger_ts: Dict[str, Any] = field(default_factory=dict)  # Live view of the cache, for daemon queries
+    # Change detection: last (price, pct_day, volume) per symbol, and alerts whose last evaluation cannot change
+    # until their symbol's quote does (condition not met, outside any cooldown), keyed by alert name
+    quote_fingerprints: Dict[str, Tuple[float, float, int]] = field(default_factory=dict)
+    settled_alerts: Dict[str, Alert] = field(default_factory=dict)
+    dependencies: Optional[AlertDependencies] = None  # Built lazily from the alert dict, see alerts_changed
+    cooldowns: CooldownSchedule = field(default_factory=CooldownSchedule)
+
+    def alerts_changed(self, names: Iterable[str]) -> None:
+        """Must be called after alerts are added, replaced or removed in the dict passed to run_check."""
+        for name in names:
+            self.settled_alerts.pop(name, None)
+            self.cooldowns.cancel(name)
+        self.dependencies = None
+
+    def alert_dependencies(self, alerts: Dict[str, Alert]) -> AlertDependencies:
+        deps = self.dependencies
+        if deps is None or len(deps.position) != len(alerts):
+            deps = self.dependencies = AlertDependencies.build(alerts)
+            # Settled entries are only trusted for the exact alert instance they were recorded for
+            for name in [name for name, alert in self.settled_alerts.items() if alerts.get(name) is not alert]:
+                del self.settled_alerts[name]
+            self.cooldowns.retain(alerts)
+        return deps
+
+    def idle_symbols(self, alerts: Dict[str, Alert], now_ts: float) -> Set[str]:
+        """Symbols that need no quote this tick because every alert reading them is cooling down."""
+        self.cooldowns.pop_expired(now_ts)
+        return self.cooldowns.idle_symbols(self.alert_dependencies(alerts).dependents)
+
+
+def fetch_quotes(
+    provider: DataProvider,
+    symbols: Iterable[str],
+    now_ts: float,
+    state: MonitorState,
+    stats: TickStats,
+) -> Dict[str, Quote]:
+    """Fetches quotes, skipping symbols (or the whole provider) whose circuit breaker is open."""
+    symbols = sorted(symbols)
+    provider.begin_tick(now_ts, symbols)
+    stats.symbols_total = len(symbols)
+    breakers = state.breakers
+    provider_breaker = breakers.provider_breaker
+    if not provider_breaker.allow(now_ts):
+        stats.skipped_by_breaker = len(symbols)
+        return {}
+
+    quotes: Dict[str, Quote] = {}
+    failed_symbols: Dict[str, str] = {}
+    for idx, sym in enumerate(symbols):
+        if not breakers.for_symbol(sym).allow(now_ts):
+            stats.skipped_by_breaker += 1
+            continue
+        try:
+            q = provider.get_quote(sym)
+            if q is None or q.price <= 0:
+                raise ValueError(f"Empty quote for symbol: {sym}")
+        except OSError as e:
+            # Transport errors (connection, timeout, HTTP status) are the provider's fault, not the symbol's
+            LOG(f"Warning: Could not fetch quote for {sym}: {e}", log_level=LogLevel.WARNING)
+            stats.failed += 1
+            if provider_breaker.record_failure(now_ts, str(e)):
+                skipped = len(symbols) - idx - 1
+                stats.skipped_by_breaker += skipped
+                LOG(f"Warning: Provider circuit opened after {provider_breaker.consecutive_failures} consecutive failures, "
+                    f"skipping {skipped} remaining symbol(s)", log_level=LogLevel.WARNING)
+                break
+            continue
+        except Exception as e:
+            LOG(f"Warning: Could not fetch quote for {sym}: {e}", log_level=LogLevel.WARNING)
+            failed_symbols[sym] = str(e)
+            continue
+        provider_breaker.record_success()
+        breakers.for_symbol(sym).record_success()
+        quotes[sym] = q
+
+    stats.fetched = len(quotes)
+    stats.failed += len(failed_symbols)
+    for sym, error in failed_symbols.items():
+        breaker = breakers.for_symbol(sym)
+        if breaker.record_failure(now_ts, error):
+            LOG(f"Warning: Circuit opened for {sym} for {breaker.open_until - now_ts:.0f}s: {error}",
+                log_level=LogLevel.WARNING)
+    # A tick in which every symbol failed counts once against the provider, however many symbols failed
+    if failed_symbols and not quotes and provider_breaker.state != BreakerState.OPEN:
+        if provider_breaker.record_failure(now_ts, next(iter(failed_symbols.values()))):
+            LOG(f"Warning: Provider circuit opened for {provider_breaker.open_until - now_ts:.0f}s: no quote fetched in "
+                f"{provider_breaker.consecutive_failures} consecutive attempt(s)", log_level=LogLevel.WARNING)
+    return quotes
+
+
+def alert_symbols(alerts: Dict[str, Alert]) -> Set[str]:
+    """Every symbol the alerts read, including all legs of multi-leg alerts."""
+    return {sym for alert in alerts.values() for sym in alert.legs}
 
 
 def run_check(
@@ -15,36 +195,104 @@ def run_check(
     cache_config: CacheConfig,
     on_alert: Optional[Callable] = None,
     on_tick: Optional[Callable] = None,
-) -> None:
-    """Fetches quotes for all symbols and checks all alerts once."""
-    now_ts = time.time()
-    # Create a human-readable timestamp
-    readable_timestamp = datetime.fromtimestamp(now_ts).strftime("%Y-%m-%d %H:%M:%S")
-
-    cache_file = get_latest_cache_file(cache_config)
-    if cache_file.exists():
-        with open(cache_file, "r") as f:
-            cache_data = json.load(f)
-    else:
-        cache_data = {}
+    state: Optional[MonitorState] = None,
+    skip_cooling_symbols: bool = False,
+    clock: Clock = SYSTEM_CLOCK,
+    symbol_info: Optional[Dict[str, SymbolInfo]] = None,
+) -> TickStats:
+    """Fetches quotes for all symbols and checks all alerts once, at `clock.time()`.
 
-    last_trigger_ts = cache_data.get(CACHE_FIELD_LAST_ALERTS_TRIGGER_TS, {})
-    alerts_history_cache: Dict[str, List[Dict]] = cache_data.get(CACHE_FIELD_ALERTS_HISTORY, {})
+    With `skip_cooling_symbols`, symbols whose alerts are all cooling down are not fetched this tick. With
+    `symbol_info`, neither are symbols whose market is closed (symbols without metadata are always fetched).
+    """
+    state = state or MonitorState()
+    stats = TickStats()
+    now_ts = clock.time()
 
-    quotes: Dict[str, Quote] = {}
-    for sym in sorted(symbols):
-        try:
-            quotes[sym] = provider.get_quote(sym)
-        except Exception as e:
-            LOG(f"Warning: Could not fetch quote for {sym}: {e}")
+    if skip_cooling_symbols:
+        idle = state.idle_symbols(alerts, now_ts)
+        if idle:
+            symbols = list(symbols)
+            wanted = [sym for sym in symbols if sym not in idle]
+            stats.symbols_idle = len(symbols) - len(wanted)
+            symbols = wanted
+    if symbol_info:
+        closed = closed_symbols(symbols, symbol_info, now_ts)
+        if closed:
+            symbols = list(symbols)
+            wanted = [sym for sym in symbols if sym not in closed]
+            stats.symbols_closed = len(symbols) - len(wanted)
+            symbols = wanted
+    quotes = fetch_quotes(provider, symbols, now_ts, state, stats)
 
     if on_tick:
         on_tick(quotes)
 
-    for alert_key, alert in alerts.items():
-        q = quotes.get(alert.symbol)
-        if not q:
+    check_alerts(quotes, alerts, cache_config, now_ts, state, stats, on_alert)
+    breaker_summary = state.breakers.summary(now_ts)
+    LOG(f"Tick summary: {stats.summary()}" + (f" | breakers: {breaker_summary}" if breaker_summary else ""),
+        log_level=LogLevel.INFO)
+    return stats
+
+
+def check_alerts(
+    quotes: Dict[str, Quote],
+    alerts: Dict[str, Alert],
+    cache_config: CacheConfig,
+    now_ts: float,
+    state: MonitorState,
+    stats: TickStats,
+    on_alert: Optional[Callable] = None,
+) -> None:
+    """Evaluates alerts against one tick's quotes, persisting triggers to the cache; counts into `stats`."""
+    # Create a human-readable timestamp
+    readable_timestamp = datetime.fromtimestamp(now_ts).strftime("%Y-%m-%d %H:%M:%S")
+
+    # A symbol whose quote is identical to the previous tick cannot change the outcome of its settled alerts
+    fingerprints = state.quote_fingerprints
+    changed_symbols: Dict[str, Optional[Tuple[float, float, int]]] = {}  # Symbol -> previous fingerprint
+    for sym, q in quotes.items():
+        fingerprint = (q.price, q.pct_day, q.volume)
+        previous = fingerprints.get(sym)
+        if previous != fingerprint:
+            fingerprints[sym] = fingerprint
+            changed_symbols[sym] = previous
+    stats.quotes_unchanged = len(quotes) - len(changed_symbols)
+
+    # Only alerts reading a changed symbol (of its static price/volume levels, only those met or just no longer
+    # met), plus those not settled, are evaluated. Alerts in a cooldown cannot
+    # trigger and are left out until it expires; an alert with any symbol (leg) missing this tick is suppressed
+    # rather than evaluated on a stale quote.
+    deps = state.alert_dependencies(alerts)
+    settled = state.settled_alerts
+    cooldowns = state.cooldowns
+    cooldowns.pop_expired(now_ts)  # Expired alerts are not settled, so they are candidates again below
+    cooling = set(cooldowns.keys())
+    suppressed = deps.dependents_of(sym for sym in deps.dependents if sym not in quotes) - cooling
+    candidates = deps.changed_dependents(changed_symbols, fingerprints)
+    candidates.update(alerts.keys() - settled.keys())
+    candidates -= suppressed
+    candidates -= cooling
+    stats.alerts_suppressed = len(suppressed)
+    stats.alerts_cooling = len(cooling)
+    to_check: List[Tuple[str, Alert, Quote]] = []
+    for alert_key in sorted(candidates, key=deps.position.__getitem__):
+        alert = alerts[alert_key]
+        q = alert.quote_from(quotes)
+        if q is None:  # Legs present but not combinable (ratio over a zero price)
+            stats.alerts_suppressed += 1
             continue
+        to_check.append((alert_key, alert, q))
+    stats.alerts_skipped = len(alerts) - len(to_check) - stats.alerts_suppressed - stats.alerts_cooling
+
+    if to_check:
+        cache_data = load_cache(cache_config)
+        last_trigger_ts = cache_data.get(CACHE_FIELD_LAST_ALERTS_TRIGGER_TS, {})
+        alerts_history_cache: Dict[str, List[Dict]] = cache_data.get(CACHE_FIELD_ALERTS_HISTORY, {})
+        state.last_trigger_ts = last_trigger_ts
+
+    for alert_key, alert, q in to_check:
+        stats.alerts_checked += 1
 
         last_ts = last_trigger_ts.get(alert_key)
         # Get last alert record for this alert name, if any (for checking last trigger and other info)
@@ -54,8 +302,22 @@ def run_check(
         should_trigger, reason_trigger = alert.should_trigger(q, now_ts, last_ts, last_record)
         LOG(f"Checking alert {alert_key} for {alert.symbol}: {q.price} | last trigger: {last_ts} | last record: {last_record}.  Result: Should trigger: {should_trigger}, Reason: {reason_trigger}")
 
+        # A miss outside any cooldown is settled until a symbol changes. An alert in a cooldown (just triggered,
+        # or blocked by an earlier trigger) is scheduled to be evaluated again when the cooldown expires, even if
+        # the quote never changes
         if should_trigger:
-            last_trigger_ts[alert_key] = readable_timestamp
+            last_ts = last_trigger_ts[alert_key] = readable_timestamp
+        expires_ts = alert.cooldown_expires_at(last_ts)
+        if expires_ts is not None and expires_ts > now_ts:
+            settled.pop(alert_key, None)
+            cooldowns.schedule(alert_key, alert, expires_ts)
+        elif should_trigger:
+            settled.pop(alert_key, None)
+        else:
+            settled[alert_key] = alert
+
+        if should_trigger:
+            stats.alerts_triggered += 1
             # append alert info to history
             alert_single_record = {
                 ALERT_RECORD_FIELD_TRIGGER_TS: readable_timestamp,
@@ -65,7 +327,11 @@ def run_check(
             # update in-memory structures
             if alert_key not in alerts_history_cache:
                 alerts_history_cache[alert_key] = []
-            alerts_history_cache[alert_key].append(alert_single_record)
+            history = alerts_history_cache[alert_key]
+            history.append(alert_single_record)
+            # Only the last record is read back; the cap keeps the cache (and its in-memory copy) bounded
+            if len(history) > cache_config.max_history_per_alert:
+                del history[:len(history) - cache_config.max_history_per_alert]
             # persist both timestamps and history, preserving other cache fields
             save_to_cache(
                 cache_config,
@@ -77,6 +343,23 @@ def run_check(
             if on_alert:
                 on_alert(alert_key, alert, q, reason_trigger)
 
+    state.ticks += 1
+    state.last_tick_ts = now_ts
+
+
+def apply_config_reload(config_watcher: ConfigWatcher, alerts: Dict[str, Alert], state: MonitorState,
+                        label: str = "Config") -> Optional[List[str]]:
+    """Applies pending config edits to `alerts` in place. Returns the new symbol list, or None if nothing changed."""
+    diff = config_watcher.poll()
+    if not diff:
+        return None
+    apply_config_diff(alerts, diff)
+    state.alerts_changed(list(diff.removed) + list(diff.added) + list(diff.changed))
+    symbols = sorted(alert_symbols(alerts) | set(config_watcher.watchlist))
+    LOG(f"{label} reloaded: {diff.summary()}. Now monitoring {len(symbols)} symbol(s): {', '.join(symbols)}",
+        log_level=LogLevel.INFO)
+    return symbols
+
 
 def run_loop(
     provider: DataProvider,
@@ -87,23 +370,50 @@ def run_loop(
     iterations: Optional[int],
     on_alert: Optional[Callable] = None,
     on_tick: Optional[Callable] = None,
+    config_watcher: Optional[ConfigWatcher] = None,
+    state: Optional[MonitorState] = None,
+    skip_cooling_symbols: bool = False,
+    clock: Clock = SYSTEM_CLOCK,
+    profiler: Optional[TickProfiler] = None,
+    symbol_info: Optional[Dict[str, SymbolInfo]] = None,
 ):
-    """The main evaluation loop."""
+    """The main evaluation loop.
+
+    If `config_watcher` is given, config edits are applied to `alerts` in place before each tick. With a
+    VirtualClock the waits between ticks take no real time. A `profiler` wraps every tick (reload included).
+    `symbol_info` skips closed markets (see run_check).
+    """
     interval_sec = seconds_from_interval(interval_str)
+    symbols = list(symbols)
+    state = state or MonitorState()
 
     i = 0
     while iterations is None or i < iterations:
-        run_check(
-            provider=provider,
-            symbols=symbols,
-            alerts=alerts,
-            cache_config=cache_config,
-            on_alert=on_alert,
-            on_tick=on_tick,
-        )
+        with profiler.tick() if profiler else nullcontext():
+            if config_watcher:
+                new_symbols = apply_config_reload(config_watcher, alerts, state)
+                if new_symbols is not None:
+                    state.breakers.forget([s for s in symbols if s not in new_symbols])
+                    symbols = new_symbols
+            try:
+                run_check(
+                    provider=provider,
+                    symbols=symbols,
+                    alerts=alerts,
+                    cache_config=cache_config,
+                    on_alert=on_alert,
+                    on_tick=on_tick,
+                    state=state,
+                    skip_cooling_symbols=skip_cooling_symbols,
+                    clock=clock,
+                    symbol_info=symbol_info,
+                )
+            except ProviderExhausted as e:
+                LOG(f"{e}. Stopping.", log_level=LogLevel.INFO)
+                break
         i += 1
         if iterations is not None and i >= iterations:
             break
 
         LOG(f"Next check for SYMBOLS {', '.join(symbols)} in {interval_sec} secs...")
-        time.sleep(max(1, interval_sec))
+        clock.sleep(max(1, interval_sec))
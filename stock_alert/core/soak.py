@@ -0,0 +1,193 @@
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from stock_alert.common import *
+from stock_alert.data_providers import FakeDataProvider
+from stock_alert.core.cache_utils import load_cache
+from stock_alert.core.runner import MonitorState, run_check
+
+
+@dataclass
+class SoakSample:
+    tick: int
+    elapsed_secs: float
+    rss_bytes: Optional[int]
+    traced_bytes: Optional[int]
+    structures: Dict[str, int]  # Approximate bytes per tracked structure (record/entry counts where named so)
+
+
+@dataclass
+class SoakReport:
+    ticks: int
+    triggers: int
+    elapsed_secs: float
+    simulated_secs: float = 0.0  # Span of the run on the virtual clock
+    samples: List[SoakSample] = field(default_factory=list)
+    top_growth: List[str] = field(default_factory=list)  # tracemalloc allocation sites that grew the most
+
+    def series(self) -> Dict[str, List[int]]:
+        out: Dict[str, List[int]] = {"rss": [s.rss_bytes or 0 for s in self.samples],
+                                     "tracemalloc": [s.traced_bytes or 0 for s in self.samples]}
+        for s in self.samples:
+            for name, value in s.structures.items():
+                out.setdefault(name, []).append(value)
+        return out
+
+    def growth_per_million_ticks(self, values: List[int]) -> float:
+        """Growth rate over the second half of the run, after caches and interpreter state have warmed up."""
+        if len(values) < 2:
+            return 0.0
+        mid = len(values) // 2
+        ticks = self.samples[-1].tick - self.samples[mid].tick
+        return (values[-1] - values[mid]) / ticks * 1_000_000 if ticks else 0.0
+
+    def is_growing(self, values: List[int]) -> bool:
+        """Still growing if the second half of the samples never shrinks and ends higher than it started."""
+        tail = values[len(values) // 2:]
+        return len(tail) > 1 and tail[-1] > tail[0] and all(b >= a for a, b in zip(tail, tail[1:]))
+
+    def summary_lines(self) -> List[str]:
+        lines = [f"Soak: {self.ticks:,} tick(s), {self.triggers:,} trigger(s) in {self.elapsed_secs:.1f}s "
+                 f"({self.ticks / max(self.elapsed_secs, 1e-9):,.0f} ticks/s, {self.simulated_secs / 3600:,.1f}h simulated)",
+                 f"{'structure':<28} {'first':>12} {'last':>12} {'max':>12} {'growth/1M ticks':>16}  verdict"]
+        for name, values in self.series().items():
+            if not any(values):
+                continue
+            lines.append(f"{name:<28} {values[0]:>12,} {values[-1]:>12,} {max(values):>12,} "
+                         f"{self.growth_per_million_ticks(values):>16,.0f}  "
+                         f"{'GROWING' if self.is_growing(values) else 'bounded'}")
+        if self.top_growth:
+            lines.append("Top allocation growth (tracemalloc, second half of the run):")
+            lines.extend(f"  {line}" for line in self.top_growth)
+        return lines
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where /proc is not available."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def deep_sizeof(obj: Any) -> int:
+    """Approximate retained size of a container graph (shared objects are counted once)."""
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif hasattr(o, "__dict__"):
+            stack.append(vars(o))
+    return total
+
+
+def build_soak_alerts(symbols: List[str], alerts_per_symbol: int) -> Dict[str, Alert]:
+    """A mix of trailing, band and composite alerts with no cooldown, so history keeps growing if uncapped."""
+    templates = [
+        "pct_offset >= 1",
+        "pct_offset <= -1",
+        "pct_day >= 2 or pct_day <= -2",
+        "offset >= 1 and volume > 1000",
+        "price >= 1e9",  # Never fires: exercises the unchanged-quote skip path only
+    ]
+    alerts: Dict[str, Alert] = {}
+    for sym in symbols:
+        for i in range(alerts_per_symbol):
+            alerts[f"{sym.lower()}-soak-{i}"] = Alert.from_condition(sym, templates[i % len(templates)],
+                                                                     alert_cooldown_secs=0)
+    return alerts
+
+
+def _sample_structures(state: MonitorState, cache_config: CacheConfig) -> Dict[str, int]:
+    cache_dir = Path(cache_config.directory)
+    history: Dict[str, Any] = load_cache(cache_config).get(CACHE_FIELD_ALERTS_HISTORY, {})
+    return {
+        "cache.history_records": sum(len(v) for v in history.values()),
+        "cache.history_bytes": deep_sizeof(history),
+        "cache.files_bytes": sum(p.stat().st_size for p in cache_dir.glob("*") if p.is_file()),
+        "state.quote_fingerprints": deep_sizeof(state.quote_fingerprints),
+        "state.settled_alerts": deep_sizeof(list(state.settled_alerts)),  # Alerts themselves are owned elsewhere
+        "state.last_trigger_ts": deep_sizeof(state.last_trigger_ts),
+        "state.breakers": deep_sizeof(state.breakers),
+        "compiled_conditions": compile_condition.cache_info().currsize,
+    }
+
+
+def run_soak(
+    cache_config: CacheConfig,
+    ticks: int = SOAK_DEFAULT_TICKS,
+    symbols: int = 20,
+    alerts_per_symbol: int = 3,
+    samples: int = SOAK_DEFAULT_SAMPLES,
+    seed: Optional[int] = None,
+    trace_allocations: bool = False,
+    on_sample: Optional[Callable[[SoakSample], None]] = None,
+    tick_secs: float = SOAK_DEFAULT_TICK_SECS,
+) -> SoakReport:
+    """Runs the real run_check loop back to back on a simulated market and samples memory along the way.
+
+    Ticks are `tick_secs` apart on a VirtualClock, so cooldowns and trigger timestamps follow simulated time.
+    Logging below WARNING is dropped for the duration of the run so the log files are not part of the load.
+    """
+    provider = FakeDataProvider(seed=seed, simulate=True)
+    symbol_names = [f"SOAK{i:04d}" for i in range(symbols)]
+    alerts = build_soak_alerts(symbol_names, alerts_per_symbol)
+    state = MonitorState()
+    clock = VirtualClock()
+    start_ts = clock.time()
+    sample_every = max(1, ticks // max(1, samples))
+    report = SoakReport(ticks=ticks, triggers=0, elapsed_secs=0.0)
+
+    if trace_allocations:
+        tracemalloc.start()
+    baseline_snapshot = None
+    set_log_min_level(LogLevel.WARNING)
+    started = time.perf_counter()
+    try:
+        for tick in range(1, ticks + 1):
+            stats = run_check(provider, symbol_names, alerts, cache_config, state=state, clock=clock)
+            clock.advance(tick_secs)
+            report.triggers += stats.alerts_triggered
+            if tick % sample_every == 0 or tick == ticks:
+                sample = SoakSample(tick=tick, elapsed_secs=time.perf_counter() - started, rss_bytes=current_rss_bytes(),
+                                    traced_bytes=tracemalloc.get_traced_memory()[0] if trace_allocations else None,
+                                    structures=_sample_structures(state, cache_config))
+                report.samples.append(sample)
+                if trace_allocations and baseline_snapshot is None and tick >= ticks // 2:
+                    baseline_snapshot = tracemalloc.take_snapshot()
+                if on_sample:
+                    on_sample(sample)
+        if trace_allocations and baseline_snapshot is not None:
+            stats_diff = tracemalloc.take_snapshot().compare_to(baseline_snapshot, "lineno")
+            report.top_growth = [str(s) for s in stats_diff[:SOAK_TOP_ALLOCATION_SITES] if s.size_diff > 0]
+    finally:
+        report.elapsed_secs = time.perf_counter() - started
+        report.simulated_secs = clock.time() - start_ts
+        set_log_min_level(None)
+        if trace_allocations:
+            tracemalloc.stop()
+    return report
+
+
+def write_soak_samples(report: SoakReport, path: str) -> None:
+    series = report.series()
+    names = list(series)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(",".join(["tick", "elapsed_secs"] + names) + "\n")
+        for i, s in enumerate(report.samples):
+            f.write(",".join([str(s.tick), f"{s.elapsed_secs:.3f}"] + [str(series[n][i]) for n in names]) + "\n")
@@ -0,0 +1,128 @@
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from stock_alert.common import *
+from stock_alert.data_providers import DataProvider, SymbolNotFound
+from stock_alert.core.file_utils import atomic_write_bytes
+
+
+@dataclass
+class SymbolResolveReport:
+    info: Dict[str, SymbolInfo] = field(default_factory=dict)  # Fresh, newly resolved, or stale after a failure
+    cached: int = 0  # Fresh in the cache, no request made
+    resolved: int = 0
+    not_found: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)  # Request failed (network, rate limit, no metadata support)
+
+    def summary(self) -> str:
+        return (f"{len(self.info)} symbol(s) known, {self.cached} cached, {self.resolved} resolved | "
+                f"not found {len(self.not_found)}, failed {len(self.failed)}")
+
+
+def symbol_meta_cache_path(provider_name: str) -> str:
+    """Per-provider cache file: providers disagree on symbols (e.g. the fake provider lists everything)."""
+    names = [n.strip().lower() for n in provider_name.split(",") if n.strip()] or ["fake"]
+    return str(Path(DEFAULT_STORAGE_DIR_PATH) / SYMBOL_META_CACHE_DIR_REL_PATH_VS_STORAGE / f"{'+'.join(names)}.json")
+
+
+class SymbolMetaCache:
+    """Symbol metadata on disk (one JSON file, symbol -> SymbolInfo), resolved through the provider again once
+    older than `ttl_secs`."""
+
+    def __init__(self, path: str, ttl_secs: float = SYMBOL_META_DEFAULT_TTL_SECS):
+        self.path = Path(path)
+        self.ttl_secs = ttl_secs
+        self.entries: Dict[str, SymbolInfo] = self._load()
+
+    def _load(self) -> Dict[str, SymbolInfo]:
+        try:
+            data = json.loads(self.path.read_bytes())
+            return {sym: SymbolInfo.from_dict(d) for sym, d in data.items()}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, TypeError, AttributeError) as e:
+            LOG(f"Warning: Ignoring unreadable symbol metadata cache {self.path}: {e}", log_level=LogLevel.WARNING)
+            return {}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {sym: info.to_dict() for sym, info in sorted(self.entries.items())}
+        atomic_write_bytes(str(self.path), json.dumps(payload, indent=1).encode("utf-8"))
+
+    def get(self, symbol: str, now_ts: float) -> Optional[SymbolInfo]:
+        """The cached entry if it is younger than the TTL."""
+        info = self.entries.get(symbol.upper())
+        return info if info is not None and now_ts - info.resolved_ts < self.ttl_secs else None
+
+    def resolve(self, provider: DataProvider, symbols: Iterable[str], now_ts: float,
+                max_workers: int = SYMBOL_META_MAX_WORKERS) -> SymbolResolveReport:
+        """Requests the symbols missing from the cache or expired, several at a time, and saves the cache once.
+
+        When a request fails, an expired entry is still used. Symbols the provider does not list are dropped from
+        the cache.
+        """
+        report = SymbolResolveReport()
+        pending: List[str] = []
+        for sym in sorted(set(s.upper() for s in symbols)):
+            info = self.get(sym, now_ts)
+            if info is not None:
+                report.info[sym] = info
+                report.cached += 1
+            else:
+                pending.append(sym)
+        if not pending:
+            return report
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending))), thread_name_prefix="symbol-meta") as pool:
+            futures = {pool.submit(provider.get_symbol_info, sym): sym for sym in pending}
+            for future in as_completed(futures):
+                sym = futures[future]
+                try:
+                    info = future.result()
+                except SymbolNotFound:
+                    report.not_found.append(sym)
+                    self.entries.pop(sym, None)
+                    continue
+                except NotImplementedError as e:
+                    LOG(f"Warning: {e}, symbols are not validated and markets are treated as open",
+                        log_level=LogLevel.WARNING)
+                    for f in futures:
+                        f.cancel()
+                    report.failed = [s for s in pending if s not in report.info and s not in report.not_found]
+                    break
+                except Exception as e:
+                    LOG(f"Warning: Could not resolve metadata for {sym}: {e}", log_level=LogLevel.WARNING)
+                    report.failed.append(sym)
+                    continue
+                info.symbol, info.resolved_ts = sym, now_ts
+                self.entries[sym] = report.info[sym] = info
+                report.resolved += 1
+        for sym in report.failed:
+            if sym in self.entries:
+                report.info[sym] = self.entries[sym]  # Expired, but better than nothing
+        report.not_found.sort()
+        report.failed.sort()
+        if report.resolved or report.not_found:
+            self.save()
+        return report
+
+
+def closed_symbols(symbols: Iterable[str], symbol_info: Dict[str, SymbolInfo], now_ts: float) -> Set[str]:
+    """Symbols whose market is closed at `now_ts`. Symbols without metadata count as open.
+
+    Each distinct session is checked once, so a large watchlist on a few exchanges costs a few time zone lookups.
+    """
+    is_open: Dict[Tuple[str, str, str, str], bool] = {}
+    closed: Set[str] = set()
+    for sym in symbols:
+        info = symbol_info.get(sym)
+        if info is None:
+            continue
+        key = info.session_key()
+        if key not in is_open:
+            is_open[key] = info.is_open(now_ts)
+        if not is_open[key]:
+            closed.add(sym)
+    return closed
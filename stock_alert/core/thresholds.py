@@ -0,0 +1,56 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from stock_alert.common import *
+
+# Position of each indexable field in the runner's quote fingerprint (price, pct_day, volume)
+THRESHOLD_FINGERPRINT_POSITIONS = {COND_FIELD_PRICE: 0, COND_FIELD_VOLUME: 2}
+
+
+@dataclass
+class ThresholdIndex:
+    """Static `>=` and `<=` levels of one symbol's field, sorted so a tick finds its alerts by bisection."""
+    position: int  # Index of the field in the quote fingerprint
+    ge_values: List[float] = field(default_factory=list)
+    ge_keys: List[str] = field(default_factory=list)
+    le_values: List[float] = field(default_factory=list)
+    le_keys: List[str] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, position: int, levels: List[Tuple[str, Operation, float]]) -> "ThresholdIndex":
+        index = cls(position=position)
+        for alert_key, op, value in sorted(levels, key=lambda level: level[2]):
+            if op == Operation.GE:
+                index.ge_values.append(value)
+                index.ge_keys.append(alert_key)
+            else:
+                index.le_values.append(value)
+                index.le_keys.append(alert_key)
+        return index
+
+    def affected(self, previous: Optional[float], value: float) -> List[str]:
+        """Alerts met at `value`, plus those met at `previous` but not any more (which must be re-evaluated to settle).
+
+        A `>=` level is met or was met iff it is <= max(previous, value), a `<=` level iff it is >= min(previous,
+        value): one prefix and one suffix. Comparisons with NaN are false, as in should_trigger.
+        """
+        points = [v for v in (previous, value) if v is not None and v == v]  # No level is met by NaN
+        if not points:
+            return []
+        high, low = max(points), min(points)
+        return self.ge_keys[:bisect_right(self.ge_values, high)] + self.le_keys[bisect_left(self.le_values, low):]
+
+
+def build_threshold_indexes(alerts: Dict[str, Alert]) -> Dict[str, List[ThresholdIndex]]:
+    """Symbol -> one index per field with static levels. Alerts not listed keep the regular evaluation path."""
+    levels: Dict[Tuple[str, int], List[Tuple[str, Operation, float]]] = {}
+    for alert_key, alert in alerts.items():
+        threshold = alert.static_threshold()
+        if threshold is None:
+            continue
+        field_name, op, value = threshold
+        levels.setdefault((alert.legs[0], THRESHOLD_FINGERPRINT_POSITIONS[field_name]), []).append((alert_key, op, value))
+    indexes: Dict[str, List[ThresholdIndex]] = {}
+    for (sym, position), sym_levels in levels.items():
+        indexes.setdefault(sym, []).append(ThresholdIndex.build(position, sym_levels))
+    return indexes
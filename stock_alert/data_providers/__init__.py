@@ -1,13 +1,27 @@
-from .base import DataProvider
+from .base import DataProvider, ProviderExhausted, SymbolNotFound
 from .fake import FakeDataProvider
+from .market_sim import MarketSimulator
 from .yahoo import YahooFinanceProvider
 from .alpha_vantage import AlphaVantageProvider
 from .finnhub import FinnhubProvider
+from .composite import CompositeDataProvider, ProviderHealth
+from .replay import ReplayDataProvider
+from .broker import BrokerDataProvider
+from .factory import PROVIDER_CHOICES, get_provider
 
 __all__ = [
     "DataProvider",
+    "ProviderExhausted",
+    "SymbolNotFound",
     "FakeDataProvider",
+    "MarketSimulator",
     "YahooFinanceProvider",
     "AlphaVantageProvider",
     "FinnhubProvider",
+    "CompositeDataProvider",
+    "ProviderHealth",
+    "ReplayDataProvider",
+    "BrokerDataProvider",
+    "PROVIDER_CHOICES",
+    "get_provider",
 ]
@@ -1,8 +1,29 @@
 from abc import ABC, abstractmethod
+from typing import List, Sequence
 from stock_alert.common import *
 
+
+class ProviderExhausted(Exception):
+    """Raised by finite providers (e.g. replay) when there is no more data; ends the monitoring loop."""
+
+
+class SymbolNotFound(ValueError):
+    """Raised by get_symbol_info when the provider does not list the symbol (as opposed to a failed request)."""
+
+
 class DataProvider(ABC):
+    def begin_tick(self, now_ts: float, symbols: Sequence[str] = ()) -> None:
+        """Called once at the start of every tick, before any get_quote call, with the symbols the tick will ask for."""
+
     @abstractmethod
     def get_quote(self, symbol: str) -> Quote:
         ...
 
+    def get_bars(self, symbol: str, start_ts: float, end_ts: float, interval_secs: int) -> List[Bar]:
+        """Intraday bars starting in [start_ts, end_ts), oldest first. Providers without history raise NotImplementedError."""
+        raise NotImplementedError(f"{type(self).__name__} does not provide historical bars")
+
+    def get_symbol_info(self, symbol: str) -> SymbolInfo:
+        """Listing metadata (exchange, asset type, currency, trading hours). Raises SymbolNotFound for unknown
+        symbols; providers without metadata raise NotImplementedError."""
+        raise NotImplementedError(f"{type(self).__name__} does not provide symbol metadata")
@@ -0,0 +1,117 @@
+import socket
+import threading
+import time
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple
+from stock_alert.common import *
+from stock_alert.core.broker_protocol import (BROKER_INFO, FRAME_ERROR, FRAME_INFO, FRAME_QUOTES, FRAME_SUBSCRIBE,
+                                              FRAME_SYMBOL, broker_socket_path, decode_quotes, encode_frame, read_frame)
+from .base import DataProvider
+
+
+class BrokerDataProvider(DataProvider):
+    """Reads quotes pushed by a local `stock-alert broker` instead of calling an upstream API.
+
+    All symbols of a tick are subscribed in one frame from begin_tick, so the broker fetches once for them.
+    get_quote returns the latest pushed quote, waiting up to `first_quote_wait_secs` for newly subscribed symbols,
+    and fails if it is older than `max_age_secs` (default: BROKER_MAX_AGE_INTERVALS broker intervals).
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, first_quote_wait_secs: float = BROKER_FIRST_QUOTE_WAIT_SECS,
+                 max_age_secs: Optional[float] = None):
+        self.socket_path = socket_path or broker_socket_path()
+        self.first_quote_wait_secs = first_quote_wait_secs
+        self.max_age_secs = max_age_secs
+        # Replaced by the interval the broker announces on connect
+        self._broker_interval_secs = float(seconds_from_interval(DEFAULT_MONITOR_INTERVAL))
+        self._sock: Optional[socket.socket] = None
+        self._subscribed: Set[str] = set()
+        self._latest: Dict[str, Tuple[float, Quote]] = {}
+        self._errors: Dict[str, Tuple[float, str]] = {}
+        self._cond = threading.Condition()
+
+    def _connect(self) -> socket.socket:
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.socket_path)
+            except OSError as e:
+                sock.close()
+                raise ConnectionError(f"Quote broker not reachable at {self.socket_path}: {e}")
+            self._sock = sock
+            threading.Thread(target=self._read_loop, args=(sock,), name="broker-reader", daemon=True).start()
+            if self._subscribed:
+                self._send_subscription()
+        return self._sock
+
+    def _send_subscription(self) -> None:
+        self._sock.sendall(encode_frame(FRAME_SUBSCRIBE, ",".join(sorted(self._subscribed)).encode("utf-8")))
+
+    def _read_loop(self, sock: socket.socket) -> None:
+        symbols: Dict[int, str] = {}
+        try:
+            while True:
+                frame = read_frame(sock)
+                if frame is None:
+                    break
+                frame_type, body = frame
+                if frame_type == FRAME_INFO:
+                    with self._cond:
+                        self._broker_interval_secs = BROKER_INFO.unpack(body[:BROKER_INFO.size])[0]
+                elif frame_type == FRAME_SYMBOL:
+                    symbols[int.from_bytes(body[:4], "little")] = body[4:].decode("utf-8")
+                elif frame_type == FRAME_QUOTES:
+                    ts, quotes = decode_quotes(body, symbols)
+                    with self._cond:
+                        for sym, q in quotes.items():
+                            self._latest[sym] = (ts, q)
+                            self._errors.pop(sym, None)
+                        self._cond.notify_all()
+                elif frame_type == FRAME_ERROR:
+                    sym, _, message = body.decode("utf-8").partition("\t")
+                    with self._cond:
+                        self._errors[sym] = (time.time(), message)
+                        self._cond.notify_all()
+        except (OSError, ConnectionError):
+            pass
+        with self._cond:
+            if self._sock is sock:
+                self._sock = None  # Reconnect on the next get_quote
+            self._cond.notify_all()
+        sock.close()
+
+    def _subscribe(self, symbols: Iterable[str]) -> None:
+        """Adds the new symbols in one subscription frame and waits for their first quotes. Caller holds _cond."""
+        new = {s.upper() for s in symbols} - self._subscribed
+        if not new:
+            return
+        self._connect()
+        self._subscribed |= new
+        self._send_subscription()
+        self._cond.wait_for(lambda: self._sock is None or all(s in self._latest or s in self._errors for s in new),
+                            timeout=self.first_quote_wait_secs)
+
+    def begin_tick(self, now_ts: float, symbols: Sequence[str] = ()) -> None:
+        with self._cond:
+            try:
+                self._subscribe(symbols)
+            except (OSError, ConnectionError):
+                pass  # get_quote reconnects and reports the error per symbol
+
+    def get_quote(self, symbol: str) -> Quote:
+        sym = symbol.upper()
+        with self._cond:
+            self._connect()
+            self._subscribe([sym])  # Callers that did not announce the symbol in begin_tick
+            latest = self._latest.get(sym)
+            error = self._errors.get(sym)
+            max_age_secs = self.max_age_secs
+            if max_age_secs is None:
+                max_age_secs = BROKER_MAX_AGE_INTERVALS * self._broker_interval_secs
+        if error and (latest is None or error[0] >= latest[0]):
+            raise ValueError(f"Broker: {error[1]}")
+        if latest is None:
+            raise ValueError(f"No quote from broker yet for symbol: {sym}")
+        ts, q = latest
+        if time.time() - ts > max_age_secs:
+            raise ValueError(f"Broker quote for {sym} is stale ({time.time() - ts:.0f}s old)")
+        return q
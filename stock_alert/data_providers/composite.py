@@ -0,0 +1,170 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional, Sequence, Tuple
+from stock_alert.common import *
+from .base import DataProvider, ProviderExhausted
+
+
+@dataclass
+class ProviderHealth:
+    """Rolling health/latency stats for one backend of a CompositeDataProvider."""
+    name: str
+    priority: int
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    demoted_until: float = 0.0
+
+    def p95(self) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def is_demoted(self, now_ts: float) -> bool:
+        return now_ts < self.demoted_until
+
+    def summary(self, now_ts: float) -> str:
+        p95 = self.p95()
+        p95_s = f"{p95 * 1000:.0f}ms" if p95 is not None else "n/a"
+        state = f"demoted {self.demoted_until - now_ts:.0f}s" if self.is_demoted(now_ts) else "ok"
+        return f"{self.name}: {state}, p95={p95_s}, ok={self.successes}, fail={self.failures}"
+
+
+class CompositeDataProvider(DataProvider):
+    """Queries a prioritized list of providers with hedging and automatic failover.
+
+    The best-ranked provider is asked first. If it has not produced a valid quote within `hedge_after_secs`
+    (or fails), the next provider is asked as well and the first valid answer wins. Providers with
+    `max_consecutive_failures` failures in a row are demoted for `demote_secs`; providers whose p95 latency
+    exceeds `slow_p95_secs` are ranked after the fast ones.
+    """
+
+    MIN_SAMPLES_FOR_P95 = 20
+
+    def __init__(self, providers: List[Tuple[str, DataProvider]], hedge_after_secs: float = 1.0,
+                 max_consecutive_failures: int = 3, demote_secs: float = 60.0, slow_p95_secs: Optional[float] = None,
+                 timeout_secs: float = 15.0):
+        if not providers:
+            raise ValueError("CompositeDataProvider needs at least one provider")
+        self.providers = [p for _, p in providers]
+        self.health = [ProviderHealth(name=name, priority=i) for i, (name, _) in enumerate(providers)]
+        self.hedge_after_secs = hedge_after_secs
+        self.max_consecutive_failures = max_consecutive_failures
+        self.demote_secs = demote_secs
+        self.slow_p95_secs = slow_p95_secs if slow_p95_secs is not None else 2 * hedge_after_secs
+        self.timeout_secs = timeout_secs
+        self._lock = threading.Lock()
+        # Losing (slow) requests keep running in the background, so leave room for a few of them
+        self._executor = ThreadPoolExecutor(max_workers=4 * len(providers), thread_name_prefix="quote-hedge")
+
+    def _ranked(self) -> List[int]:
+        now_ts = time.time()
+        with self._lock:
+            def rank(i: int):
+                h = self.health[i]
+                p95 = h.p95() if len(h.latencies) >= self.MIN_SAMPLES_FOR_P95 else None
+                is_slow = p95 is not None and p95 > self.slow_p95_secs
+                return h.is_demoted(now_ts), is_slow, h.priority
+            return sorted(range(len(self.providers)), key=rank)
+
+    def _record(self, idx: int, started: float, ok: bool) -> None:
+        latency = time.time() - started
+        with self._lock:
+            h = self.health[idx]
+            h.latencies.append(latency)
+            if ok:
+                h.successes += 1
+                h.consecutive_failures = 0
+                return
+            h.failures += 1
+            h.consecutive_failures += 1
+            if h.consecutive_failures >= self.max_consecutive_failures and not h.is_demoted(time.time()):
+                h.demoted_until = time.time() + self.demote_secs
+                LOG(f"Provider '{h.name}' demoted for {self.demote_secs:.0f}s after {h.consecutive_failures} consecutive failures",
+                    log_level=LogLevel.WARNING)
+
+    def begin_tick(self, now_ts: float, symbols: Sequence[str] = ()) -> None:
+        """Forwards the tick to every backend, so simulated and replayed ones advance whichever answers."""
+        for idx, provider in enumerate(self.providers):
+            try:
+                provider.begin_tick(now_ts, symbols)
+            except ProviderExhausted:
+                raise
+            except Exception as e:
+                # The backend's get_quote calls will fail too and fail over to the others
+                LOG(f"Warning: Provider '{self.health[idx].name}' could not start the tick: {e}",
+                    log_level=LogLevel.WARNING)
+
+    def _fetch(self, idx: int, symbol: str) -> Quote:
+        started = time.time()
+        try:
+            q = self.providers[idx].get_quote(symbol)
+        except Exception:
+            self._record(idx, started, ok=False)
+            raise
+        if q is None or q.price <= 0:
+            self._record(idx, started, ok=False)
+            raise ValueError(f"Empty quote from '{self.health[idx].name}' for symbol: {symbol}")
+        self._record(idx, started, ok=True)
+        return q
+
+    def get_quote(self, symbol: str) -> Quote:
+        order = self._ranked()
+        pending: List[Future] = []
+        last_error: Optional[BaseException] = None
+        deadline = time.time() + self.timeout_secs
+        next_idx = 0
+        hedge_at = 0.0
+
+        while True:
+            if next_idx < len(order) and (not pending or time.time() >= hedge_at):
+                pending.append(self._executor.submit(self._fetch, order[next_idx], symbol))
+                next_idx += 1
+                hedge_at = time.time() + self.hedge_after_secs
+
+            if not pending:
+                raise last_error or ValueError(f"No provider could quote symbol: {symbol}")
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimeoutError(f"No provider answered for {symbol} within {self.timeout_secs:.0f}s")
+            # Wake up at the hedge point if there is still a backend to try
+            wait_secs = min(remaining, max(0.0, hedge_at - time.time())) if next_idx < len(order) else remaining
+            done, _ = wait(pending, timeout=wait_secs, return_when=FIRST_COMPLETED)
+            for fut in done:
+                pending.remove(fut)
+                try:
+                    return fut.result()
+                except Exception as e:
+                    last_error = e
+                    hedge_at = time.time()  # A failure triggers failover immediately
+
+    def get_bars(self, symbol: str, start_ts: float, end_ts: float, interval_secs: int) -> List[Bar]:
+        """Asks the providers one at a time in rank order (no hedging: bar requests are large and one-off)."""
+        last_error: Optional[BaseException] = None
+        for idx in self._ranked():
+            try:
+                return self.providers[idx].get_bars(symbol, start_ts, end_ts, interval_secs)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def get_symbol_info(self, symbol: str) -> SymbolInfo:
+        """Like get_bars: one provider at a time in rank order, so a symbol unknown to one can still be found."""
+        last_error: Optional[BaseException] = None
+        for idx in self._ranked():
+            try:
+                return self.providers[idx].get_symbol_info(symbol)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def health_summary(self) -> str:
+        now_ts = time.time()
+        with self._lock:
+            return " | ".join(h.summary(now_ts) for h in self.health)
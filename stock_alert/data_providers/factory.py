@@ -0,0 +1,41 @@
+from typing import List, Optional
+from .base import DataProvider
+from .fake import FakeDataProvider
+from .yahoo import YahooFinanceProvider
+from .alpha_vantage import AlphaVantageProvider
+from .finnhub import FinnhubProvider
+from .composite import CompositeDataProvider
+from .replay import ReplayDataProvider
+from .broker import BrokerDataProvider
+
+PROVIDER_CHOICES = ["fake", "sim", "yahoo", "alphavantage", "finnhub", "replay", "broker"]
+
+
+def get_provider(name: str, hedge_after_secs: float = 1.0, replay_paths: Optional[List[str]] = None,
+                 seed: Optional[int] = None) -> DataProvider:
+    """Initializes and returns the named data provider.
+
+    A comma-separated list (e.g. 'finnhub,yahoo') builds a CompositeDataProvider in priority order.
+    """
+    names = [n.strip().lower() for n in (name or "fake").split(",") if n.strip()]
+    if len(names) > 1:
+        children = [(n, get_provider(n, replay_paths=replay_paths, seed=seed)) for n in names]
+        return CompositeDataProvider(children, hedge_after_secs=hedge_after_secs)
+    name = names[0] if names else "fake"
+    if name == "fake":
+        return FakeDataProvider(seed=seed)
+    if name in ("sim", "simulated"):
+        return FakeDataProvider(seed=seed, simulate=True)
+    if name in ("yahoo", "yfinance", "yahoo_finance"):
+        return YahooFinanceProvider()
+    if name in ("alpha", "alphavantage", "alpha_vantage"):
+        return AlphaVantageProvider()
+    if name in ("finnhub",):
+        return FinnhubProvider()
+    if name in ("replay",):
+        if not replay_paths:
+            raise ValueError("--provider replay requires --replay-from FILE_OR_DIR")
+        return ReplayDataProvider(replay_paths)
+    if name in ("broker",):
+        return BrokerDataProvider()
+    raise ValueError(f"Unknown provider '{name}' (expected one of: {', '.join(PROVIDER_CHOICES)})")
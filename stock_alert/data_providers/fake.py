@@ -1,15 +1,54 @@
+import math
 import random
-from typing import Optional
+from typing import List, Optional, Sequence
 from .base import DataProvider
+from .market_sim import MarketSimulator
 from stock_alert.common import *
 
 class FakeDataProvider(DataProvider):
-    def __init__(self, seed: Optional[int] = None):
+    """Random quotes around a per-symbol base price, or a simulated market with `simulate=True`.
+
+    In simulation mode every tick advances a MarketSimulator by one step (correlated GBM prices, intraday
+    volume profile), so prices are continuous across ticks and a seed replays the same market.
+    """
+
+    def __init__(self, seed: Optional[int] = None, simulate: bool = False,
+                 step_secs: float = SIM_DEFAULT_STEP_SECS):
         self.random = random.Random(seed)
+        self.market = MarketSimulator(seed=seed, step_secs=step_secs) if simulate else None
+
+    def begin_tick(self, now_ts: float, symbols: Sequence[str] = ()) -> None:
+        if self.market is not None:
+            self.market.step()
 
     def get_quote(self, symbol: str) -> Quote:
+        if self.market is not None:
+            return self.market.quote(symbol.upper())
         base = sum(ord(c) for c in symbol) % 200 + 20
         price = round(base + self.random.uniform(-5, 5), 2)
         pct_day = round(self.random.uniform(-5, 5), 2)
         volume = int(abs(self.random.gauss(2_000_000, 500_000)))
         return Quote(symbol=symbol.upper(), price=price, pct_day=pct_day, volume=volume)
+
+    def get_symbol_info(self, symbol: str) -> SymbolInfo:
+        """Every symbol is listed: FAKE_CRYPTO_SYMBOLS and *-USD as crypto, anything else as a US equity."""
+        sym = symbol.upper()
+        if sym in FAKE_CRYPTO_SYMBOLS or sym.endswith("-USD"):
+            return SymbolInfo(symbol=sym, exchange="FAKE", asset_type=ASSET_TYPE_CRYPTO, currency="USD")
+        tz, session_open, session_close = EXCHANGE_SESSIONS_BY_COUNTRY["US"]
+        return SymbolInfo(symbol=sym, exchange="FAKE", asset_type=ASSET_TYPE_EQUITY, currency="USD", timezone=tz,
+                          session_open=session_open, session_close=session_close)
+
+    def get_bars(self, symbol: str, start_ts: float, end_ts: float, interval_secs: int) -> List[Bar]:
+        """Bars are a function of symbol and time only, so overlapping requests agree like a real feed would."""
+        sym = symbol.upper()
+        base = sum(ord(c) for c in sym) % 200 + 20
+        bars: List[Bar] = []
+        for ts in range(math.ceil(start_ts / interval_secs) * interval_secs, math.ceil(end_ts), interval_secs):
+            rng = random.Random(f"{sym}:{ts}")
+            mid = base * (1 + 0.03 * math.sin(ts / 7200 + base))
+            open_, close = round(mid + rng.uniform(-0.3, 0.3), 2), round(mid + rng.uniform(-0.3, 0.3), 2)
+            bars.append(Bar(ts=float(ts), open=open_, high=round(max(open_, close) + rng.uniform(0, 0.2), 2),
+                            low=round(min(open_, close) - rng.uniform(0, 0.2), 2), close=close,
+                            volume=int(rng.uniform(1_000, 10_000))))
+        return bars
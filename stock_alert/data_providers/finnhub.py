@@ -1,13 +1,14 @@
 import json
-from typing import Optional
+from typing import List, Optional
 import urllib.parse
 import urllib.request
 from pathlib import Path
 
-from ..core import Quote
-from .base import DataProvider
+from ..core import Bar, Quote, SymbolInfo
+from .base import DataProvider, SymbolNotFound
 from ..common.utils import read_value_from_credential_file
-from ..common.constants import CREDENTIALS_FILE_PATH, FINNHUB_API_KEY
+from ..common.constants import (ASSET_TYPE_EQUITY, CREDENTIALS_FILE_PATH, EXCHANGE_SESSIONS_BY_COUNTRY, FINNHUB_API_KEY,
+                                FINNHUB_CANDLE_RESOLUTIONS)
 
 
 class FinnhubProvider(DataProvider):
@@ -17,6 +18,8 @@ class FinnhubProvider(DataProvider):
     """
 
     BASE_URL = "https://finnhub.io/api/v1/quote"
+    CANDLE_URL = "https://finnhub.io/api/v1/stock/candle"
+    PROFILE_URL = "https://finnhub.io/api/v1/stock/profile2"
 
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or read_value_from_credential_file(CREDENTIALS_FILE_PATH, FINNHUB_API_KEY)
@@ -33,3 +36,38 @@ class FinnhubProvider(DataProvider):
         pct_day = float(data.get("dp") or 0.0)
         volume = int(data.get("v") or 0)
         return Quote(symbol=sym, price=round(price, 2), pct_day=round(pct_day, 2), volume=volume)
+
+    def get_symbol_info(self, symbol: str) -> SymbolInfo:
+        """From the company profile; trading hours come from the listing country (EXCHANGE_SESSIONS_BY_COUNTRY).
+
+        The free tier has no profile for ETFs and other non-company listings: those are validated with a quote.
+        """
+        sym = symbol.upper()
+        url = f"{self.PROFILE_URL}?" + urllib.parse.urlencode({"symbol": sym, "token": self.api_key})
+        with urllib.request.urlopen(url, timeout=10) as resp:
+            profile = json.loads(resp.read().decode("utf-8"))
+        if not profile:
+            if self.get_quote(sym).price <= 0:
+                raise SymbolNotFound(f"Unknown symbol: {sym}")
+            return SymbolInfo(symbol=sym)
+        tz, session_open, session_close = EXCHANGE_SESSIONS_BY_COUNTRY.get(profile.get("country") or "", ("", "", ""))
+        return SymbolInfo(symbol=sym, exchange=profile.get("exchange") or "", asset_type=ASSET_TYPE_EQUITY,
+                          currency=profile.get("currency") or "", timezone=tz, session_open=session_open,
+                          session_close=session_close)
+
+    def get_bars(self, symbol: str, start_ts: float, end_ts: float, interval_secs: int) -> List[Bar]:
+        resolution = FINNHUB_CANDLE_RESOLUTIONS.get(interval_secs)
+        if resolution is None:
+            raise ValueError(f"Unsupported bar interval for Finnhub: {interval_secs}s")
+        sym = symbol.upper()
+        params = {"symbol": sym, "resolution": resolution, "from": int(start_ts), "to": int(end_ts), "token": self.api_key}
+        url = f"{self.CANDLE_URL}?" + urllib.parse.urlencode(params)
+        with urllib.request.urlopen(url, timeout=20) as resp:
+            data = json.loads(resp.read().decode("utf-8"))
+        if data.get("s") == "no_data":
+            return []
+        if data.get("s") != "ok":
+            raise ValueError(f"No bar data for symbol: {sym} ({data.get('s') or data.get('error')})")
+        return [Bar(ts=float(t), open=float(o), high=float(h), low=float(l), close=float(c), volume=int(v or 0))
+                for t, o, h, l, c, v in zip(data["t"], data["o"], data["h"], data["l"], data["c"], data["v"])
+                if start_ts <= t < end_ts]
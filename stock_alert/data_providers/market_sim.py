@@ -0,0 +1,207 @@
+import math
+import random
+import zlib
+from typing import Dict, List, Optional
+from stock_alert.common import *
+
+try:  # Optional: vectorized steps. The pure-Python path produces the same kind of market, just slower.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+TRADING_DAYS_PER_YEAR = 252
+SESSION_SECS = 6.5 * 3600
+
+
+def _volume_profile(x: float) -> float:
+    """U-shaped intraday volume density over the session (x in [0, 1]); integrates to 1."""
+    k = SIM_VOLUME_PROFILE_CURVATURE
+    return (1.0 + k * (2.0 * x - 1.0) ** 2) / (1.0 + k / 3.0)
+
+
+class MarketSimulator:
+    """Correlated geometric Brownian motion for a universe of symbols, advanced one whole tick per step().
+
+    Each symbol's shock mixes a market factor, one of a few sector factors and its own noise, so symbols move
+    together like a real market. The session clock is simulated (`step_secs` per step, 6.5h sessions), so a
+    given seed replays the exact same market regardless of wall-clock time. Per-symbol parameters only depend
+    on the seed and the symbol name. Day volume accumulates along a U-shaped intraday profile, and pct_day is
+    measured against the previous session's close.
+    """
+
+    def __init__(self, seed: Optional[int] = None, step_secs: float = SIM_DEFAULT_STEP_SECS,
+                 drift: float = SIM_DEFAULT_ANNUAL_DRIFT, use_numpy: bool = True):
+        self.seed = seed if seed is not None else random.randrange(1 << 31)
+        self.step_secs = step_secs
+        self.drift = drift
+        self.dt_years = step_secs / (TRADING_DAYS_PER_YEAR * SESSION_SECS)
+        self.use_numpy = use_numpy and np is not None
+        self.steps = 0
+        self.session_elapsed_secs = 0.0
+        self._index: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        # Static per-symbol parameters
+        self._sigma: List[float] = []
+        self._market_loading: List[float] = []
+        self._sector_loading: List[float] = []
+        self._own_loading: List[float] = []
+        self._sector: List[int] = []
+        self._avg_day_volume: List[float] = []
+        # State. Lists in the pure-Python path; numpy arrays (plus pending list tails) in the vectorized path.
+        self.price: List[float] = []
+        self.prev_close: List[float] = []
+        self.day_volume: List[float] = []
+        self._materialized = 0  # Symbols already folded into the numpy arrays
+        self._pending_price: List[float] = []  # Starting prices of symbols added since the last step
+        self._tick_lists: Optional[tuple] = None  # Vectorized path: the current tick as Python lists, built once
+        if self.use_numpy:
+            self._rng = np.random.default_rng(self.seed)
+            self._arrays: Dict[str, "np.ndarray"] = {}
+        else:
+            self._random = random.Random(self.seed)
+
+    def add_symbols(self, symbols: List[str]) -> None:
+        """Registers symbols (no-op for known ones). New symbols start at the previous close of their first day."""
+        for sym in symbols:
+            if sym in self._index:
+                continue
+            params = random.Random(zlib.crc32(f"{self.seed}:{sym}".encode("utf-8")))
+            self._index[sym] = len(self.symbols)
+            self.symbols.append(sym)
+            self._sigma.append(params.uniform(SIM_MIN_ANNUAL_VOL, SIM_MAX_ANNUAL_VOL))
+            market = params.uniform(0.3, 0.7)
+            sector = params.uniform(0.1, 0.5)
+            self._market_loading.append(market)
+            self._sector_loading.append(sector)
+            self._own_loading.append(math.sqrt(max(0.0, 1.0 - market * market - sector * sector)))
+            self._sector.append(params.randrange(SIM_SECTOR_COUNT))
+            self._avg_day_volume.append(math.exp(params.uniform(math.log(2e5), math.log(5e7))))
+            start_price = math.exp(params.uniform(math.log(5.0), math.log(800.0)))
+            if self.use_numpy:
+                self._pending_price.append(start_price)
+            else:
+                self.price.append(start_price)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def _roll_session(self) -> None:
+        """Starts a new session: today's last prices become the previous close, day volume resets."""
+        self.session_elapsed_secs = 0.0
+        if self.use_numpy:
+            self._arrays["prev_close"] = self._arrays["price"].copy()
+            self._arrays["day_volume"][:] = 0.0
+        else:
+            self.prev_close = list(self.price)
+            self.day_volume = [0.0] * len(self.price)
+
+    def _materialize(self) -> None:
+        """Vectorized path: turns newly added symbols into array rows with one concatenate per step."""
+        n = len(self.symbols)
+        if self._arrays and self._materialized == n:
+            return
+        a = self._arrays
+        pending = np.array(self._pending_price, dtype=np.float64)
+        self._pending_price = []
+        a["price"] = np.concatenate([a.get("price", np.empty(0)), pending])
+        a["prev_close"] = np.concatenate([a.get("prev_close", np.empty(0)), pending])
+        a["day_volume"] = np.concatenate([a.get("day_volume", np.empty(0)), np.zeros(len(pending))])
+        a["sector"] = np.array(self._sector, dtype=np.int64)
+        sigma = np.array(self._sigma, dtype=np.float64)
+        a["sigma_sqrt_dt"] = sigma * math.sqrt(self.dt_years)
+        a["drift_dt"] = (self.drift - 0.5 * sigma * sigma) * self.dt_years
+        a["market_loading"] = np.array(self._market_loading, dtype=np.float64)
+        a["sector_loading"] = np.array(self._sector_loading, dtype=np.float64)
+        a["own_loading"] = np.array(self._own_loading, dtype=np.float64)
+        a["avg_day_volume"] = np.array(self._avg_day_volume, dtype=np.float64)
+        self._materialized = n
+
+    def _step_python(self, volume_share: float) -> None:
+        rnd = self._random
+        n = len(self.price)
+        if len(self.prev_close) < n:  # Symbols added since the last step
+            self.prev_close.extend(self.price[len(self.prev_close):])
+            self.day_volume.extend([0.0] * (n - len(self.day_volume)))
+        z_market = rnd.gauss(0.0, 1.0)
+        z_sector = [rnd.gauss(0.0, 1.0) for _ in range(SIM_SECTOR_COUNT)]
+        sqrt_dt = math.sqrt(self.dt_years)
+        dt = self.dt_years
+        gauss = rnd.gauss
+        exp = math.exp
+        self.price = [
+            p * exp((self.drift - 0.5 * s * s) * dt
+                    + s * sqrt_dt * (a * z_market + b * z_sector[sec] + c * gauss(0.0, 1.0)))
+            for p, s, a, b, c, sec in zip(self.price, self._sigma, self._market_loading, self._sector_loading,
+                                          self._own_loading, self._sector)
+        ]
+        sd = SIM_VOLUME_NOISE
+        self.day_volume = [v + adv * volume_share * exp(sd * gauss(0.0, 1.0) - 0.5 * sd * sd)
+                           for v, adv in zip(self.day_volume, self._avg_day_volume)]
+
+    def _step_numpy(self, volume_share: float) -> None:
+        a = self._arrays
+        n = len(a["price"])
+        rng = self._rng
+        z_market = rng.standard_normal()
+        z_sector = rng.standard_normal(SIM_SECTOR_COUNT)
+        shock = a["market_loading"] * z_market + a["sector_loading"] * z_sector[a["sector"]] \
+            + a["own_loading"] * rng.standard_normal(n)
+        a["price"] *= np.exp(a["drift_dt"] + a["sigma_sqrt_dt"] * shock)
+        sd = SIM_VOLUME_NOISE
+        a["day_volume"] += a["avg_day_volume"] * volume_share * np.exp(sd * rng.standard_normal(n) - 0.5 * sd * sd)
+
+    def step(self) -> None:
+        """Advances the whole universe by one tick of `step_secs` simulated session time."""
+        if self.use_numpy:
+            self._materialize()
+        if self.session_elapsed_secs + self.step_secs > SESSION_SECS:
+            self._roll_session()
+        start = self.session_elapsed_secs / SESSION_SECS
+        self.session_elapsed_secs += self.step_secs
+        end = self.session_elapsed_secs / SESSION_SECS
+        # Share of the average day volume traded during this step (midpoint rule on the profile)
+        volume_share = _volume_profile((start + end) / 2.0) * (end - start)
+        if self.use_numpy:
+            self._step_numpy(volume_share)
+            self._tick_lists = None
+        else:
+            self._step_python(volume_share)
+        self.steps += 1
+
+    def quote(self, symbol: str) -> Quote:
+        i = self._index.get(symbol)
+        if i is None:
+            self.add_symbols([symbol])
+            i = self._index[symbol]
+        if self.use_numpy:
+            if i >= self._materialized:  # Added since the last step: still at its starting price
+                price = prev_close = self._pending_price[i - self._materialized]
+                volume = 0.0
+            else:
+                prices, prev_closes, volumes = self._current_lists()
+                price, prev_close, volume = prices[i], prev_closes[i], volumes[i]
+        else:
+            price = self.price[i]
+            prev_close = self.prev_close[i] if i < len(self.prev_close) else price
+            volume = self.day_volume[i] if i < len(self.day_volume) else 0.0
+        return Quote(symbol=symbol, price=round(price, 2), pct_day=round((price / prev_close - 1.0) * 100.0, 2),
+                     volume=int(volume))
+
+    def _current_lists(self) -> tuple:
+        """(price, prev_close, day_volume) lists of the current tick, for symbols that were already stepped."""
+        if not self.use_numpy:
+            n = min(len(self.price), len(self.prev_close), len(self.day_volume))
+            return self.price[:n], self.prev_close[:n], self.day_volume[:n]
+        if self._tick_lists is None:  # One bulk conversion per tick instead of a numpy scalar per quote
+            a = self._arrays
+            self._tick_lists = (a["price"].tolist(), a["prev_close"].tolist(), a["day_volume"].tolist())
+        return self._tick_lists
+
+    def quotes(self) -> Dict[str, Quote]:
+        """The current tick for the whole universe."""
+        prices, prev_closes, volumes = self._current_lists() if self.steps else ([], [], [])
+        out = {sym: Quote(symbol=sym, price=round(p, 2), pct_day=round((p / c - 1.0) * 100.0, 2), volume=int(v))
+               for sym, p, c, v in zip(self.symbols, prices, prev_closes, volumes)}
+        for sym in self.symbols[len(out):]:  # Added since the last step
+            out[sym] = self.quote(sym)
+        return out
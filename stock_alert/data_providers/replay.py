@@ -0,0 +1,32 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from stock_alert.common import *
+from stock_alert.core.quote_log import iter_quote_logs
+from .base import DataProvider, ProviderExhausted
+
+
+class ReplayDataProvider(DataProvider):
+    """Serves quotes from recorded quote logs, one recorded tick per monitor tick."""
+
+    def __init__(self, paths: List[str], loop: bool = False):
+        if not paths:
+            raise ValueError("ReplayDataProvider needs at least one quote log file or directory")
+        self.paths = paths
+        self.loop = loop
+        self._ticks: Iterator[Tuple[float, Dict[str, Quote]]] = iter_quote_logs(paths)
+        self.current_ts: Optional[float] = None
+        self._current: Dict[str, Quote] = {}
+
+    def begin_tick(self, now_ts: float, symbols: Sequence[str] = ()) -> None:
+        tick = next(self._ticks, None)
+        if tick is None and self.loop:
+            self._ticks = iter_quote_logs(self.paths)
+            tick = next(self._ticks, None)
+        if tick is None:
+            raise ProviderExhausted(f"Replay of {', '.join(self.paths)} finished")
+        self.current_ts, self._current = tick
+
+    def get_quote(self, symbol: str) -> Quote:
+        q = self._current.get(symbol.upper())
+        if q is None:
+            raise ValueError(f"No recorded quote for symbol: {symbol}")
+        return q
@@ -1,8 +1,11 @@
 import json
+from typing import List
+import urllib.error
 import urllib.parse
 import urllib.request
+from datetime import datetime
 from stock_alert.common import *
-from .base import DataProvider
+from .base import DataProvider, SymbolNotFound
 
 
 class YahooFinanceProvider(DataProvider):
@@ -13,6 +16,7 @@ class YahooFinanceProvider(DataProvider):
     """
 
     BASE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+    CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/"
 
     def get_quote(self, symbol: str) -> Quote:
         sym = symbol.upper()
@@ -27,3 +31,57 @@ class YahooFinanceProvider(DataProvider):
         pct_day = float(result.get("regularMarketChangePercent") or 0.0)
         volume = int(result.get("regularMarketVolume") or 0)
         return Quote(symbol=sym, price=round(price, 2), pct_day=round(pct_day, 2), volume=volume)
+
+    def get_symbol_info(self, symbol: str) -> SymbolInfo:
+        """From the chart endpoint's metadata, which also carries today's regular trading period."""
+        sym = symbol.upper()
+        url = self.CHART_URL + urllib.parse.quote(sym) + "?" + urllib.parse.urlencode({"range": "1d", "interval": "1d"})
+        try:
+            with urllib.request.urlopen(url, timeout=10) as resp:
+                data = json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                raise SymbolNotFound(f"Unknown symbol: {sym}")
+            raise
+        try:
+            meta = data["chart"]["result"][0]["meta"]
+        except (KeyError, IndexError, TypeError):
+            raise SymbolNotFound(f"Unknown symbol: {sym}")
+        asset_type = YAHOO_INSTRUMENT_TYPES.get(str(meta.get("instrumentType") or "").upper(), "")
+        tz = meta.get("exchangeTimezoneName") or ""
+        regular = (meta.get("currentTradingPeriod") or {}).get("regular") or {}
+        session_open = session_close = ""
+        if tz and regular.get("start") and regular.get("end") and ZoneInfo is not None:
+            session_open = datetime.fromtimestamp(regular["start"], ZoneInfo(tz)).strftime("%H:%M")
+            session_close = datetime.fromtimestamp(regular["end"], ZoneInfo(tz)).strftime("%H:%M")
+        return SymbolInfo(symbol=sym, exchange=meta.get("exchangeName") or "", asset_type=asset_type,
+                          currency=meta.get("currency") or "", timezone=tz, session_open=session_open,
+                          session_close=session_close)
+
+    def get_bars(self, symbol: str, start_ts: float, end_ts: float, interval_secs: int) -> List[Bar]:
+        interval = YAHOO_CHART_INTERVALS.get(interval_secs)
+        if interval is None:
+            raise ValueError(f"Unsupported bar interval for Yahoo: {interval_secs}s "
+                             f"(expected one of: {', '.join(YAHOO_CHART_INTERVALS.values())})")
+        sym = symbol.upper()
+        params = {"period1": int(start_ts), "period2": int(end_ts), "interval": interval, "includePrePost": "false"}
+        url = self.CHART_URL + urllib.parse.quote(sym) + "?" + urllib.parse.urlencode(params)
+        with urllib.request.urlopen(url, timeout=20) as resp:
+            data = json.loads(resp.read().decode("utf-8"))
+        try:
+            result = data["chart"]["result"][0]
+        except (KeyError, IndexError, TypeError):
+            raise ValueError(f"No bar data for symbol: {sym}")
+        timestamps = result.get("timestamp") or []
+        if not timestamps:
+            return []
+        candles = result["indicators"]["quote"][0]
+        bars: List[Bar] = []
+        for i, ts in enumerate(timestamps):
+            close = candles["close"][i]
+            if close is None or not start_ts <= ts < end_ts:
+                continue  # Minutes without trades are padded with nulls
+            bars.append(Bar(ts=float(ts), open=float(candles["open"][i] or close), high=float(candles["high"][i] or close),
+                            low=float(candles["low"][i] or close), close=float(close),
+                            volume=int(candles["volume"][i] or 0)))
+        return bars
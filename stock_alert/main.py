@@ -2,7 +2,7 @@ import argparse
 import sys
 from typing import List, Optional
 
-from stock_alert.tools import t_manage_settings, t_monitor_stocks
+from stock_alert.tools import t_backtest, t_board, t_broker, t_manage_settings, t_monitor_stocks, t_soak
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -29,6 +29,38 @@ def main(argv: Optional[List[str]] = None) -> int:
     )
     monitor_parser.set_defaults(func=t_monitor_stocks.main)
 
+    # Backtest Tool
+    backtest_parser = subparsers.add_parser(
+        "backtest",
+        help="Replay historical quotes through alerts (e.g., 'stock-alert backtest quotes.csv --report triggers.csv').",
+        add_help=False,  # Let the subcommand handle its own help
+    )
+    backtest_parser.set_defaults(func=t_backtest.main)
+
+    # Broker Tool
+    broker_parser = subparsers.add_parser(
+        "broker",
+        help="Share one provider fetch per interval with local monitors (e.g., 'stock-alert broker --provider finnhub').",
+        add_help=False,  # Let the subcommand handle its own help
+    )
+    broker_parser.set_defaults(func=t_broker.main)
+
+    # Quote Board Tool
+    board_parser = subparsers.add_parser(
+        "board",
+        help="Show the latest quotes a running monitor published with '--board' (e.g., 'stock-alert board GLD').",
+        add_help=False,  # Let the subcommand handle its own help
+    )
+    board_parser.set_defaults(func=t_board.main)
+
+    # Soak Test Tool
+    soak_parser = subparsers.add_parser(
+        "soak",
+        help="Run many simulated ticks and report memory growth per structure (e.g., 'stock-alert soak --ticks 1000000').",
+        add_help=False,  # Let the subcommand handle its own help
+    )
+    soak_parser.set_defaults(func=t_soak.main)
+
     args, remainder = parser.parse_known_args(argv)
 
     if not hasattr(args, "func"):
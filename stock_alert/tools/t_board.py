@@ -0,0 +1,61 @@
+import argparse
+import sys
+import time
+import traceback
+from datetime import datetime
+from typing import List, Optional
+from stock_alert.common import *
+from stock_alert.core import *
+
+
+def _print_board(reader: QuoteBoardReader, symbols: List[str]) -> None:
+    if symbols:
+        entries = {sym: reader.get(sym) for sym in symbols}
+    else:
+        entries = reader.snapshot()
+    last_ts = reader.last_tick_ts
+    LOG(f"Quote board {reader.path} | last tick: "
+        f"{datetime.fromtimestamp(last_ts).strftime('%Y-%m-%d %H:%M:%S') if last_ts else 'never'}")
+    for sym in sorted(entries):
+        entry = entries[sym]
+        if entry is None:
+            LOG(f"{sym:<6}: not published")
+            continue
+        ts, q = entry
+        LOG(f"{sym:<6}: price=${q.price:<8.2f} | % day={q.pct_day:<6.2f} | vol={q.volume} | age {time.time() - ts:.0f}s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for reading the monitor's shared quote board."""
+    parser = argparse.ArgumentParser(prog="stock-alert board",
+                                     description="Show the latest quotes published by 'stock-alert monitor --board'.")
+    parser.add_argument("symbols", nargs="*", help="Symbols to show (default: all published)")
+    parser.add_argument("--path", default=None, help="Board file (default: <storage>/run/quotes.board)")
+    parser.add_argument("--watch", default=None, help="Refresh every interval, e.g. '1s', until interrupted")
+    args = parser.parse_args(argv)
+
+    try:
+        try:
+            reader = QuoteBoardReader(args.path)
+        except FileNotFoundError:
+            LOG("No quote board found. Start the monitor with '--board' first.")
+            return 1
+        symbols = [s.upper() for s in args.symbols]
+        _print_board(reader, symbols)
+        if args.watch:
+            interval_sec = seconds_from_interval(args.watch)
+            while True:
+                time.sleep(interval_sec)
+                reader.reopen_if_replaced()
+                _print_board(reader, symbols)
+        reader.close()
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        LOG(f"An error occurred: {e}\n{traceback.format_exc()}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
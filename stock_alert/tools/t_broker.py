@@ -0,0 +1,45 @@
+import argparse
+import sys
+import traceback
+from typing import List, Optional
+from stock_alert.common import *
+from stock_alert.core import *
+from stock_alert.data_providers import PROVIDER_CHOICES, get_provider
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for the local quote broker."""
+    parser = argparse.ArgumentParser(prog="stock-alert broker",
+                                     description="Fetch quotes once per interval and push them to local subscribers.")
+    parser.add_argument("--interval", default=DEFAULT_MONITOR_INTERVAL,
+                        help=f"Fetch interval, e.g., '30s', '1m' (default: {DEFAULT_MONITOR_INTERVAL})", )
+    parser.add_argument("--provider", default="fake",
+                        help=f"Upstream data provider: {', '.join(p for p in PROVIDER_CHOICES if p != 'broker')} "
+                             f"or a comma-separated failover list (default: fake)", )
+    parser.add_argument("--hedge-after", type=float, default=1.0,
+                        help="Seconds to wait on a provider before also asking the next one (default: 1.0)", )
+    parser.add_argument("--socket", default=None, help="Unix socket path (default: <storage>/run/broker.sock)")
+    args = parser.parse_args(argv)
+
+    broker = None
+    try:
+        if "broker" in args.provider.split(","):
+            raise SystemExit("Error: The broker cannot use itself as upstream provider")
+        provider = get_provider(args.provider, hedge_after_secs=args.hedge_after)
+        broker = QuoteBroker(provider, seconds_from_interval(args.interval), socket_path=args.socket)
+        broker.start()
+        broker.run_forever()
+        return 0
+    except KeyboardInterrupt:
+        LOG("\nBroker stopped by user.")
+        return 130
+    except Exception as e:
+        LOG(f"An error occurred: {e}\n{traceback.format_exc()}", file=sys.stderr)
+        return 1
+    finally:
+        if broker:
+            broker.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
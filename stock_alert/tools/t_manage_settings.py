@@ -1,27 +1,90 @@
 import argparse
 import sys
-from typing import List, Optional
-import json
+import time
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 from stock_alert.common import *
 from stock_alert.core import *
+from stock_alert.data_providers import get_provider
+
+
+def _send_to_daemon(args: argparse.Namespace, cmd: str, cmd_args: Dict[str, Any]) -> bool:
+    """Applies a command through a running monitor daemon. Returns False if none is running (use the file)."""
+    if args.no_daemon or getattr(args, "dry_run", False):
+        return False
+    response = send_control_command(cmd, cmd_args)
+    if response is None:
+        return False
+    if not response.get("ok"):
+        LOG(f"Error: {response.get('error')}", file=sys.stderr)
+        sys.exit(1)
+    for line in response.get("lines", []):
+        LOG(line)
+    return True
+
+
+def _validate_symbols(args: argparse.Namespace, symbols: List[str]) -> List[str]:
+    """Resolves the symbols' metadata through the provider (or the on-disk cache) and drops the ones it does not list.
+
+    Symbols that could not be checked (request failed, provider without metadata) are kept.
+    """
+    meta_cache = SymbolMetaCache(symbol_meta_cache_path(args.provider))
+    report = meta_cache.resolve(get_provider(args.provider), symbols, time.time())
+    for sym in sorted(report.info):
+        LOG(f"- {sym}: {report.info[sym].describe()}")
+    if report.not_found:
+        LOG(f"Error: Not listed by '{args.provider}', not added: {', '.join(report.not_found)}", file=sys.stderr)
+    if report.failed:
+        LOG(f"Warning: Could not validate {', '.join(report.failed)}, adding anyway", log_level=LogLevel.WARNING)
+    return [s for s in symbols if s not in report.not_found]
 
 
 def cmd_watchlist_add(args: argparse.Namespace):
-    """Adds symbols to the watchlist."""
-    symbols = load_watchlist()
-    before = set(symbols)
-    symbols.extend([s.upper() for s in args.symbols])
-    save_watchlist(symbols)
-    added = sorted(set(s.upper() for s in args.symbols) - before)
-    if added:
-        LOG(f"Added to watchlist: {', '.join(added)}")
-    else:
+    """Adds symbols to the watchlist (single config load and atomic write), validating them first with --validate."""
+    symbols = sorted(set(s.upper() for s in args.symbols))
+    if args.validate and not args.dry_run:  # Network lookups are opt-in, and a dry-run stays offline
+        symbols = _validate_symbols(args, symbols)
+        if not symbols:
+            return
+    if _send_to_daemon(args, "watchlist_add", {"symbols": symbols}):
+        return
+    config = load_config()
+    before = set(s.upper() for s in config.get(ALERT_FIELD_WATCHLIST, []))
+    added = sorted(set(symbols) - before)
+    if not added:
         LOG("No new symbols added.")
+        return
+    if args.dry_run:
+        LOG(f"[dry-run] Would add to watchlist: {', '.join(added)}")
+        return
+    config[ALERT_FIELD_WATCHLIST] = sorted(before | set(added))
+    save_config(config)
+    LOG(f"Added to watchlist: {', '.join(added)}")
+
 
+def cmd_watchlist_remove(args: argparse.Namespace):
+    """Removes symbols from the watchlist (single config load and atomic write)."""
+    if _send_to_daemon(args, "watchlist_remove", {"symbols": args.symbols}):
+        return
+    config = load_config()
+    before = set(s.upper() for s in config.get(ALERT_FIELD_WATCHLIST, []))
+    removed = sorted(before & set(s.upper() for s in args.symbols))
+    if not removed:
+        LOG("No symbols removed.")
+        return
+    if args.dry_run:
+        LOG(f"[dry-run] Would remove from watchlist: {', '.join(removed)}")
+        return
+    config[ALERT_FIELD_WATCHLIST] = sorted(before - set(removed))
+    save_config(config)
+    LOG(f"Removed from watchlist: {', '.join(removed)}")
 
-def cmd_watchlist_list(_args: argparse.Namespace):
+
+def cmd_watchlist_list(args: argparse.Namespace):
     """Lists all symbols in the watchlist."""
+    if _send_to_daemon(args, "watchlist_list", {}):
+        return
     symbols = load_watchlist()
     if not symbols:
         LOG("Watchlist is empty.")
@@ -31,39 +94,114 @@ def cmd_watchlist_list(_args: argparse.Namespace):
             LOG(f"- {s}")
 
 
+def _commit_alerts(config: Dict[str, Any], new_alerts: Dict[str, Dict], dry_run: bool) -> bool:
+    """Prints the alert diff and, unless dry-run, writes the whole config once (atomically).
+
+    Returns True if anything changed.
+    """
+    old_alerts = config.get(ALERT_CORE_CONFIG_KEY, {})
+    diff_lines = format_alerts_diff(old_alerts, new_alerts)
+    if not diff_lines:
+        LOG("No alert changes.")
+        return False
+    prefix = "[dry-run] " if dry_run else ""
+    added, removed, changed = diff_alerts(old_alerts, new_alerts)
+    if not dry_run:
+        config[ALERT_CORE_CONFIG_KEY] = new_alerts
+        save_config(config)
+    LOG(f"{prefix}Alert changes: {len(added)} added, {len(removed)} removed, {len(changed)} changed")
+    for line in diff_lines:
+        LOG(f"{prefix}{line}")
+    return True
+
+
 def cmd_alert_create(args: argparse.Namespace):
     """Creates a new alert."""
-    alerts = alerts_from_dict(load_alerts())
+    try:
+        other_leg, combine = (args.ratio_to, LegCombine.RATIO) if args.ratio_to else (args.spread_to, LegCombine.SPREAD)
+        legs = [args.symbol.upper(), other_leg.upper()] if other_leg else None
+        alert = Alert.from_condition(args.symbol.upper(), args.when, alert_cooldown_secs=args.cooldown, legs=legs,
+                                     combine=combine if legs else None)
+    except ValueError as e:
+        LOG(f"Error: Invalid condition. {e}", file=sys.stderr)
+        sys.exit(1)
+    if _send_to_daemon(args, "alert_create", {"name": args.name, "alert": alert.to_dict()}):
+        return
+
+    config = load_config()
+    alerts = dict(config.get(ALERT_CORE_CONFIG_KEY, {}))
     if args.name in alerts:
         LOG(f"Error: Alert with name '{args.name}' already exists.", file=sys.stderr)
         sys.exit(1)
 
-    try:
-        kind, op, value = parse_condition(args.when)
-        alert = Alert(symbol=args.symbol.upper(), kind=kind, op=op, value=value, alert_cooldown_secs=args.cooldown, )
-        alerts[alert.name] = alert
-        save_alerts(alerts_to_dict(alerts))
-        LOG(f"Created alert '{alert.name}' for {alert.symbol}: {kind.value} {op.value} {value}")
-    except ValueError as e:
-        LOG(f"Error: Invalid condition. {e}", file=sys.stderr)
+    alerts[args.name] = alert.to_dict()
+    config[ALERT_CORE_CONFIG_KEY] = alerts
+    save_config(config)
+    LOG(f"Created alert '{args.name}' for {alert.symbol}: {alert.describe()}")
+
+
+def cmd_alert_delete(args: argparse.Namespace):
+    """Deletes one or more alerts in a single write."""
+    if _send_to_daemon(args, "alert_delete", {"names": args.names}):
+        return
+    config = load_config()
+    alerts = dict(config.get(ALERT_CORE_CONFIG_KEY, {}))
+    missing = sorted(set(args.names) - set(alerts))
+    if missing:
+        LOG(f"Error: Unknown alert(s): {', '.join(missing)}", file=sys.stderr)
+        sys.exit(1)
+    for name in args.names:
+        alerts.pop(name, None)
+    _commit_alerts(config, alerts, args.dry_run)
+
+
+def cmd_alert_import(args: argparse.Namespace):
+    """Imports alerts from CSV/JSONL. Everything is validated before a single atomic write."""
+    fmt = detect_alert_format(args.file, args.format)
+    if args.file == "-":
+        rows = read_alert_rows(sys.stdin, fmt)
+    else:
+        with open(args.file, "r", encoding="utf-8", newline="") as f:
+            rows = read_alert_rows(f, fmt)
+
+    imported, errors = validate_alert_rows(rows)
+    if errors:
+        LOG(f"Error: {len(errors)} invalid row(s) in {args.file}, nothing was written:", file=sys.stderr)
+        for err in errors:
+            LOG(f"  {err}", file=sys.stderr)
         sys.exit(1)
 
-def parse_condition(cond: str) -> Tuple[AlertKind, Operation, float]:
-    _KINDS_PATTERN = "|".join(k.value for k in AlertKind)
-    ALERT_RE = re.compile(rf"^({_KINDS_PATTERN})\s*(>=|<=)\s*(-?\d+(?:\.\d+)?)$", re.IGNORECASE, )
-    m = ALERT_RE.match(cond.strip())
-    if not m:
-        raise ValueError(
-            f"Condition must be like: '{AlertKind.PRICE_VALUE.value} >= 200', '{AlertKind.PCT_DAY.value} <= -3', "
-            f"'{AlertKind.VOLUME.value} >= 1000000', '{AlertKind.PRICE_PERCENT_OFFSET_SINCE_LAST_ALERT.value} >= 5', "
-        )
-    kind_s, op_s, value = m.group(1).lower(), m.group(2), float(m.group(3))
-    kind = AlertKind(kind_s)
-    op = Operation(op_s)
-    return kind, op, value
-
-def cmd_alerts_list(_args: argparse.Namespace):
-    """Lists all configured alerts."""
+    config = load_config()
+    existing = config.get(ALERT_CORE_CONFIG_KEY, {})
+    if args.replace:
+        new_alerts = imported
+    else:
+        conflicts = sorted(name for name in imported if name in existing and existing[name] != imported[name])
+        if conflicts and not args.overwrite:
+            LOG(f"Error: {len(conflicts)} alert(s) already exist with different settings (use --overwrite or --replace): "
+                f"{', '.join(conflicts)}", file=sys.stderr)
+            sys.exit(1)
+        new_alerts = {**existing, **imported}
+    LOG(f"Read {len(imported)} alert(s) from {args.file} ({fmt})")
+    _commit_alerts(config, new_alerts, args.dry_run)
+
+
+def cmd_alert_export(args: argparse.Namespace):
+    """Exports all alerts to CSV/JSONL (stdout when no file is given)."""
+    alerts = load_alerts()
+    fmt = detect_alert_format(args.file, args.format)
+    if args.file == "-":
+        write_alerts(sys.stdout, alerts, fmt)
+        return
+    with open(args.file, "w", encoding="utf-8", newline="") as f:
+        count = write_alerts(f, alerts, fmt)
+    LOG(f"Exported {count} alert(s) to {args.file} ({fmt})")
+
+
+def cmd_alerts_list(args: argparse.Namespace):
+    """Lists all configured alerts (with live trigger state when a monitor daemon is running)."""
+    if _send_to_daemon(args, "alerts_list", {}):
+        return
     alerts = alerts_from_dict(load_alerts())
     if not alerts:
         LOG("No alerts defined.")
@@ -72,22 +210,12 @@ def cmd_alerts_list(_args: argparse.Namespace):
     # Load cache data to get last trigger timestamps
     config = load_config()
     cache_config = CacheConfig.from_dict(config.get(CACHE_CORE_CONFIG_KEY, {}))
-    cache_file = Path(cache_config.directory) / cache_config.file_name
-
-    cache_data = {}
-    if cache_file.exists():
-        try:
-            with open(cache_file, "r") as f:
-                cache_data = json.load(f)
-        except Exception:
-            pass
-
-    last_trigger_ts = cache_data.get("last_alert_trigger_ts", {})
+    last_trigger_ts = load_cache(cache_config).get(CACHE_FIELD_LAST_ALERTS_TRIGGER_TS, {})
 
     LOG("Alerts:")
     for name, a in sorted(alerts.items()):
         last = last_trigger_ts.get(name, "never")
-        LOG(f"- {name}: {a.symbol} | {a.kind.value} {a.op.value} {a.value} | cooldown {a.alert_cooldown_secs}s | last {last}")
+        LOG(f"- {name}: {a.symbol} | {a.describe()} | cooldown {a.alert_cooldown_secs}s | last {last}")
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -95,6 +223,12 @@ def main(argv: Optional[List[str]] = None) -> int:
     parser = argparse.ArgumentParser(
         prog="stock-alert manage", description="Tool to manage watchlists and alerts."
     )
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="Edit the config file directly even if a monitor daemon is running")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the command with cProfile and a stack sampler (.pstats + collapsed stacks)")
+    parser.add_argument("--profile-dir", default=None,
+                        help=f"Output directory for --profile (default: <storage>/{PROFILE_DEFAULT_DIR_REL_PATH_VS_STORAGE})")
     sub = parser.add_subparsers(dest="cmd")
 
     # Watchlist commands
@@ -102,7 +236,17 @@ def main(argv: Optional[List[str]] = None) -> int:
     sub_w = p_w.add_subparsers(dest="subcmd_watchlist", required=True)
     p_w_add = sub_w.add_parser("add", help="Add symbols to watchlist")
     p_w_add.add_argument("symbols", nargs="+", help="One or more stock symbols (e.g., AAPL TSLA)")
+    p_w_add.add_argument("--dry-run", action="store_true", help="Show the change without writing")
+    p_w_add.add_argument("--provider", default=SYMBOL_META_VALIDATE_DEFAULT_PROVIDER,
+                         help="Provider used by --validate (default: %(default)s)")
+    p_w_add.add_argument("--validate", action="store_true",
+                         help="Look the symbols up with --provider first: reject unknown ones and cache their exchange, "
+                              "currency and trading hours for the monitor's --skip-closed-markets")
     p_w_add.set_defaults(func=cmd_watchlist_add)
+    p_w_remove = sub_w.add_parser("remove", help="Remove symbols from watchlist")
+    p_w_remove.add_argument("symbols", nargs="+", help="One or more stock symbols")
+    p_w_remove.add_argument("--dry-run", action="store_true", help="Show the change without writing")
+    p_w_remove.set_defaults(func=cmd_watchlist_remove)
     p_w_list = sub_w.add_parser("list", help="List all symbols in the watchlist")
     p_w_list.set_defaults(func=cmd_watchlist_list)
 
@@ -112,11 +256,35 @@ def main(argv: Optional[List[str]] = None) -> int:
     p_a_create = sub_a.add_parser("create", help="Create a new alert")
     p_a_create.add_argument("--symbol", required=True, help="Stock symbol for the alert")
     p_a_create.add_argument(
-        "--when", required=True, help="Condition string, e.g., 'price_value >= 200', 'pct_day <= -3', 'volume >= 1000000', 'last_alert_price_offset_percent >= 5', 'last_alert_price_value >= 150'", )
+        "--when", required=True, help="Condition string, e.g., 'price_value >= 200', 'price_percent_day <= -3', 'volume >= 1000000', "
+                                      "'price_percent_offset_since_last_alert >= 5', or a composite condition with and/or and "
+                                      "parentheses over price, pct_day, volume, offset, pct_offset, e.g. "
+                                      "'price >= 200 and (pct_day <= -3 or volume > 5e6)'", )
+    p_a_legs = p_a_create.add_mutually_exclusive_group()
+    p_a_legs.add_argument("--ratio-to", metavar="SYMBOL", default=None,
+                          help="Evaluate --when on SYMBOL_A/SYMBOL_B (e.g. --symbol GLD --ratio-to BTC-USD --when 'price >= 0.03')")
+    p_a_legs.add_argument("--spread-to", metavar="SYMBOL", default=None,
+                          help="Evaluate --when on SYMBOL_A - SYMBOL_B (e.g. --symbol XOM --spread-to CVX --when 'price <= -40')")
     p_a_create.add_argument("--name", required=True, help="A unique name for the alert")
     p_a_create.add_argument("--cooldown", type=int, default=DEFAULT_COOLDOWN_SEC,
                             help=f"Trigger cooldown in seconds (default: {DEFAULT_COOLDOWN_SEC})", )
     p_a_create.set_defaults(func=cmd_alert_create)
+    p_a_delete = sub_a.add_parser("delete", help="Delete one or more alerts")
+    p_a_delete.add_argument("names", nargs="+", help="Alert names to delete")
+    p_a_delete.add_argument("--dry-run", action="store_true", help="Show the diff without writing")
+    p_a_delete.set_defaults(func=cmd_alert_delete)
+    format_choices = [ALERT_IO_FORMAT_CSV, ALERT_IO_FORMAT_JSONL]
+    p_a_import = sub_a.add_parser("import", help="Bulk import alerts from a CSV/JSONL file")
+    p_a_import.add_argument("file", help=f"Input file ('-' for stdin). CSV columns: {','.join(ALERT_IO_CSV_COLUMNS)}")
+    p_a_import.add_argument("--format", choices=format_choices, default=None, help="File format (default: from extension)")
+    p_a_import.add_argument("--dry-run", action="store_true", help="Validate and show the diff without writing")
+    p_a_import.add_argument("--overwrite", action="store_true", help="Allow changing existing alerts with the same name")
+    p_a_import.add_argument("--replace", action="store_true", help="Replace all existing alerts with the imported set")
+    p_a_import.set_defaults(func=cmd_alert_import)
+    p_a_export = sub_a.add_parser("export", help="Export alerts to a CSV/JSONL file")
+    p_a_export.add_argument("file", nargs="?", default="-", help="Output file (default: stdout)")
+    p_a_export.add_argument("--format", choices=format_choices, default=None, help="File format (default: from extension)")
+    p_a_export.set_defaults(func=cmd_alert_export)
 
     # Top-level 'alerts' to list all
     p_as_list = sub.add_parser("alerts", help="List all configured alerts")
@@ -127,12 +295,20 @@ def main(argv: Optional[List[str]] = None) -> int:
         parser.print_help()
         return 1
 
+    profiler = None
+    if args.profile:
+        directory = args.profile_dir or str(Path(DEFAULT_STORAGE_DIR_PATH) / PROFILE_DEFAULT_DIR_REL_PATH_VS_STORAGE)
+        profiler = TickProfiler(directory, label=f"manage-{args.cmd}", every_ticks=1)
     try:
-        args.func(args)
+        with profiler.tick() if profiler else nullcontext():
+            args.func(args)
         return 0
     except Exception as e:
         LOG(f"An error occurred: {e}", file=sys.stderr)
         return 1
+    finally:
+        if profiler:
+            profiler.close()
 
 
 if __name__ == "__main__":
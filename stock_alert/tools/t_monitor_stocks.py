@@ -1,24 +1,136 @@
 import argparse
 import sys
 import traceback
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from stock_alert.common import *
 from stock_alert.data_providers import *
 from stock_alert.core import *
 
 
-def _get_provider(name: str) -> DataProvider:
-    """Initializes and returns the specified data provider."""
-    name = (name or "fake").lower()
-    if name == "fake":
-        return FakeDataProvider()
-    if name in ("yahoo", "yfinance", "yahoo_finance"):
-        return YahooFinanceProvider()
-    if name in ("alpha", "alphavantage", "alpha_vantage"):
-        return AlphaVantageProvider()
-    if name in ("finnhub",):
-        return FinnhubProvider()
-    raise SystemExit(f"Error: Unknown provider '{name}'")
+VIRTUAL_CLOCK_PROVIDERS = ["fake", "sim", "simulated", "replay"]  # Offline: safe to poll without real waits
+
+
+def _make_clock(args: argparse.Namespace) -> Clock:
+    """The wall clock, or with --virtual-clock simulated time (starting at the first recorded tick for replays)."""
+    if not args.virtual_clock:
+        return SYSTEM_CLOCK
+    names = {n.strip().lower() for n in args.provider.split(",") if n.strip()}
+    if not names <= set(VIRTUAL_CLOCK_PROVIDERS):
+        raise SystemExit(f"Error: --virtual-clock needs an offline provider ({', '.join(VIRTUAL_CLOCK_PROVIDERS)}), "
+                         f"not '{args.provider}'")
+    start_ts = None
+    if "replay" in names and args.replay_from:
+        first_tick = next(iter_quote_logs(args.replay_from), None)
+        start_ts = first_tick[0] if first_tick else None
+    clock = VirtualClock(start_ts)
+    set_log_time_fn(clock.time)
+    return clock
+
+
+def _tick_outputs(args: argparse.Namespace, provider: DataProvider,
+                  clock: Clock) -> Tuple[Optional[QuoteRecorder], Optional[QuoteBoardWriter], Callable]:
+    """Opens the --record / --board outputs and returns them with the on_tick callback feeding them."""
+    recorder = None
+    if args.record is not None:
+        record_dir = args.record or str(Path(DEFAULT_STORAGE_DIR_PATH) / QUOTE_LOG_DEFAULT_DIR_REL_PATH_VS_STORAGE)
+        recorder = QuoteRecorder(record_dir, max_file_bytes=int(args.record_max_mb * 1024 * 1024))
+        LOG(f"Recording ticks to {record_dir}")
+
+    board = None
+    if args.board is not None:
+        board = QuoteBoardWriter(args.board or None)
+        LOG(f"Publishing quotes to board {board.path}")
+
+    def on_tick(quotes):
+        tick_ts = clock.time()
+        if board:
+            board.publish(tick_ts, quotes.values())
+        if recorder:
+            recorder.record(tick_ts, quotes.values())
+        if args.verbose:
+            for sym, q in quotes.items():
+                LOG(f"{sym:<6}: price=${q.price:<8.2f} | % day={q.pct_day:<6.2f} | vol={q.volume}")
+            if isinstance(provider, CompositeDataProvider):
+                LOG(f"Providers: {provider.health_summary()}")
+
+    return recorder, board, on_tick
+
+
+def _warm_start(args: argparse.Namespace, provider: DataProvider, symbols: List[str],
+                targets: List[Tuple[Dict[str, Alert], CacheConfig]], clock: Clock) -> None:
+    """Fills the intraday bar cache (fetching only what is missing) and seeds alert history from it."""
+    bar_cache = BarCache(str(Path(DEFAULT_STORAGE_DIR_PATH) / BAR_CACHE_DEFAULT_DIR_REL_PATH_VS_STORAGE),
+                         seconds_from_interval(args.bar_interval))
+    LOG(f"Warm start: {args.warm_start} day(s) of {args.bar_interval} bars for {len(symbols)} symbol(s)...",
+        log_level=LogLevel.INFO)
+    report = warm_start(provider, symbols, targets, bar_cache, days=args.warm_start, now_ts=clock.time())
+    LOG(f"Warm start: {report.summary()}", log_level=LogLevel.INFO)
+
+
+def _resolve_symbol_info(args: argparse.Namespace, provider: DataProvider, symbols: List[str],
+                         clock: Clock) -> Dict[str, SymbolInfo]:
+    """Metadata for --skip-closed-markets, from the on-disk cache where fresh (symbols added later are always fetched)."""
+    meta_cache = SymbolMetaCache(symbol_meta_cache_path(args.provider))
+    now_ts = clock.time()
+    report = meta_cache.resolve(provider, symbols, now_ts)
+    LOG(f"Symbol metadata: {report.summary()}", log_level=LogLevel.INFO)
+    if report.not_found:
+        LOG(f"Warning: Not listed by '{args.provider}': {', '.join(report.not_found)}", log_level=LogLevel.WARNING)
+    closed = closed_symbols(symbols, report.info, now_ts)
+    if closed:
+        LOG(f"Market closed for {len(closed)} symbol(s), not fetched until it opens: {', '.join(sorted(closed))}",
+            log_level=LogLevel.INFO)
+    return report.info
+
+
+def _make_profiler(args: argparse.Namespace) -> Optional[TickProfiler]:
+    if not args.profile:
+        return None
+    directory = args.profile_dir or str(Path(DEFAULT_STORAGE_DIR_PATH) / PROFILE_DEFAULT_DIR_REL_PATH_VS_STORAGE)
+    LOG(f"Profiling one tick out of every {args.profile_every} into {directory}", log_level=LogLevel.INFO)
+    return TickProfiler(directory, label="monitor", every_ticks=args.profile_every)
+
+
+def _monitor_profiles(args: argparse.Namespace, provider: DataProvider, profiles: List[MonitorProfile],
+                      clock: Clock) -> int:
+    """Runs several config profiles in this process with one shared fetch per tick."""
+    symbols = sorted(set().union(*(p.symbols() for p in profiles)))
+    if not symbols:
+        LOG("Nothing to monitor in the selected profiles.")
+        return 0
+    LOG(f"Starting monitor for {len(profiles)} profile(s) using '{args.provider}' provider, {len(symbols)} shared "
+        f"symbol(s): {', '.join(symbols)}", log_level=LogLevel.INFO)
+    for profile in profiles:
+        LOG(f"- {profile.name}: {len(profile.alerts)} alert(s), {len(profile.symbols())} symbol(s), cache "
+            f"{Path(profile.cache_config.directory) / profile.cache_config.file_name}"
+            + ("" if profile.notify else ", notifications off"), log_level=LogLevel.INFO)
+    LOG(f"Interval: {args.interval}, Iterations: {args.iterations or '∞'}", log_level=LogLevel.INFO)
+    if args.warm_start:
+        _warm_start(args, provider, symbols, [(p.alerts, p.cache_config) for p in profiles], clock)
+    symbol_info = _resolve_symbol_info(args, provider, symbols, clock) if args.skip_closed_markets else None
+
+    recorder, board, on_tick = _tick_outputs(args, provider, clock)
+    profiler = _make_profiler(args)
+
+    def on_alert(profile: MonitorProfile, alert_key, alert: Alert, q, reason):
+        LOG(f"{ALERT_LOG_TAG} [{profile.name}] {alert_key}. Current price=${q.price}, % day={q.pct_day}, vol={q.volume}",
+            log_level=LogLevel.INFO)
+        if profile.notify:
+            show_noti(title=f"[{profile.name}] {alert.name}", message=f"{reason}")
+
+    try:
+        run_profiles_loop(provider=provider, profiles=profiles, interval_str=args.interval, iterations=args.iterations,
+                          on_alert=on_alert, on_tick=on_tick, skip_cooling_symbols=args.skip_cooling_symbols,
+                          clock=clock, profiler=profiler, symbol_info=symbol_info)
+    finally:
+        if profiler:
+            profiler.close()
+        if recorder:
+            recorder.close()
+        if board:
+            board.close()
+    LOG("Monitoring finished.", log_level=LogLevel.INFO)
+    return 0
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -31,8 +143,60 @@ def main(argv: Optional[List[str]] = None) -> int:
                         help="Stop after N iterations (default: runs forever)", )
     parser.add_argument("--verbose", action="store_true", help="Print quotes on every check")
     parser.add_argument("--provider", default="fake",
-                        choices=["fake", "yahoo", "alphavantage", "finnhub"], help="Data provider to use (default: fake)", )
+                        help=f"Data provider to use: {', '.join(PROVIDER_CHOICES)} (default: fake). "
+                             f"A comma-separated list (e.g. 'finnhub,yahoo') enables hedged requests with failover.", )
+    parser.add_argument("--hedge-after", type=float, default=1.0,
+                        help="Seconds to wait on a provider before also asking the next one (default: 1.0)", )
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Random seed for the 'fake' and 'sim' providers, for reproducible runs", )
+    parser.add_argument("--replay-from", nargs="+", default=None,
+                        help="Quote log file(s) or directories for '--provider replay'", )
+    parser.add_argument("--record", nargs="?", default=None, const="",
+                        help="Append every tick's quotes to binary quote logs in this directory "
+                             f"(default: <storage>/{QUOTE_LOG_DEFAULT_DIR_REL_PATH_VS_STORAGE})", )
+    parser.add_argument("--record-max-mb", type=float, default=QUOTE_LOG_DEFAULT_MAX_FILE_BYTES / (1024 * 1024),
+                        help="Rotate the quote log after this many MB (default: %(default)s)", )
+    parser.add_argument("--board", nargs="?", default=None, const="",
+                        help="Publish the latest quote per symbol to a shared-memory board file for local readers "
+                             f"(default: <storage>/{QUOTE_BOARD_REL_PATH_VS_STORAGE})", )
+    parser.add_argument("--daemon", action="store_true",
+                        help="Serve 'stock-alert manage' commands on a local Unix socket and apply them in memory", )
+    parser.add_argument("--log-level", type=str.upper, choices=[l.value for l in LogLevel], default=None,
+                        help="Drop log messages below this level, e.g. INFO to keep only tick summaries and alerts "
+                             "(default: the logging config's min_level, or DEBUG)", )
+    parser.add_argument("--profiles", default=None,
+                        help="Comma-separated config profiles under <storage>/configs (e.g. 'my_config,test_config') "
+                             "served by this one process: the union of their symbols is fetched once per tick, while "
+                             "each profile keeps its own alerts, cache/history and notifications", )
+    parser.add_argument("--skip-cooling-symbols", action="store_true",
+                        help="Do not fetch symbols whose alerts are all in their cooldown (saves provider calls, but "
+                             "such symbols are then missing from --verbose, --record and --board until one expires)", )
+    parser.add_argument("--warm-start", type=int, nargs="?", default=None, const=WARM_START_DEFAULT_DAYS, metavar="DAYS",
+                        help="Before the first tick, fetch the intraday bars missing from the local bar cache for the "
+                             f"last DAYS calendar days (default: {WARM_START_DEFAULT_DAYS}) and seed the trigger "
+                             "history of offset alerts that have none", )
+    parser.add_argument("--bar-interval", default=BAR_DEFAULT_INTERVAL,
+                        help=f"Bar size for --warm-start, e.g. '1m', '5m' (default: {BAR_DEFAULT_INTERVAL})", )
+    parser.add_argument("--virtual-clock", action="store_true",
+                        help="Run on simulated time: waits between ticks take no real time, so e.g. a day of '1s' ticks "
+                             "runs in seconds with deterministic cooldowns (offline providers only: "
+                             f"{', '.join(VIRTUAL_CLOCK_PROVIDERS)})", )
+    parser.add_argument("--skip-closed-markets", action="store_true",
+                        help="Resolve each symbol's exchange and trading hours (cached on disk for "
+                             f"{SYMBOL_META_DEFAULT_TTL_SECS // 86400} days) and do not fetch symbols whose market is "
+                             "closed; crypto and symbols without known hours are always fetched", )
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile one tick out of every --profile-every with cProfile and a stack sampler; writes "
+                             "a .pstats file and collapsed stacks (flamegraph input) and logs where the time went", )
+    parser.add_argument("--profile-every", type=int, default=PROFILE_DEFAULT_EVERY_TICKS, metavar="N",
+                        help="Profile every Nth tick (1: all ticks; default: %(default)s)", )
+    parser.add_argument("--profile-dir", default=None,
+                        help=f"Output directory for --profile (default: <storage>/{PROFILE_DEFAULT_DIR_REL_PATH_VS_STORAGE})", )
+    parser.add_argument("--no-reload", action="store_true",
+                        help="Do not apply config file changes (alerts/watchlist) while running", )
     args = parser.parse_args(argv)
+    if args.log_level:
+        set_log_min_level(LogLevel(args.log_level))
 
     try:
         config = load_config()
@@ -41,38 +205,73 @@ def main(argv: Optional[List[str]] = None) -> int:
         cache_dir = Path(cache_config.directory)
         cache_dir.mkdir(parents=True, exist_ok=True)
 
-        provider = _get_provider(args.provider)
-        alerts = alerts_from_dict(load_alerts())
+        try:
+            provider = get_provider(args.provider, hedge_after_secs=args.hedge_after, replay_paths=args.replay_from,
+                                    seed=args.seed)
+        except ValueError as e:
+            raise SystemExit(f"Error: {e}")
+        clock = _make_clock(args)
+        if args.profiles:
+            if args.daemon:
+                raise SystemExit("Error: --daemon serves a single config and cannot be combined with --profiles")
+            profiles = load_profiles([p.strip() for p in args.profiles.split(",") if p.strip()],
+                                     reload=not args.no_reload)
+            return _monitor_profiles(args, provider, profiles, clock)
+
+        alerts_payload = config.get(ALERT_CORE_CONFIG_KEY, {})
+        alerts = alerts_from_dict(alerts_payload)
         watchlist_symbols = set(load_watchlist())
-        alert_symbols = {a.symbol for a in alerts.values()}
-        symbols = sorted(alert_symbols | watchlist_symbols)
+        symbols = sorted(alert_symbols(alerts) | watchlist_symbols)
 
         if not symbols:
             LOG("Nothing to monitor. Add symbols via 'stock-alert manage watchlist add'.")
             return 0
 
-        LOG(f"Starting monitor for {len(symbols)} symbol(s) using '{args.provider}' provider... Symbols: {', '.join(symbols)}")
-        LOG(f"Interval: {args.interval}, Iterations: {args.iterations or '∞'}")
+        LOG(f"Starting monitor for {len(symbols)} symbol(s) using '{args.provider}' provider... Symbols: {', '.join(symbols)}",
+            log_level=LogLevel.INFO)
+        LOG(f"Interval: {args.interval}, Iterations: {args.iterations or '∞'}", log_level=LogLevel.INFO)
+        if args.warm_start:
+            _warm_start(args, provider, symbols, [(alerts, cache_config)], clock)
 
-        def on_tick(quotes):
-            if args.verbose:
-                for sym, q in quotes.items():
-                    LOG(f"{sym:<6}: price=${q.price:<8.2f} | % day={q.pct_day:<6.2f} | vol={q.volume}")
+        symbol_info = _resolve_symbol_info(args, provider, symbols, clock) if args.skip_closed_markets else None
+        recorder, board, on_tick = _tick_outputs(args, provider, clock)
+        profiler = _make_profiler(args)
 
         def on_alert(alert_key, alert: Alert, q, reason):
-            LOG(f"{ALERT_LOG_TAG} {alert_key}. Current price=${q.price}, % day={q.pct_day}, vol={q.volume}")
+            LOG(f"{ALERT_LOG_TAG} {alert_key}. Current price=${q.price}, % day={q.pct_day}, vol={q.volume}",
+                log_level=LogLevel.INFO)
             show_noti(title=alert.name, message=f"{reason}")
 
+        state = MonitorState()
+        daemon = None
+        if args.daemon:
+            daemon = config_watcher = MonitorDaemon(config_file_path(), alerts_payload, sorted(watchlist_symbols), state)
+            daemon.start()
+        else:
+            config_watcher = None if args.no_reload else ConfigWatcher(config_file_path(), alerts_payload, sorted(watchlist_symbols))
+
         # Run the monitoring loop
-        run_loop(provider=provider, symbols=symbols, alerts=alerts, cache_config=cache_config,
-                 interval_str=args.interval, iterations=args.iterations, on_alert=on_alert, on_tick=on_tick, )
-        LOG("Monitoring finished.")
+        try:
+            run_loop(provider=provider, symbols=symbols, alerts=alerts, cache_config=cache_config,
+                     interval_str=args.interval, iterations=args.iterations, on_alert=on_alert, on_tick=on_tick,
+                     config_watcher=config_watcher, state=state, skip_cooling_symbols=args.skip_cooling_symbols,
+                     clock=clock, profiler=profiler, symbol_info=symbol_info, )
+        finally:
+            if profiler:
+                profiler.close()
+            if daemon:
+                daemon.stop()
+            if recorder:
+                recorder.close()
+            if board:
+                board.close()
+        LOG("Monitoring finished.", log_level=LogLevel.INFO)
         return 0
     except KeyboardInterrupt:
         LOG("\nMonitoring stopped by user.")
         return 130
     except Exception as e:
-        LOG(f"An error occurred: {e}\n{traceback.format_exc()}", file=sys.stderr)
+        LOG(f"An error occurred: {e}\n{traceback.format_exc()}", file=sys.stderr, log_level=LogLevel.ERROR)
         return 1
 
 
@@ -0,0 +1,62 @@
+import argparse
+import shutil
+import sys
+import tempfile
+import traceback
+from typing import List, Optional
+from stock_alert.common import *
+from stock_alert.core import *
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function for the soak test."""
+    parser = argparse.ArgumentParser(prog="stock-alert soak",
+                                     description="Run the monitor loop for many simulated ticks and report memory growth.")
+    parser.add_argument("--ticks", type=int, default=SOAK_DEFAULT_TICKS,
+                        help="Number of ticks, e.g. 5000000 for a multi-week equivalent (default: %(default)s)")
+    parser.add_argument("--symbols", type=int, default=20, help="Simulated symbols (default: %(default)s)")
+    parser.add_argument("--alerts-per-symbol", type=int, default=3, help="Alerts per symbol (default: %(default)s)")
+    parser.add_argument("--samples", type=int, default=SOAK_DEFAULT_SAMPLES, help="Memory samples (default: %(default)s)")
+    parser.add_argument("--tick-secs", type=float, default=SOAK_DEFAULT_TICK_SECS,
+                        help="Simulated seconds between ticks; e.g. 86400 ticks of 1s cover a trading day of cooldowns "
+                             "(default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=1, help="Market simulation seed (default: %(default)s)")
+    parser.add_argument("--max-history", type=int, default=DEFAULT_MAX_HISTORY_PER_ALERT,
+                        help="Trigger records kept per alert (the cache's max_history_per_alert, default: %(default)s)")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Also trace allocations and report the sites that grew most (slows the run down a lot)")
+    parser.add_argument("--report", default=None, help="Write all samples to this CSV file")
+    args = parser.parse_args(argv)
+
+    cache_dir = tempfile.mkdtemp(prefix="stockalert-soak-")
+    try:
+        cache_config = CacheConfig(file_name="soak_cache.json", directory=cache_dir, max_files=3,
+                                   max_file_size=1024 * 1024, max_history_per_alert=args.max_history)
+        LOG(f"Soak: {args.ticks:,} tick(s), {args.symbols} symbol(s) x {args.alerts_per_symbol} alert(s), "
+            f"max history {args.max_history}/alert, cache in {cache_dir}")
+
+        def on_sample(sample: SoakSample) -> None:
+            rss = f"{sample.rss_bytes / 1e6:.1f} MB" if sample.rss_bytes else "n/a"
+            LOG(f"tick {sample.tick:,}: rss {rss}, history records {sample.structures['cache.history_records']:,}, "
+                f"cache files {sample.structures['cache.files_bytes']:,} B")
+
+        report = run_soak(cache_config, ticks=args.ticks, symbols=args.symbols, alerts_per_symbol=args.alerts_per_symbol,
+                          samples=args.samples, seed=args.seed, trace_allocations=args.tracemalloc,
+                          on_sample=on_sample, tick_secs=args.tick_secs)
+        for line in report.summary_lines():
+            LOG(line)
+        if args.report:
+            write_soak_samples(report, args.report)
+            LOG(f"Samples written to {args.report}")
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        LOG(f"An error occurred: {e}\n{traceback.format_exc()}", file=sys.stderr)
+        return 1
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+import pytest
+
+from stock_alert.common import *
+
+set_log_min_level(LogLevel.WARNING)  # The per-alert DEBUG lines of check_alerts are only noise here
+
+
+@pytest.fixture
+def cache_config(tmp_path):
+    directory = tmp_path / "cache"
+    directory.mkdir()
+    return CacheConfig(file_name="cache.json", directory=str(directory), max_files=3, max_file_size=1 << 30,
+                       max_history_per_alert=3, serializer=CACHE_SERIALIZER_MARSHAL)
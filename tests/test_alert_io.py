@@ -0,0 +1,128 @@
+import io
+
+import pytest
+
+from stock_alert.common import *
+from stock_alert.core.alert_io import (detect_alert_format, diff_alerts, format_alerts_diff, read_alert_rows,
+                                       validate_alert_rows, write_alerts)
+
+CSV_TEXT = """name,symbol,kind,op,value,condition,alert_min_cooldown_secs,legs,combine
+aapl-high, aapl ,price_value,>=,200,,60,,
+dip,MSFT,condition,,,price >= 300 AND pct_day <= -3,,,
+ratio,GLD/BTC-USD,price_value,<=,0.01,,,"gld, btc-usd",ratio
+"""
+
+JSONL_TEXT = """# exported alerts
+{"name": "aapl-high", "symbol": "aapl", "kind": "price_value", "op": ">=", "value": 200, "alert_min_cooldown_secs": 60}
+
+{"name": "dip", "symbol": "MSFT", "kind": "condition", "condition": "price >= 300 AND pct_day <= -3"}
+{"name": "ratio", "symbol": "GLD/BTC-USD", "kind": "price_value", "op": "<=", "value": 0.01, "legs": ["gld", "btc-usd"], "combine": "ratio"}
+"""
+
+
+def _validate(text, fmt):
+    return validate_alert_rows(read_alert_rows(io.StringIO(text), fmt))
+
+
+@pytest.mark.parametrize("path, fmt, expected", [
+    ("alerts.csv", None, ALERT_IO_FORMAT_CSV),
+    ("ALERTS.CSV", None, ALERT_IO_FORMAT_CSV),
+    ("alerts.jsonl", None, ALERT_IO_FORMAT_JSONL),
+    ("alerts.txt", None, ALERT_IO_FORMAT_JSONL),
+    ("alerts.txt", "CSV", ALERT_IO_FORMAT_CSV),
+])
+def test_detect_format(path, fmt, expected):
+    assert detect_alert_format(path, fmt) == expected
+
+
+def test_csv_and_jsonl_import_the_same_alerts():
+    from_csv, csv_errors = _validate(CSV_TEXT, ALERT_IO_FORMAT_CSV)
+    from_jsonl, jsonl_errors = _validate(JSONL_TEXT, ALERT_IO_FORMAT_JSONL)
+    assert csv_errors == [] and jsonl_errors == []
+    assert from_csv == from_jsonl
+    assert from_csv["aapl-high"] == {ALERT_FIELD_SYMBOL: "AAPL", ALERT_FIELD_KIND: "price_value", ALERT_FIELD_OP: ">=",
+                                     ALERT_FIELD_VALUE: 200.0, ALERT_FIELD_ALERT_COOLDOWN: 60}
+    assert from_csv["dip"][ALERT_FIELD_CONDITION] == "price >= 300 and pct_day <= -3"
+    assert from_csv["dip"][ALERT_FIELD_ALERT_COOLDOWN] == DEFAULT_COOLDOWN_SEC
+    assert from_csv["ratio"][ALERT_FIELD_LEGS] == ["GLD", "BTC-USD"]
+    assert from_csv["ratio"][ALERT_FIELD_SYMBOL] == "GLD/BTC-USD"
+
+
+def test_csv_line_numbers_count_the_header():
+    rows = read_alert_rows(io.StringIO(CSV_TEXT), ALERT_IO_FORMAT_CSV)
+    assert [line_no for line_no, _ in rows] == [2, 3, 4]
+
+
+def test_jsonl_skips_blank_and_comment_lines():
+    rows = read_alert_rows(io.StringIO(JSONL_TEXT), ALERT_IO_FORMAT_JSONL)
+    assert [line_no for line_no, _ in rows] == [2, 4, 5]
+
+
+def test_jsonl_errors_are_reported_per_line():
+    text = "\n".join([
+        '{"name": "ok", "symbol": "AAA", "kind": "volume", "op": ">=", "value": 10}',
+        '{"name": "broken", ',
+        '["not", "an", "object"]',
+        '{"symbol": "AAA", "kind": "volume", "op": ">=", "value": 10}',
+        '{"name": "ok", "symbol": "BBB", "kind": "volume", "op": ">=", "value": 10}',
+        '{"name": "no-kind", "symbol": "AAA", "op": ">=", "value": 10}',
+        '{"name": "bad-kind", "symbol": "AAA", "kind": "nope", "op": ">=", "value": 10}',
+        '{"name": "no-value", "symbol": "AAA", "kind": "volume", "op": ">="}',
+        '{"name": "bad-value", "symbol": "AAA", "kind": "volume", "op": ">=", "value": "abc"}',
+        '{"name": "no-condition", "symbol": "AAA", "kind": "condition"}',
+        '{"name": "bad-condition", "symbol": "AAA", "kind": "condition", "condition": "price >>= 1"}',
+        '{"name": "one-leg", "kind": "price_value", "op": "<=", "value": 1, "legs": ["GLD"], "combine": "ratio"}',
+        '{"name": "bad-combine", "kind": "price_value", "op": "<=", "value": 1, "legs": ["A", "B"], "combine": "x"}',
+    ])
+    alerts, errors = _validate(text, ALERT_IO_FORMAT_JSONL)
+    assert list(alerts) == ["ok"]
+    assert alerts["ok"][ALERT_FIELD_SYMBOL] == "AAA"  # The duplicate does not replace the first row
+    assert [e.split(":")[0] for e in errors] == [f"line {n}" for n in range(2, 14)]
+    assert errors[0].startswith("line 2: invalid JSON")
+    assert errors[1] == "line 3: expected a JSON object"
+    assert errors[2] == f"line 4: missing '{ALERT_FIELD_NAME}'"
+    assert errors[3] == "line 5: duplicate alert name 'ok'"
+    assert errors[4] == f"line 6: missing field '{ALERT_FIELD_KIND}'"
+    assert errors[6] == f"line 8: missing field '{ALERT_FIELD_VALUE}'"
+
+
+def test_csv_errors_are_reported_per_line():
+    text = ("name,symbol,kind,op,value\n"
+            "ok,AAA,volume,>=,10\n"
+            ",AAA,volume,>=,10\n"
+            "bad-op,AAA,volume,=>,10\n"
+            "no-value,AAA,volume,>=,\n")
+    alerts, errors = _validate(text, ALERT_IO_FORMAT_CSV)
+    assert list(alerts) == ["ok"]
+    assert [e.split(":")[0] for e in errors] == ["line 3", "line 4", "line 5"]
+
+
+def test_unsupported_format():
+    with pytest.raises(ValueError):
+        read_alert_rows(io.StringIO(""), "xml")
+    with pytest.raises(ValueError):
+        write_alerts(io.StringIO(), {}, "xml")
+
+
+@pytest.mark.parametrize("fmt", [ALERT_IO_FORMAT_CSV, ALERT_IO_FORMAT_JSONL])
+def test_write_read_round_trip(fmt):
+    alerts, errors = _validate(JSONL_TEXT, ALERT_IO_FORMAT_JSONL)
+    assert errors == []
+    out = io.StringIO()
+    assert write_alerts(out, alerts, fmt) == len(alerts)
+    assert _validate(out.getvalue(), fmt) == (alerts, [])
+
+
+def test_diff():
+    old, _ = _validate(JSONL_TEXT, ALERT_IO_FORMAT_JSONL)
+    new = {k: dict(v) for k, v in old.items() if k != "ratio"}
+    new["dip"][ALERT_FIELD_ALERT_COOLDOWN] = 30
+    new["vol"] = {ALERT_FIELD_SYMBOL: "AAA", ALERT_FIELD_KIND: "volume", ALERT_FIELD_OP: ">=", ALERT_FIELD_VALUE: 10.0,
+                  ALERT_FIELD_ALERT_COOLDOWN: 60}
+    assert diff_alerts(old, new) == (["vol"], ["ratio"], ["dip"])
+    assert diff_alerts(old, old) == ([], [], [])
+    lines = format_alerts_diff(old, new)
+    assert lines[0] == "+ vol: AAA | volume >= 10.0 | cooldown 60s"
+    assert lines[1].startswith("- ratio: GLD/BTC-USD | price_value <= 0.01")
+    assert lines[2].startswith("~ dip: MSFT | price >= 300 and pct_day <= -3 | cooldown 300s -> ")
+    assert lines[2].endswith("cooldown 30s")
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from stock_alert.common import *
+from stock_alert.core.backtest import QuoteSeries, load_series, run_backtest, save_series_qlog
+
+
+def _write_csv(path, rows):
+    lines = ["ts,symbol,price,pct_day,volume"] + [f"{ts},{sym},{price},{pct},{vol}" for ts, sym, price, pct, vol in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def _triggers(series, alerts, engine):
+    return [(t.ts, t.alert_key, t.price, t.reason) for t in run_backtest(series, alerts, engine=engine).triggers]
+
+
+def _alerts():
+    return {
+        "aaa-ge": Alert("AAA", AlertKind.PRICE_VALUE, Operation.GE, 100.0, alert_cooldown_secs=100),
+        "aaa-le": Alert("AAA", AlertKind.PRICE_VALUE, Operation.LE, 95.0, alert_cooldown_secs=30),
+        "aaa-pct": Alert("AAA", AlertKind.PCT_DAY, Operation.GE, 1.0, alert_cooldown_secs=50),
+        "bbb-vol": Alert("BBB", AlertKind.VOLUME, Operation.GE, 5000.0, alert_cooldown_secs=60),
+        "bbb-offset": Alert("BBB", AlertKind.PRICE_PERCENT_OFFSET_SINCE_LAST_ALERT, Operation.GE, 2.0,
+                            alert_cooldown_secs=20),
+    }
+
+
+def _random_rows(n=400, seed=7):
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        for sym in ("AAA", "BBB"):
+            rows.append((10 * i, sym, round(rnd.uniform(90, 110), 2), round(rnd.uniform(-3, 3), 2),
+                         rnd.randint(0, 10000)))
+    return rows
+
+
+def test_out_of_order_rows_are_sorted(tmp_path):
+    path = _write_csv(tmp_path / "q.csv", [(10, "AAA", 101, 0, 0), (1000, "AAA", 101, 0, 0), (20, "AAA", 101, 0, 0)])
+    series = load_series([path])
+    assert list(series["AAA"].ts) == [10.0, 20.0, 1000.0]
+    alerts = {"a": Alert("AAA", AlertKind.PRICE_VALUE, Operation.GE, 100.0, alert_cooldown_secs=100)}
+    fast, reference = _triggers(series, alerts, "fast"), _triggers(series, alerts, "reference")
+    assert [t[0] for t in fast] == [10.0, 1000.0]
+    assert fast == reference
+
+
+def test_engines_agree_on_shuffled_csv(tmp_path):
+    rows = _random_rows()
+    random.Random(1).shuffle(rows)
+    series = load_series([_write_csv(tmp_path / "q.csv", rows)])
+    fast = _triggers(series, _alerts(), "fast")
+    assert fast
+    assert fast == _triggers(series, _alerts(), "reference")
+
+
+@pytest.mark.parametrize("fmt", ["csv", "qlog"])
+def test_engines_agree_on_multi_file_input_in_reverse_order(tmp_path, fmt):
+    rows = _random_rows()
+    half = len(rows) // 2
+    paths = []
+    for i, chunk in enumerate((rows[half:], rows[:half])):  # Later file first
+        csv_path = _write_csv(tmp_path / f"part{i}.csv", chunk)
+        if fmt == "qlog":
+            qlog_path = str(tmp_path / f"part{i}{QUOTE_LOG_FILE_EXT}")
+            save_series_qlog(load_series([csv_path]), qlog_path)
+            (tmp_path / f"part{i}.csv").unlink()
+            paths.append(qlog_path)
+        else:
+            paths.append(csv_path)
+    series = load_series(paths)
+    whole = load_series([_write_csv(tmp_path / "whole.csv", rows)])
+    assert {sym: list(s.ts) for sym, s in series.items()} == {sym: list(s.ts) for sym, s in whole.items()}
+    fast = _triggers(series, _alerts(), "fast")
+    assert fast == _triggers(series, _alerts(), "reference")
+    assert fast == _triggers(whole, _alerts(), "fast")
+
+
+def test_sort_by_ts_is_stable():
+    s = QuoteSeries()
+    for ts, price in [(3, 1.0), (1, 2.0), (3, 3.0), (2, 4.0)]:
+        s.append(ts, price, 0.0, 0)
+    s.sort_by_ts()
+    assert list(s.ts) == [1, 2, 3, 3]
+    assert list(s.price) == [2.0, 4.0, 1.0, 3.0]
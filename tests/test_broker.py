@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+
+from stock_alert.common import *
+from stock_alert.core.broker import QuoteBroker
+from stock_alert.data_providers import BrokerDataProvider, DataProvider
+
+
+class _CountingProvider(DataProvider):
+    def __init__(self):
+        self.calls = []
+
+    def get_quote(self, symbol):
+        self.calls.append(symbol)
+        return Quote(symbol, 10.0, 0.0, 1)
+
+
+@pytest.fixture
+def broker(tmp_path):
+    upstream = _CountingProvider()
+    broker = QuoteBroker(upstream, interval_secs=60, socket_path=str(tmp_path / "broker.sock"))
+    broker.start()
+    threading.Thread(target=broker.run_forever, daemon=True).start()
+    yield broker, upstream
+    broker.stop()
+
+
+def test_tick_symbols_are_subscribed_in_one_fetch(broker):
+    broker, upstream = broker
+    symbols = [f"S{i:02d}" for i in range(20)]
+    client = BrokerDataProvider(socket_path=broker.socket_path, first_quote_wait_secs=5)
+    client.begin_tick(time.time(), symbols)
+    assert [client.get_quote(s).symbol for s in symbols] == symbols
+    assert sorted(upstream.calls[:len(symbols)]) == symbols  # One upstream fetch per symbol, not one per symbol subscribed so far
+
+
+def test_stale_quotes_default_to_a_few_broker_intervals(broker):
+    broker, _ = broker
+    client = BrokerDataProvider(socket_path=broker.socket_path, first_quote_wait_secs=5)
+    client.begin_tick(time.time(), ["AAA"])
+    q = client.get_quote("AAA")
+    assert client._broker_interval_secs == 60
+    with client._cond:
+        client._latest["AAA"] = (time.time() - BROKER_MAX_AGE_INTERVALS * 60 - 1, q)
+    with pytest.raises(ValueError, match="stale"):
+        client.get_quote("AAA")
@@ -0,0 +1,83 @@
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from stock_alert.common import *
+from stock_alert.core.cache_utils import (CACHE_SERIALIZERS, CacheFormatError, decode_cache, encode_cache,
+                                          get_cache_serializer, load_cache, msgpack, save_to_cache)
+
+DATA = {
+    CACHE_FIELD_LAST_ALERTS_TRIGGER_TS: {"a": "2024-01-02 03:04:05", "b": 1700000000.5},
+    CACHE_FIELD_ALERTS_HISTORY: {"a": [{ALERT_RECORD_FIELD_TRIGGER_TS: "2024-01-02 03:04:05",
+                                        ALERT_RECORD_FIELD_NAME: "AAA price_value >= 1.0",
+                                        CACHE_FIELD_ALERT_LAST_PRICE: 101.25}]},
+}
+AVAILABLE = [name for name in CACHE_SERIALIZERS if name != CACHE_SERIALIZER_MSGPACK or msgpack is not None]
+
+
+@pytest.mark.parametrize("name", AVAILABLE)
+def test_round_trip(name):
+    raw = encode_cache(DATA, CACHE_SERIALIZERS[name])
+    assert raw.startswith(CACHE_FILE_MAGIC + f" {CACHE_FORMAT_VERSION} {name}\n".encode())
+    assert decode_cache(raw) == DATA
+
+
+def test_legacy_json_without_header():
+    assert decode_cache(json.dumps(DATA, indent=2).encode()) == DATA
+
+
+@pytest.mark.parametrize("raw", [
+    CACHE_FILE_MAGIC + b" x json\n{}",
+    CACHE_FILE_MAGIC + b" 1\n{}",
+    CACHE_FILE_MAGIC + f" {CACHE_FORMAT_VERSION + 1} json\n{{}}".encode(),
+    CACHE_FILE_MAGIC + b" 1 pickle\n{}",
+    CACHE_FILE_MAGIC + b" 1 json\n{\"a\": [1, 2",
+    CACHE_FILE_MAGIC + b" 1 json\n[1, 2]",
+    b"{\"truncated",
+])
+def test_malformed_files_raise(raw):
+    with pytest.raises(CacheFormatError):
+        decode_cache(raw)
+
+
+def test_unknown_serializer_name():
+    with pytest.raises(ValueError):
+        get_cache_serializer("pickle")
+
+
+@pytest.mark.parametrize("name", AVAILABLE)
+def test_save_merges_top_level_keys(cache_config, name):
+    config = replace(cache_config, serializer=name)
+    save_to_cache(config, {"x": 1})
+    save_to_cache(config, {"y": {"z": 2}})
+    assert load_cache(config) == {"x": 1, "y": {"z": 2}}
+
+
+def test_legacy_cache_file_is_read_and_rewritten_with_header(cache_config):
+    path = Path(cache_config.directory) / cache_config.file_name
+    path.write_text(json.dumps(DATA), encoding="utf-8")
+    assert load_cache(cache_config) == DATA
+    save_to_cache(cache_config, {"x": 1})
+    assert path.read_bytes().startswith(CACHE_FILE_MAGIC)
+    assert load_cache(cache_config) == {**DATA, "x": 1}
+
+
+def test_corrupt_latest_file_falls_back_to_newest_rotated_file(cache_config):
+    config = replace(cache_config, max_file_size=1)  # Every save rotates the previous file
+    save_to_cache(config, {"n": 1})
+    save_to_cache(config, {"n": 2})
+    save_to_cache(config, {"n": 3})
+    directory = Path(config.directory)
+    assert sorted(p.name for p in directory.iterdir()) == ["cache.1.json", "cache.2.json", "cache.json"]
+    (directory / "cache.json").write_bytes(CACHE_FILE_MAGIC + b" 1 marshal\n\x00garbage")
+    assert load_cache(config) == {"n": 2}
+
+
+def test_rotation_keeps_max_files(cache_config):
+    config = replace(cache_config, max_file_size=1, max_files=2)
+    for n in range(5):
+        save_to_cache(config, {"n": n})
+    assert sorted(p.name for p in Path(config.directory).iterdir()) == ["cache.4.json", "cache.json"]
+    assert load_cache(config) == {"n": 4}
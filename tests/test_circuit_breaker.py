@@ -0,0 +1,108 @@
+from stock_alert.common import *
+from stock_alert.core.circuit_breaker import BreakerRegistry, CircuitBreaker
+from stock_alert.core.runner import MonitorState, TickStats, fetch_quotes
+from stock_alert.data_providers import DataProvider
+
+
+def test_opens_after_threshold_and_half_opens_after_backoff():
+    b = CircuitBreaker(key="AAA", failure_threshold=2, base_backoff_secs=30, max_backoff_secs=100)
+    assert b.allow(0) and not b.record_failure(0, "boom")
+    assert b.state == BreakerState.CLOSED
+    assert b.record_failure(1, "boom")
+    assert b.state == BreakerState.OPEN and b.open_until == 31
+    assert not b.allow(30)
+    assert b.allow(31) and b.state == BreakerState.HALF_OPEN
+
+
+def test_half_open_probe_success_closes():
+    b = CircuitBreaker(key="AAA", failure_threshold=1, base_backoff_secs=30)
+    b.record_failure(0, "boom")
+    assert b.allow(30)
+    b.record_success()
+    assert (b.state, b.consecutive_failures, b.times_opened, b.last_error) == (BreakerState.CLOSED, 0, 0, "")
+
+
+def test_half_open_probe_failure_reopens_with_doubled_capped_backoff():
+    b = CircuitBreaker(key="AAA", failure_threshold=1, base_backoff_secs=30, max_backoff_secs=100)
+    b.record_failure(0, "e1")
+    backoffs = []
+    for _ in range(4):
+        now = b.open_until
+        assert b.allow(now) and b.state == BreakerState.HALF_OPEN
+        assert b.record_failure(now, "e")  # A failed probe re-opens at once
+        backoffs.append(b.open_until - now)
+    assert backoffs == [60, 100, 100, 100]
+
+
+def test_registry_summary_and_forget():
+    reg = BreakerRegistry()
+    assert reg.summary(0) is None
+    reg.for_symbol("AAA").record_failure(0, "e")
+    reg.for_symbol("AAA").record_failure(0, "e")
+    reg.for_symbol("BBB")
+    assert reg.summary(10) == f"AAA=open {BREAKER_BASE_BACKOFF_SECS - 10:.0f}s (e)"
+    reg.forget(["AAA"])
+    assert reg.summary(10) is None and "BBB" in reg.symbol_breakers
+
+
+class _StubProvider(DataProvider):
+    def __init__(self, bad=(), down=False):
+        self.bad, self.down, self.calls = set(bad), down, []
+
+    def get_quote(self, symbol):
+        self.calls.append(symbol)
+        if self.down:
+            raise ConnectionError("connection refused")
+        if symbol in self.bad:
+            raise ValueError(f"no quote for {symbol}")
+        return Quote(symbol, 10.0, 0.0, 1)
+
+
+def test_fetch_opens_symbol_breaker_only_when_the_provider_answers():
+    state, provider = MonitorState(), _StubProvider(bad={"BAD"})
+    for now in (0, 1):
+        quotes = fetch_quotes(provider, ["AAA", "BAD"], now, state, TickStats())
+        assert set(quotes) == {"AAA"}
+    assert state.breakers.for_symbol("BAD").state == BreakerState.OPEN
+    provider.calls.clear()
+    stats = TickStats()
+    fetch_quotes(provider, ["AAA", "BAD"], 2, state, stats)
+    assert provider.calls == ["AAA"] and stats.skipped_by_breaker == 1
+
+
+def test_fetch_bad_symbols_do_not_open_the_provider_breaker():
+    symbols = ["BAD1", "BAD2", "BAD3", "MSFT", "ZAPL"]  # More bad symbols than the provider threshold, sorted first
+    state, provider = MonitorState(), _StubProvider(bad={"BAD1", "BAD2", "BAD3"})
+    for now in range(5):
+        quotes = fetch_quotes(provider, symbols, now, state, TickStats())
+        assert set(quotes) == {"MSFT", "ZAPL"}
+        assert state.breakers.provider_breaker.state == BreakerState.CLOSED
+    assert all(state.breakers.for_symbol(s).state == BreakerState.OPEN for s in ("BAD1", "BAD2", "BAD3"))
+
+
+def test_fetch_counts_a_tick_without_quotes_once_against_the_provider():
+    symbols = [f"BAD{i}" for i in range(10)]
+    state, provider = MonitorState(), _StubProvider(bad=symbols)
+    stats = TickStats()
+    assert fetch_quotes(provider, symbols, 0, state, stats) == {}
+    assert len(provider.calls) == len(symbols) and stats.failed == len(symbols)
+    assert state.breakers.provider_breaker.consecutive_failures == 1
+    assert state.breakers.provider_breaker.state == BreakerState.CLOSED
+
+
+def test_fetch_opens_provider_breaker_and_skips_the_rest():
+    symbols = [f"S{i}" for i in range(10)]
+    state, provider = MonitorState(), _StubProvider(down=True)
+    stats = TickStats()
+    assert fetch_quotes(provider, symbols, 0, state, stats) == {}
+    assert len(provider.calls) == BREAKER_PROVIDER_FAILURE_THRESHOLD
+    assert stats.skipped_by_breaker == len(symbols) - BREAKER_PROVIDER_FAILURE_THRESHOLD
+    assert not state.breakers.symbol_breakers or all(
+        b.state == BreakerState.CLOSED for b in state.breakers.symbol_breakers.values())  # Not the symbols' fault
+    stats = TickStats()
+    fetch_quotes(provider, symbols, 1, state, stats)
+    assert stats.skipped_by_breaker == len(symbols)
+
+    provider.down = False
+    quotes = fetch_quotes(provider, symbols, BREAKER_BASE_BACKOFF_SECS, state, TickStats())  # Half-open probe
+    assert len(quotes) == len(symbols) and state.breakers.provider_breaker.state == BreakerState.CLOSED
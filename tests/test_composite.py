@@ -0,0 +1,50 @@
+import pytest
+
+from stock_alert.common import *
+from stock_alert.core.quote_log import QuoteLogWriter
+from stock_alert.data_providers import CompositeDataProvider, DataProvider, ProviderExhausted, get_provider
+
+T0 = 1_700_000_000.0
+
+
+class _CountingProvider(DataProvider):
+    def __init__(self, fail_begin=False):
+        self.ticks, self.fail_begin = [], fail_begin
+
+    def begin_tick(self, now_ts, symbols=()):
+        self.ticks.append(now_ts)
+        if self.fail_begin:
+            raise ConnectionError("down")
+
+    def get_quote(self, symbol):
+        return Quote(symbol, 1.0, 0.0, 1)
+
+
+def test_begin_tick_reaches_every_backend():
+    first, second, third = _CountingProvider(), _CountingProvider(fail_begin=True), _CountingProvider()
+    composite = CompositeDataProvider([("a", first), ("b", second), ("c", third)])
+    composite.begin_tick(T0)
+    composite.begin_tick(T0 + 1)
+    assert first.ticks == second.ticks == third.ticks == [T0, T0 + 1]
+
+
+def test_simulator_in_a_composite_advances():
+    composite = get_provider("sim,fake", seed=7)
+    prices = []
+    for i in range(5):
+        composite.begin_tick(T0 + i)
+        prices.append(composite.get_quote("AAPL").price)
+    assert len(set(prices)) > 1
+
+
+def test_replay_in_a_composite(tmp_path):
+    path = str(tmp_path / "quotes.qlog")
+    with QuoteLogWriter(path) as writer:
+        for i in range(3):
+            writer.write_tick(T0 + i, [Quote("AAA", 10.0 + i, 0.0, 1)])
+    composite = get_provider("replay,fake", replay_paths=[path])
+    for i in range(3):
+        composite.begin_tick(T0 + i)
+        assert composite.get_quote("AAA").price == 10.0 + i
+    with pytest.raises(ProviderExhausted):
+        composite.begin_tick(T0 + 3)
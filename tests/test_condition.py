@@ -0,0 +1,69 @@
+import pytest
+
+from stock_alert.common import *
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("price >= 200", "price >= 200"),
+    ("PRICE>=200.5", "price >= 200.5"),
+    ("price_value >= 200 AND (price_percent_day <= -3 OR volume > 5e6)",
+     "price >= 200 and (pct_day <= -3 or volume > 5000000)"),
+    ("price > 1 && volume < 2 || pct_day == 0", "price > 1 and volume < 2 or pct_day == 0"),
+])
+def test_normalized_text(text, expected):
+    assert compile_condition(text).text == expected
+
+
+def test_and_binds_tighter_than_or():
+    cond = compile_condition("price >= 10 or price <= 1 and volume > 100")
+    assert cond(20.0, 0.0, 0.0)
+    assert not cond(0.5, 0.0, 50.0)
+    assert compile_condition("(price >= 10 or price <= 1) and volume > 100")(20.0, 0.0, 500.0)
+    assert not compile_condition("(price >= 10 or price <= 1) and volume > 100")(20.0, 0.0, 50.0)
+
+
+def test_fields_and_clauses():
+    cond = compile_condition("price >= 200 and (pct_day <= -3 or pct_offset > 5)")
+    assert cond.fields == {COND_FIELD_PRICE, COND_FIELD_PCT_DAY, COND_FIELD_PCT_OFFSET}
+    assert cond.clauses == (("price", ">=", 200.0), ("pct_day", "<=", -3.0), ("pct_offset", ">", 5.0))
+    assert cond.single_clause() is None
+    assert compile_condition("volume <= 10").single_clause() == ("volume", "<=", 10.0)
+
+
+def test_offset_clause_is_false_when_offset_is_unknown():
+    cond = compile_condition("offset >= 1 or pct_offset <= -1")
+    assert not cond(10.0, 0.0, 0.0, None, None)
+    assert cond(10.0, 0.0, 0.0, 2.0, None)
+
+
+def test_identical_texts_share_one_compiled_instance():
+    assert compile_condition("price >= 3") is compile_condition("price >= 3")
+
+
+@pytest.mark.parametrize("text", ["", "price", "price >=", "price >= abc", "foo >= 1", "price >= 1 and",
+                                  "(price >= 1", "price >= 1)", "price => 1", "__import__('os') >= 1",
+                                  "price >= 1e400", "volume < -1e999"])
+def test_invalid_conditions_raise(text):
+    with pytest.raises(ConditionError):
+        compile_condition(text)
+
+
+@pytest.mark.parametrize("text, kind, op", [
+    ("price_value >= 200", AlertKind.PRICE_VALUE, Operation.GE),
+    ("price_percent_day <= -3", AlertKind.PCT_DAY, Operation.LE),
+    ("volume >= 1000000", AlertKind.VOLUME, Operation.GE),
+    ("price_percent_offset_since_last_alert >= 5", AlertKind.PRICE_PERCENT_OFFSET_SINCE_LAST_ALERT, Operation.GE),
+    ("offset <= -2", AlertKind.PRICE_VALUE_OFFSET_SINCE_LAST_ALERT, Operation.LE),
+])
+def test_single_clause_becomes_a_classic_alert(text, kind, op):
+    alert = Alert.from_condition("AAA", text)
+    assert (alert.kind, alert.op) == (kind, op)
+
+
+def test_composite_alert_round_trips_through_dict():
+    alert = Alert.from_condition("AAA", "price > 10 and volume >= 5", alert_cooldown_secs=60)
+    assert alert.kind == AlertKind.CONDITION
+    again = Alert.from_dict(alert.to_dict())
+    assert again.condition.text == alert.condition.text and again.alert_cooldown_secs == 60
+    assert again.should_trigger(Quote("AAA", 11.0, 0.0, 5), 0.0, verbose=False)[0]
+    assert not again.should_trigger(Quote("AAA", 10.0, 0.0, 5), 0.0, verbose=False)[0]
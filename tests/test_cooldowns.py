@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from stock_alert.common import *
+from stock_alert.core.cache_utils import save_to_cache
+from stock_alert.core.cooldowns import CooldownSchedule
+from stock_alert.core.runner import MonitorState, TickStats, check_alerts
+
+T0 = 1_700_000_000
+
+
+def _run(alerts, quotes, ticks, step, cache_config, state=None):
+    state = state or MonitorState()
+    fired, all_stats = [], []
+    for i in range(ticks):
+        stats = TickStats()
+        check_alerts({q.symbol: q for q in quotes}, alerts, cache_config, T0 + i * step, state, stats,
+                     on_alert=lambda key, alert, q, reason, i=i: fired.append((i, key)))
+        all_stats.append(stats)
+    return fired, all_stats, state
+
+
+def test_alert_fires_again_at_cooldown_expiry_on_unchanged_quote(cache_config):
+    alerts = {"up": Alert.from_condition("AAA", "pct_day >= 1 and volume > 0", alert_cooldown_secs=25)}
+    fired, stats, _ = _run(alerts, [Quote("AAA", 100.0, 2.0, 10)], 7, 10, cache_config)
+    assert fired == [(0, "up"), (3, "up"), (6, "up")]
+    assert [s.alerts_cooling for s in stats] == [0, 1, 1, 0, 1, 1, 0]
+
+
+def test_alert_blocked_by_an_earlier_trigger_fires_at_expiry(cache_config):
+    # A trigger recorded before this process started (e.g. a restart) puts the alert in a cooldown on first check
+    last = datetime.fromtimestamp(T0 - 10).strftime("%Y-%m-%d %H:%M:%S")
+    save_to_cache(cache_config, {CACHE_FIELD_LAST_ALERTS_TRIGGER_TS: {"up": last}})
+    alerts = {"up": Alert.from_condition("AAA", "price >= 50", alert_cooldown_secs=35)}
+    fired, stats, state = _run(alerts, [Quote("AAA", 100.0, 0.0, 10)], 4, 10, cache_config)
+    assert fired == [(3, "up")]  # 35s after T0 - 10, with a quote that never changed
+    assert stats[1].alerts_cooling == 1 and stats[1].alerts_checked == 0
+
+
+def test_rescheduled_entry_survives_its_stale_heap_entry():
+    alert = Alert.from_condition("AAA", "price >= 1")
+    schedule = CooldownSchedule()
+    schedule.schedule("a", alert, 100.0)
+    schedule.schedule("a", alert, 200.0)  # Extends the cooldown: (100, 'a') is now stale
+    assert schedule.pop_expired(150.0) == []
+    assert schedule.expires_at("a") == 200.0
+    assert schedule.pop_expired(200.0) == ["a"]
+
+
+def test_stale_later_entry_does_not_drop_a_newer_shorter_cooldown():
+    alert = Alert.from_condition("AAA", "price >= 1")
+    schedule = CooldownSchedule()
+    schedule.schedule("a", alert, 300.0)
+    schedule.cancel("a")
+    schedule.schedule("a", alert, 100.0)
+    assert schedule.pop_expired(100.0) == ["a"]
+    schedule.schedule("a", alert, 400.0)
+    assert schedule.pop_expired(350.0) == []  # Surfaces the stale (300, 'a')
+    assert "a" in schedule and schedule.expires_at("a") == 400.0
+    assert schedule.pop_expired(400.0) == ["a"] and len(schedule) == 0
+
+
+def test_retain_drops_removed_and_replaced_alerts():
+    a, b = Alert.from_condition("AAA", "price >= 1"), Alert.from_condition("BBB", "price >= 1")
+    schedule = CooldownSchedule()
+    schedule.schedule("a", a, 100.0)
+    schedule.schedule("b", b, 100.0)
+    schedule.retain({"a": Alert.from_condition("AAA", "price >= 2")})
+    assert len(schedule) == 0 and schedule.pop_expired(100.0) == []
+
+
+def test_idle_symbols_need_every_dependent_cooling():
+    a, b = Alert.from_condition("AAA", "price >= 1"), Alert.from_condition("BBB", "price >= 1")
+    schedule = CooldownSchedule()
+    schedule.schedule("a", a, 100.0)
+    schedule.schedule("b", b, 100.0)
+    assert schedule.idle_symbols({"AAA": ["a"], "BBB": ["b", "b2"]}) == {"AAA"}
@@ -0,0 +1,27 @@
+from stock_alert.common import *
+from stock_alert.core.quote_board import QuoteBoardReader, QuoteBoardWriter
+
+
+def test_publish_and_read(tmp_path):
+    path = str(tmp_path / "quotes.board")
+    writer = QuoteBoardWriter(path, capacity=4)
+    writer.publish(1.0, [Quote("AAA", 10.0, 1.5, 100), Quote("BBB", 20.0, -0.5, 200)])
+    writer.publish(2.0, [Quote("AAA", 11.0, 2.5, 150)])
+    reader = QuoteBoardReader(path)
+    assert reader.get("AAA") == (2.0, Quote("AAA", 11.0, 2.5, 150))
+    assert set(reader.snapshot()) == {"AAA", "BBB"}
+    assert reader.get("ZZZ") is None
+    reader.close()
+    writer.close()
+
+
+def test_too_long_symbol_is_skipped_and_warned_once(tmp_path, capsys):
+    writer = QuoteBoardWriter(str(tmp_path / "quotes.board"), capacity=4)
+    long_symbol = "X" * 30
+    for ts in range(3):
+        writer.publish(float(ts), [Quote(long_symbol, 1.0, 0.0, 1), Quote("AAA", 1.0, 0.0, 1)])
+    assert capsys.readouterr().out.count("too long") == 1
+    reader = QuoteBoardReader(str(writer.path))
+    assert set(reader.snapshot()) == {"AAA"}
+    reader.close()
+    writer.close()
@@ -0,0 +1,80 @@
+import pytest
+
+from stock_alert.common import *
+from stock_alert.core.quote_log import (QuoteLogWriter, QuoteRecorder, is_quote_log, iter_quote_log, iter_quote_logs,
+                                        list_quote_logs)
+from stock_alert.data_providers import ProviderExhausted, ReplayDataProvider
+
+T0 = 1_700_000_000.0
+
+
+def _ticks(n):
+    return [(T0 + i, [Quote("AAA", 100.0 + i, 0.5 * i, 1000 * i), Quote("BBB", 50.25, -1.0, 7)][: 1 + i % 2])
+            for i in range(n)]
+
+
+def _as_dicts(ticks):
+    return [(ts, {q.symbol: q for q in quotes}) for ts, quotes in ticks]
+
+
+def test_write_read_round_trip(tmp_path):
+    path = str(tmp_path / f"t{QUOTE_LOG_FILE_EXT}")
+    ticks = _ticks(6) + [(T0 + 10, [])]  # An empty tick is kept too
+    with QuoteLogWriter(path) as writer:
+        for ts, quotes in ticks:
+            writer.write_tick(ts, quotes)
+    assert is_quote_log(path)
+    assert list(iter_quote_log(path)) == _as_dicts(ticks)
+
+
+def test_truncated_trailing_tick_is_ignored(tmp_path):
+    path = tmp_path / f"t{QUOTE_LOG_FILE_EXT}"
+    with QuoteLogWriter(str(path)) as writer:
+        for ts, quotes in _ticks(3):
+            writer.write_tick(ts, quotes)
+    data = path.read_bytes()
+    path.write_bytes(data[:-5])
+    assert list(iter_quote_log(str(path))) == _as_dicts(_ticks(2))
+
+
+def test_not_a_quote_log(tmp_path):
+    path = tmp_path / "x.qlog"
+    path.write_bytes(b"ts,symbol\n1,AAA\n")
+    assert not is_quote_log(str(path))
+    with pytest.raises(ValueError):
+        list(iter_quote_log(str(path)))
+
+
+def test_rotated_files_are_read_in_order(tmp_path):
+    recorder = QuoteRecorder(str(tmp_path), max_file_bytes=100)  # Rotates after about every tick
+    ticks = _ticks(8)
+    for ts, quotes in ticks:
+        recorder.record(ts, quotes)
+    recorder.close()
+    files = list_quote_logs(str(tmp_path))
+    assert len(files) > 2
+    assert list(iter_quote_logs([str(tmp_path)])) == _as_dicts(ticks)  # Each file defines its own symbol ids
+
+
+def test_recorder_keeps_max_files(tmp_path):
+    recorder = QuoteRecorder(str(tmp_path), max_file_bytes=1, max_files=2)
+    for ts, quotes in _ticks(5):
+        recorder.record(ts, quotes)
+    recorder.close()
+    assert len(list_quote_logs(str(tmp_path))) == 2
+
+
+def test_replay_serves_recorded_ticks_then_stops(tmp_path):
+    recorder = QuoteRecorder(str(tmp_path))
+    for ts, quotes in _ticks(2):
+        recorder.record(ts, quotes)
+    recorder.close()
+    provider = ReplayDataProvider([str(tmp_path)])
+    provider.begin_tick(0)
+    assert provider.current_ts == T0 and provider.get_quote("aaa").price == 100.0
+    with pytest.raises(ValueError):
+        provider.get_quote("BBB")  # Not recorded in the first tick
+    provider.begin_tick(0)
+    assert provider.get_quote("BBB").price == 50.25
+    with pytest.raises(ProviderExhausted):
+        provider.begin_tick(0)
@@ -0,0 +1,71 @@
+import json
+import os
+
+from stock_alert.common import *
+from stock_alert.core.config_watcher import ConfigWatcher
+from stock_alert.core.runner import MonitorState, TickStats, apply_config_reload, check_alerts
+
+T0 = 1_700_000_000
+
+
+def _tick(alerts, quotes, now_ts, state, cache_config):
+    stats, fired = TickStats(), []
+    check_alerts({q.symbol: q for q in quotes}, alerts, cache_config, now_ts, state, stats,
+                 on_alert=lambda key, alert, q, reason: fired.append(key))
+    return stats, fired
+
+
+def test_unchanged_quote_skips_settled_alert(cache_config):
+    alerts = {"up": Alert.from_condition("AAA", "pct_day >= 3")}
+    state = MonitorState()
+    stats, _ = _tick(alerts, [Quote("AAA", 100.0, 1.0, 10)], T0, state, cache_config)
+    assert stats.alerts_checked == 1 and "up" in state.settled_alerts
+    stats, _ = _tick(alerts, [Quote("AAA", 100.0, 1.0, 10)], T0 + 10, state, cache_config)
+    assert (stats.alerts_checked, stats.alerts_skipped, stats.quotes_unchanged) == (0, 1, 1)
+    stats, fired = _tick(alerts, [Quote("AAA", 100.0, 3.5, 10)], T0 + 20, state, cache_config)
+    assert stats.alerts_checked == 1 and fired == ["up"]
+
+
+def test_missing_quote_suppresses_instead_of_settling(cache_config):
+    alerts = {"up": Alert.from_condition("AAA", "pct_day >= 3")}
+    state = MonitorState()
+    stats, _ = _tick(alerts, [], T0, state, cache_config)
+    assert stats.alerts_suppressed == 1 and "up" not in state.settled_alerts
+    _, fired = _tick(alerts, [Quote("AAA", 100.0, 4.0, 10)], T0 + 10, state, cache_config)
+    assert fired == ["up"]
+
+
+def _write_config(path, alerts):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({ALERT_CORE_CONFIG_KEY: {k: a.to_dict() for k, a in alerts.items()}, ALERT_FIELD_WATCHLIST: []}, f)
+    os.replace(tmp, path)  # New inode, so the watcher sees a change even within the same mtime tick
+
+
+def test_reloaded_alert_is_reevaluated_on_unchanged_quote(tmp_path, cache_config):
+    path = str(tmp_path / "config.json")
+    alerts = {"a": Alert.from_condition("AAA", "price >= 200"), "b": Alert.from_condition("AAA", "pct_day >= 3")}
+    _write_config(path, alerts)
+    watcher = ConfigWatcher(path, {k: a.to_dict() for k, a in alerts.items()}, [])
+    state = MonitorState()
+    quote = Quote("AAA", 150.0, 0.0, 10)
+    _tick(alerts, [quote], T0, state, cache_config)
+    assert set(state.settled_alerts) == {"a", "b"}
+
+    _write_config(path, {"a": Alert.from_condition("AAA", "price >= 100"), "b": alerts["b"]})
+    assert apply_config_reload(watcher, alerts, state) == ["AAA"]
+    stats, fired = _tick(alerts, [quote], T0 + 10, state, cache_config)
+    assert fired == ["a"]
+    assert stats.alerts_skipped == 1  # 'b' did not change and stays settled
+
+
+def test_replaced_alert_instance_is_not_trusted_as_settled(cache_config):
+    alerts = {"a": Alert.from_condition("AAA", "pct_day >= 3"), "b": Alert.from_condition("BBB", "pct_day >= 3")}
+    state = MonitorState()
+    quotes = [Quote("AAA", 100.0, 1.0, 10), Quote("BBB", 100.0, 1.0, 10)]
+    _tick(alerts, quotes, T0, state, cache_config)
+    del alerts["b"]
+    alerts["a"] = Alert.from_condition("AAA", "pct_day >= 1")
+    state.alerts_changed(["a", "b"])
+    _, fired = _tick(alerts, quotes, T0 + 10, state, cache_config)
+    assert fired == ["a"]
@@ -0,0 +1,124 @@
+import math
+import random
+from datetime import datetime
+
+import pytest
+
+from stock_alert.common import *
+from stock_alert.core.runner import MonitorState, TickStats, check_alerts
+from stock_alert.core.thresholds import ThresholdIndex, build_threshold_indexes
+
+SYMBOLS = ("AAA", "BBB", "CCC")
+PRICES = (95.0, 98.0, 99.5, 100.0, 100.5, 102.0, 105.0)
+VOLUMES = (1000, 5000, 9000, 20000)
+
+
+def _random_alerts(rnd):
+    alerts = {}
+    for i in range(60):
+        sym = rnd.choice(SYMBOLS)
+        cooldown = rnd.choice((0, 5, 20, 60))
+        op = rnd.choice((">=", "<="))
+        choice = rnd.randrange(6)
+        if choice == 0:
+            text = f"price {op} {rnd.choice(PRICES)}"  # Indexed (single clause)
+        elif choice == 1:
+            text = f"volume {op} {rnd.choice(VOLUMES)}"  # Indexed
+        elif choice == 2:
+            text = f"price {rnd.choice(('>', '<', '=='))} {rnd.choice(PRICES)}"  # Scanned: strict/equality
+        elif choice == 3:
+            text = f"pct_day {op} {rnd.choice((-1.0, 0.0, 1.0))}"  # Scanned: other field
+        elif choice == 4:
+            text = f"price >= {rnd.choice(PRICES)} and volume >= {rnd.choice(VOLUMES)}"  # Scanned: composite
+        else:
+            text = f"offset {op} {rnd.choice((-2.0, 2.0))}"  # Scanned: reads the last trigger price
+        alerts[f"a{i}"] = Alert.from_condition(sym, text, alert_cooldown_secs=cooldown)
+    return alerts
+
+
+def _random_ticks(rnd, n):
+    """Quotes per tick: symbols often repeat their previous quote exactly, sometimes miss a tick or carry NaN."""
+    ticks = []
+    current = {sym: Quote(sym, 100.0, 0.0, 1000) for sym in SYMBOLS}
+    for _ in range(n):
+        quotes = {}
+        for sym in SYMBOLS:
+            r = rnd.random()
+            if r < 0.08:
+                continue  # Missing quote
+            if r < 0.12:
+                quotes[sym] = Quote(sym, math.nan, 0.0, current[sym].volume)
+                continue
+            if r < 0.55:
+                current[sym] = Quote(sym, rnd.choice(PRICES), rnd.choice((-1.5, 0.0, 1.5)), rnd.choice(VOLUMES))
+            quotes[sym] = current[sym]
+        ticks.append(quotes)
+    return ticks
+
+
+def _reference_triggers(alerts, ticks, start_ts, step):
+    """Every alert evaluated on every tick with all its legs quoted, with the bookkeeping of check_alerts."""
+    last_ts, last_record, triggers = {}, {}, []
+    for i, quotes in enumerate(ticks):
+        now_ts = start_ts + i * step
+        for key, alert in alerts.items():
+            q = alert.quote_from(quotes) if all(sym in quotes for sym in alert.legs) else None
+            if q is None:
+                continue
+            ok, _ = alert.should_trigger(q, now_ts, last_ts.get(key), last_record.get(key), verbose=False)
+            if ok:
+                last_ts[key] = datetime.fromtimestamp(now_ts).strftime("%Y-%m-%d %H:%M:%S")
+                last_record[key] = {CACHE_FIELD_ALERT_LAST_PRICE: q.price}
+                triggers.append((i, key))
+    return triggers
+
+
+def _monitor_triggers(alerts, ticks, start_ts, step, cache_config):
+    state, triggers = MonitorState(), []
+    for i, quotes in enumerate(ticks):
+        check_alerts(quotes, alerts, cache_config, start_ts + i * step, state, TickStats(),
+                     on_alert=lambda key, alert, q, reason, i=i: triggers.append((i, key)))
+    return triggers
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_indexed_evaluation_matches_evaluating_every_alert(seed, cache_config):
+    rnd = random.Random(seed)
+    alerts = _random_alerts(rnd)
+    assert build_threshold_indexes(alerts), "the mix must include indexed alerts"
+    ticks = _random_ticks(rnd, 150)
+    start_ts, step = 1_700_000_000, 7
+    reference = _reference_triggers(alerts, ticks, start_ts, step)
+    assert reference
+    assert _monitor_triggers(alerts, ticks, start_ts, step, cache_config) == sorted(
+        reference, key=lambda t: (t[0], list(alerts).index(t[1])))
+
+
+def test_crossings_in_both_directions(cache_config):
+    alerts = {"ge": Alert.from_condition("AAA", "price >= 100", alert_cooldown_secs=0),
+              "le": Alert.from_condition("AAA", "price <= 100", alert_cooldown_secs=0)}
+    prices = [99.0, 101.0, 99.0, 100.0, 101.0, 98.0, 98.0, math.nan, 102.0]
+    ticks = [{"AAA": Quote("AAA", p, 0.0, 0)} for p in prices]
+    got = _monitor_triggers(alerts, ticks, 1_700_000_000, 10, cache_config)
+    assert got == _reference_triggers(alerts, ticks, 1_700_000_000, 10)
+    assert got == [(0, "le"), (1, "ge"), (2, "le"), (3, "ge"), (3, "le"), (4, "ge"), (5, "le"), (6, "le"), (8, "ge")]
+
+
+def test_cooldown_expiry_with_unchanged_quote(cache_config):
+    alerts = {"ge": Alert.from_condition("AAA", "volume >= 5000", alert_cooldown_secs=30)}
+    ticks = [{"AAA": Quote("AAA", 100.0, 0.0, 6000)}] * 10  # Never changes after the first tick
+    got = _monitor_triggers(alerts, ticks, 1_700_000_000, 10, cache_config)
+    assert got == [(0, "ge"), (3, "ge"), (6, "ge"), (9, "ge")]
+    assert got == _reference_triggers(alerts, ticks, 1_700_000_000, 10)
+
+
+def test_affected_levels():
+    index = ThresholdIndex.build(0, [("g90", Operation.GE, 90.0), ("g100", Operation.GE, 100.0),
+                                     ("g110", Operation.GE, 110.0), ("l90", Operation.LE, 90.0),
+                                     ("l100", Operation.LE, 100.0), ("l110", Operation.LE, 110.0)])
+    assert sorted(index.affected(None, 100.0)) == ["g100", "g90", "l100", "l110"]
+    # Moving up from 95 to 105: >= levels met at 105, and <= levels met at 95 (which may settle now)
+    assert sorted(index.affected(95.0, 105.0)) == ["g100", "g90", "l100", "l110"]
+    assert sorted(index.affected(105.0, 95.0)) == ["g100", "g90", "l100", "l110"]
+    assert index.affected(math.nan, math.nan) == []
+    assert sorted(index.affected(math.nan, 120.0)) == ["g100", "g110", "g90"]